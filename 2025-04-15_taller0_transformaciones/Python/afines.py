@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Transformaciones afines por lotes para animaciones 2D y 3D.
+
+`transformación.py` construye en cada frame las matrices de traslación,
+rotación y escala con listas de Python y las multiplica frame a frame. Aquí
+cada función recibe arrays de parámetros (un valor por frame) y devuelve de
+golpe todas las matrices como un array (F, 3, 3) en 2D o (F, 4, 4) en 3D.
+Los parámetros pueden tener cualquier forma, por ejemplo (F, M) para M
+objetos animados a la vez, y las matrices son entonces (F, M, 3, 3):
+
+    T = componer(traslacion(tx, ty), rotacion(theta), escala(sx, sy))   # (F, 3, 3)
+    trayectorias = transformar(T, puntos)                              # (F, N, 2)
+
+    T = traslacion(tx[:, None] + desfases, ty[:, None])                 # (F, M, 3, 3)
+    transformar(T, puntos)             # mismos N puntos por objeto:     (F, M, N, 2)
+    transformar(T, puntos_objetos)     # (M, N, 2), unos por objeto:     (F, M, N, 2)
+
+`transformar` aplica las F matrices a los N puntos con un solo producto
+matricial por bloque, sin pasar los puntos a coordenadas homogéneas. Para
+nubes de millones de puntos y cientos de frames el resultado no cabe en
+memoria de una vez, así que se recorre por bloques de frames y puntos
+(`transformar_por_bloques`) y puede escribirse sobre un `np.memmap`.
+"""
+
+import numpy as np
+
+# Elementos (frames x puntos x dimensiones) de cada bloque de `transformar`.
+ELEMENTOS_POR_BLOQUE = 2**24
+
+
+def _lote(*parametros):
+    """Parámetros como arrays float64 difundidos a una forma común (al menos (1,))."""
+    return np.broadcast_arrays(*(np.atleast_1d(np.asarray(p, dtype=np.float64)) for p in parametros))
+
+
+def _identidades(forma, dimension):
+    return np.broadcast_to(np.eye(dimension + 1), forma + (dimension + 1, dimension + 1)).copy()
+
+
+# --- 1. Matrices por frame ---
+def traslacion(tx, ty, tz=None):
+    """
+    Matrices de traslación, una por frame.
+
+    Args:
+        tx, ty (float | np.array): Desplazamientos (escalares o arrays (F,)).
+        tz (float | np.array | None): Desplazamiento en Z; si se pasa, las
+            matrices son 3D (4x4).
+
+    Returns:
+        np.array: (F, 3, 3) o (F, 4, 4), o (..., 3, 3) / (..., 4, 4) con la
+        forma de los parámetros.
+    """
+    desplazamientos = _lote(tx, ty) if tz is None else _lote(tx, ty, tz)
+    matrices = _identidades(desplazamientos[0].shape, len(desplazamientos))
+    for i, d in enumerate(desplazamientos):
+        matrices[..., i, -1] = d
+    return matrices
+
+
+def escala(sx, sy, sz=None):
+    """Matrices de escala, una por frame: (F, 3, 3), o (F, 4, 4) si se pasa `sz`."""
+    factores = _lote(sx, sy) if sz is None else _lote(sx, sy, sz)
+    matrices = _identidades(factores[0].shape, len(factores))
+    for i, f in enumerate(factores):
+        matrices[..., i, i] = f
+    return matrices
+
+
+def rotacion(theta):
+    """Matrices de rotación 2D de ángulo `theta` (radianes), (F, 3, 3)."""
+    theta, = _lote(theta)
+    coseno, seno = np.cos(theta), np.sin(theta)
+    matrices = _identidades(theta.shape, 2)
+    matrices[..., 0, 0], matrices[..., 0, 1] = coseno, -seno
+    matrices[..., 1, 0], matrices[..., 1, 1] = seno, coseno
+    return matrices
+
+
+def rotacion_eje(eje, theta):
+    """
+    Matrices de rotación 3D de ángulo `theta` alrededor de un eje (Rodrigues).
+
+    Args:
+        eje (str | array-like): 'x', 'y', 'z', un vector (3,) común o uno
+            por frame (F, 3) (o con la forma de `theta` más (3,)); no hace
+            falta que esté normalizado.
+        theta (float | np.array): Ángulos en radianes.
+
+    Returns:
+        np.array: (F, 4, 4), o (..., 4, 4) con la forma de los parámetros.
+    """
+    if isinstance(eje, str):
+        eje = np.eye(3)['xyz'.index(eje)]
+    eje = np.asarray(eje, dtype=np.float64)
+    eje = eje / np.linalg.norm(eje, axis=-1, keepdims=True)
+    theta, = _lote(theta)
+    forma = np.broadcast_shapes(theta.shape, eje.shape[:-1])
+    theta = np.broadcast_to(theta, forma)
+    x, y, z = np.moveaxis(np.broadcast_to(eje, forma + (3,)), -1, 0)
+    coseno, seno = np.cos(theta)[..., None, None], np.sin(theta)[..., None, None]
+    # K es la matriz del producto vectorial por el eje: R = I + sen K + (1 - cos) K².
+    k = np.zeros(forma + (3, 3))
+    k[..., 0, 1], k[..., 0, 2], k[..., 1, 2] = -z, y, -x
+    k -= np.swapaxes(k, -1, -2)
+    matrices = _identidades(forma, 3)
+    matrices[..., :3, :3] += seno * k + (1 - coseno) * (k @ k)
+    return matrices
+
+
+def componer(*matrices):
+    """
+    Compone transformaciones frame a frame: `componer(T, R, S)` es T @ R @ S
+    (primero se aplica S). Las que tienen un solo frame se difunden a todos.
+
+    Returns:
+        np.array: (F, D+1, D+1), o la forma difundida de todas.
+    """
+    compuesta = matrices[-1]
+    for m in matrices[-2::-1]:
+        compuesta = np.matmul(m, compuesta)
+    return compuesta
+
+
+# --- 2. Aplicación a los puntos ---
+def _aplicar(matrices, puntos):
+    """
+    Aplica (F, ..., D+1, D+1) a (..., N, D): (F, ..., N, D), con división
+    por w si hace falta. Las dimensiones de lote de matrices y puntos se
+    difunden entre sí.
+    """
+    d = puntos.shape[-1]
+    lineal, desplazamiento = matrices[..., :d, :d], matrices[..., None, :d, d]
+    resultado = np.einsum('...ij,...nj->...ni', lineal, puntos, optimize=True) + desplazamiento
+    fila_w = matrices[..., d, :]
+    if np.any(fila_w[..., :d] != 0) or np.any(fila_w[..., d] != 1):
+        w = np.einsum('...j,...nj->...n', fila_w[..., :d], puntos) + fila_w[..., None, d]
+        resultado /= w[..., None]
+    return resultado
+
+
+def _forma_lote(matrices, puntos):
+    """Forma de lote común de matrices (F, ..., D+1, D+1) y puntos (..., N, D)."""
+    d = puntos.shape[-1]
+    if matrices.ndim < 3 or matrices.shape[-2:] != (d + 1, d + 1):
+        raise ValueError(f"Puntos de dimensión {d} necesitan matrices (F, ..., {d + 1}, {d + 1}).")
+    try:
+        return np.broadcast_shapes(matrices.shape[1:-2], puntos.shape[:-2])
+    except ValueError as e:
+        raise ValueError(f"Los lotes de las matrices {matrices.shape[1:-2]} y de los puntos "
+                         f"{puntos.shape[:-2]} no son compatibles.") from e
+
+
+def transformar_por_bloques(matrices, puntos, elementos=ELEMENTOS_POR_BLOQUE):
+    """
+    Recorre la transformación de los puntos por bloques de frames y puntos.
+
+    Args:
+        matrices (np.array): (F, 3, 3) para puntos 2D o (F, 4, 4) para 3D,
+            o (F, M, 3, 3) / (F, M, 4, 4) con M objetos por frame.
+        puntos (np.array): (N, 2) o (N, 3), comunes a todos los objetos, o
+            (M, N, 2) / (M, N, 3), unos por objeto.
+        elementos (int): Tamaño aproximado de cada bloque en elementos.
+
+    Yields:
+        tuple: (slice de frames, slice de puntos, bloque (f, n, D), o
+        (f, M, n, D) con objetos).
+    """
+    matrices = np.asarray(matrices)
+    puntos = np.asarray(puntos)
+    lote = _forma_lote(matrices, puntos)
+    frames, n, d = len(matrices), puntos.shape[-2], puntos.shape[-1]
+    tipo = np.result_type(puntos.dtype, np.float32)
+    matrices = matrices.astype(tipo, copy=False)
+    # Se reparten los puntos primero: cada bloque cubre todos los frames
+    # posibles de un tramo de puntos contiguo (de todos los objetos).
+    por_punto = d * int(np.prod(lote))
+    por_bloque_n = max(1, min(n, elementos // por_punto))
+    por_bloque_f = max(1, elementos // (por_bloque_n * por_punto))
+    for n0 in range(0, n, por_bloque_n):
+        tramo = slice(n0, min(n0 + por_bloque_n, n))
+        for f0 in range(0, frames, por_bloque_f):
+            bloque = slice(f0, min(f0 + por_bloque_f, frames))
+            yield bloque, tramo, _aplicar(matrices[bloque], puntos[..., tramo, :])
+
+
+def transformar(matrices, puntos, out=None, elementos=ELEMENTOS_POR_BLOQUE):
+    """
+    Transforma todos los puntos en todos los frames.
+
+    Args:
+        matrices (np.array): (F, 3, 3) o (F, 4, 4); una sola matriz (3, 3)
+            o (4, 4) se trata como un frame. Con M objetos por frame,
+            (F, M, 3, 3) o (F, M, 4, 4).
+        puntos (np.array): (N, 2) o (N, 3), en coordenadas cartesianas, o
+            (M, N, 2) / (M, N, 3) con unos puntos por objeto.
+        out (np.array | None): Destino (F, N, D), o (F, M, N, D) con
+            objetos; puede ser un `np.memmap` para resultados que no caben
+            en memoria.
+        elementos (int): Tamaño aproximado de cada bloque en elementos.
+
+    Returns:
+        np.array: Puntos transformados (F, N, D) o (F, M, N, D) (`out` si
+        se pasó).
+    """
+    matrices = np.asarray(matrices)
+    if matrices.ndim == 2:
+        matrices = matrices[None]
+    puntos = np.asarray(puntos)
+    if out is None:
+        tipo = np.result_type(puntos.dtype, np.float32)
+        forma = (len(matrices),) + _forma_lote(matrices, puntos) + puntos.shape[-2:]
+        out = np.empty(forma, dtype=tipo)
+    for frames, tramo, bloque in transformar_por_bloques(matrices, puntos, elementos):
+        out[frames, ..., tramo, :] = bloque
+    return out
+
+
+# --- 3. Animación del taller ---
+def parametros_animacion(num_frames=60):
+    """
+    Parámetros de la animación de `transformación.py`, uno por frame.
+
+    Returns:
+        dict: Arrays (F,) 't', 'tx', 'ty', 'theta', 'sx' y 'sy'.
+    """
+    t = np.arange(num_frames) / (num_frames - 1)
+    return {'t': t, 'tx': 5 * t, 'ty': 3 * t, 'theta': 2 * np.pi * t, 'sx': 1 + 2 * t, 'sy': 1 + 2 * t}
+
+
+def matrices_animacion(parametros):
+    """Escala -> rotación -> traslación para cada frame, (F, 3, 3)."""
+    p = parametros
+    return componer(traslacion(p['tx'], p['ty']), rotacion(p['theta']), escala(p['sx'], p['sy']))
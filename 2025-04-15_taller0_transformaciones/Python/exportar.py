@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Dibujo rápido de frames y exportación en streaming a GIF/MP4.
+
+`transformación.py` creaba una figura de matplotlib y un `FigureCanvasAgg`
+para cada frame y guardaba todos los frames en una lista antes de
+`imageio.mimsave`: casi todo el tiempo se iba en montar figuras y la memoria
+crecía con la duración de la animación. Aquí hay dos formas de dibujar un
+frame, con la misma interfaz `lienzo(x, y) -> imagen RGB`:
+
+- `LienzoFigura`: una sola figura y una sola línea; en cada frame solo se
+  cambian los datos de la línea y se redibuja el canvas.
+- `LienzoNumpy`: los ejes y la rejilla se dibujan una vez con matplotlib y
+  cada frame copia ese fondo y traza la polilínea con NumPy, usando la misma
+  transformación de datos a píxeles que los ejes.
+
+`exportar` escribe los frames en el writer de imageio a medida que llegan,
+así que la memoria no depende del número de frames.
+
+Ejemplo:
+    lienzo = LienzoNumpy(xlim=(-1, 6), ylim=(-1, 4))
+    exportar('transformacion.gif', (lienzo(x, y) for x, y in trayectorias), duration=0.1)
+"""
+
+import imageio
+import matplotlib.colors as mcolors
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+
+def _ejes(xlim, ylim, figsize, dpi):
+    """Figura con los ejes del taller (límites, aspecto igual y rejilla)."""
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvas(fig)
+    ax = fig.add_subplot()
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    return fig, canvas, ax
+
+
+# --- 1. Una figura reutilizada ---
+class LienzoFigura:
+    """
+    Dibuja cada frame actualizando los datos de una única línea.
+
+    La imagen devuelta es una vista del buffer del canvas: es válida hasta
+    el siguiente frame (`exportar` la consume antes de pedir otro).
+    """
+
+    def __init__(self, xlim, ylim, figsize=(6, 4), dpi=100, estilo='b-', linewidth=2):
+        self.fig, self.canvas, ax = _ejes(xlim, ylim, figsize, dpi)
+        self.linea, = ax.plot([], [], estilo, linewidth=linewidth)
+
+    def __call__(self, x, y):
+        self.linea.set_data(x, y)
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba())[..., :3]
+
+
+# --- 2. Fondo fijo y polilínea con NumPy ---
+class LienzoNumpy:
+    """
+    Dibuja cada frame trazando la polilínea sobre un fondo precalculado.
+
+    El trazo se aproxima estampando discos del grosor de la línea a lo largo
+    de cada segmento, con muestras cada medio píxel; no tiene antialiasing,
+    así que el borde es algo más duro que el de matplotlib.
+    """
+
+    def __init__(self, xlim, ylim, figsize=(6, 4), dpi=100, color='b', linewidth=2):
+        fig, canvas, ax = _ejes(xlim, ylim, figsize, dpi)
+        canvas.draw()
+        self.fondo = np.array(canvas.buffer_rgba())[..., :3]
+        self.alto, self.ancho = self.fondo.shape[:2]
+        # Transformación de datos a píxeles de la figura (origen abajo).
+        self.transformacion = ax.transData.frozen()
+        # Recorte al rectángulo de los ejes, como hace matplotlib.
+        (x0, y0), (x1, y1) = ax.bbox.get_points()
+        self.caja = (x0, self.alto - y1, x1, self.alto - y0)
+        self.color = np.array(mcolors.to_rgb(color)) * 255
+        radio = linewidth * dpi / 72 / 2
+        r = int(np.ceil(radio))
+        dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+        disco = dx * dx + dy * dy <= radio * radio
+        self.disco = np.stack([dx[disco], dy[disco]], axis=1)
+        self.frame = np.empty_like(self.fondo)
+
+    def a_pixeles(self, x, y):
+        """Coordenadas de datos a píxeles (columna, fila) de la imagen."""
+        px, py = self.transformacion.transform(np.column_stack([x, y])).T
+        return px, self.alto - py
+
+    def __call__(self, x, y):
+        px, py = self.a_pixeles(x, y)
+        # Muestras cada medio píxel a lo largo de cada segmento.
+        largo = np.hypot(np.diff(px), np.diff(py))
+        pasos = np.maximum(np.ceil(largo * 2).astype(np.int64), 1)
+        segmento = np.repeat(np.arange(len(pasos)), pasos)
+        t = (np.arange(pasos.sum()) - np.repeat(np.cumsum(pasos) - pasos, pasos)) / pasos[segmento]
+        sx = px[segmento] + t * (px[segmento + 1] - px[segmento])
+        sy = py[segmento] + t * (py[segmento + 1] - py[segmento])
+        sx, sy = np.append(sx, px[-1]), np.append(sy, py[-1])
+
+        cx = np.floor(sx).astype(np.int64)[:, None] + self.disco[:, 0]
+        cy = np.floor(sy).astype(np.int64)[:, None] + self.disco[:, 1]
+        x0, y0, x1, y1 = self.caja
+        dentro = (cx >= x0) & (cx < x1) & (cy >= y0) & (cy < y1)
+        np.copyto(self.frame, self.fondo)
+        self.frame[cy[dentro], cx[dentro]] = self.color
+        return self.frame
+
+
+# --- 3. Exportación ---
+def exportar(ruta, frames, **opciones):
+    """
+    Escribe los frames en un GIF o vídeo a medida que se generan.
+
+    Args:
+        ruta (str): Archivo de salida; el formato sale de la extensión (.gif,
+            .mp4 con imageio-ffmpeg...).
+        frames (iterable): Imágenes RGB uint8; cada una se escribe antes de
+            pedir la siguiente, así que pueden reutilizar el mismo buffer.
+        **opciones: Opciones del writer de imageio (`duration`, `fps`,
+            `loop`...).
+
+    Returns:
+        int: Número de frames escritos.
+    """
+    escritos = 0
+    with imageio.get_writer(ruta, mode='I', **opciones) as writer:
+        for frame in frames:
+            writer.append_data(frame)
+            escritos += 1
+    return escritos
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Pistas de animación con keyframes, curvas de suavizado y SLERP.
+
+`transformación.py` anima cada parámetro con una rampa lineal fija
+(`tx = 5 * t`, `theta = 2 * pi * t`...). Aquí cada canal es una `Pista` con
+keyframes (tiempo, valor) y un modo de interpolación entre ellos, y las
+rotaciones 3D son una `PistaRotacion` con cuaterniones interpolados por
+SLERP. Cada pista se evalúa para todos los tiempos a la vez:
+
+1. `np.searchsorted` localiza el tramo de cada tiempo y da la posición u en
+   [0, 1] dentro del tramo.
+2. u pasa por la curva de suavizado del tramo ('lineal', 'suave',
+   'entrada', 'salida' o una curva `cubic-bezier` como las de CSS).
+3. El valor sale de la interpolación lineal o de la Bézier cúbica entre los
+   keyframes, con todos los tramos evaluados en bloque.
+
+Los valores de los keyframes pueden tener cualquier forma (K, ...): con
+(K, M) una sola pista anima M objetos a la vez y el resultado es (T, M). La
+salida encaja directamente en `afines`:
+
+    t = np.linspace(0, 1, 60)
+    canales = evaluar({'tx': Pista([0, 1], [0, 5], 'suave'), ...}, t)
+    T = afines.componer(afines.traslacion(canales['tx'], canales['ty']),
+                        afines.rotacion(canales['theta']),
+                        afines.escala(canales['sx'], canales['sy']))
+"""
+
+import numpy as np
+
+
+# --- 1. Curvas de suavizado ---
+def curva_bezier(x1, y1, x2, y2, iteraciones=8):
+    """
+    Curva de suavizado `cubic-bezier(x1, y1, x2, y2)` como las de CSS.
+
+    La curva va de (0, 0) a (1, 1) con esos dos puntos de control; para cada
+    u se busca el parámetro s con x(s) = u por Newton (vectorizado) y se
+    devuelve y(s).
+
+    Returns:
+        callable: Función que transforma un array u en [0, 1].
+    """
+    if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+        raise ValueError("x1 y x2 deben estar en [0, 1] para que la curva sea una función.")
+
+    def bezier(s, p1, p2):
+        return 3 * (1 - s) ** 2 * s * p1 + 3 * (1 - s) * s * s * p2 + s ** 3
+
+    def derivada(s, p1, p2):
+        return 3 * (1 - s) ** 2 * p1 + 6 * (1 - s) * s * (p2 - p1) + 3 * s * s * (1 - p2)
+
+    def suavizar(u):
+        s = np.array(u, dtype=np.float64)
+        for _ in range(iteraciones):
+            d = derivada(s, x1, x2)
+            s = np.clip(s - np.divide(bezier(s, x1, x2) - u, d, out=np.zeros_like(s), where=d > 1e-9), 0, 1)
+        return bezier(s, y1, y2)
+
+    return suavizar
+
+
+SUAVIZADOS = {
+    'lineal': lambda u: u,
+    'constante': lambda u: np.floor(u),
+    'suave': lambda u: u * u * (3 - 2 * u),
+    'entrada': lambda u: u * u,
+    'salida': lambda u: u * (2 - u),
+    'entrada_salida': curva_bezier(0.42, 0, 0.58, 1),
+}
+
+
+def _suavizado(modo):
+    if callable(modo):
+        return modo
+    if modo not in SUAVIZADOS:
+        raise ValueError(f"Suavizado '{modo}' no válido. Usa uno de {sorted(SUAVIZADOS)} o una función.")
+    return SUAVIZADOS[modo]
+
+
+def _tramos(tiempos, t):
+    """Índice del tramo y posición u en [0, 1] dentro de él para cada tiempo."""
+    tramo = np.clip(np.searchsorted(tiempos, t, side='right') - 1, 0, len(tiempos) - 2)
+    inicio, duracion = tiempos[tramo], tiempos[tramo + 1] - tiempos[tramo]
+    u = np.clip(np.divide(t - inicio, duracion, out=np.ones_like(t), where=duracion > 0), 0, 1)
+    return tramo, u
+
+
+def _suavizar_tramos(suavizados, tramo, u):
+    """Aplica a cada u la curva de su tramo (una para todos o una por tramo)."""
+    if not isinstance(suavizados, (list, tuple)):
+        return _suavizado(suavizados)(u)
+    resultado = np.empty_like(u)
+    for i, modo in enumerate(suavizados):
+        sel = tramo == i
+        resultado[sel] = _suavizado(modo)(u[sel])
+    return resultado
+
+
+def _tiempos(tiempos):
+    tiempos = np.asarray(tiempos, dtype=np.float64)
+    if tiempos.ndim != 1 or len(tiempos) < 1 or np.any(np.diff(tiempos) < 0):
+        raise ValueError("Los tiempos de los keyframes deben ser un array 1D creciente.")
+    return tiempos
+
+
+# --- 2. Pistas de valores ---
+class Pista:
+    """
+    Canal animado por keyframes.
+
+    Args:
+        tiempos (array-like): Tiempos (K,) crecientes.
+        valores (array-like): Valores (K, ...) en cada keyframe.
+        suavizado (str | callable | list): Curva aplicada a u en cada tramo;
+            una lista da una por tramo (K - 1).
+        interpolacion (str): 'lineal' entre keyframes o 'bezier' (Bézier
+            cúbica por valor, con tangentes de Catmull-Rom si no se dan
+            `controles`).
+        controles (array-like | None): Puntos de control (K - 1, 2, ...) de
+            cada tramo para 'bezier'.
+
+    Fuera del rango de los keyframes se mantiene el primer o el último valor.
+    """
+
+    def __init__(self, tiempos, valores, suavizado='lineal', interpolacion='lineal', controles=None):
+        self.tiempos = _tiempos(tiempos)
+        self.valores = np.asarray(valores, dtype=np.float64)
+        if len(self.valores) != len(self.tiempos):
+            raise ValueError("Debe haber un valor por keyframe.")
+        if interpolacion not in ('lineal', 'bezier'):
+            raise ValueError(f"Interpolación '{interpolacion}' no válida. Usa 'lineal' o 'bezier'.")
+        if isinstance(suavizado, (list, tuple)) and len(suavizado) != len(self.tiempos) - 1:
+            raise ValueError("Con un suavizado por tramo debe haber K - 1.")
+        self.suavizado = suavizado
+        self.interpolacion = interpolacion
+        self.controles = None
+        if interpolacion == 'bezier':
+            self.controles = (np.asarray(controles, dtype=np.float64) if controles is not None
+                              else self._controles_catmull_rom())
+
+    def _controles_catmull_rom(self):
+        """Controles de Bézier con las tangentes de Catmull-Rom en cada keyframe."""
+        t, v = self.tiempos, self.valores
+        if len(t) < 2:
+            return np.empty((0, 2) + v.shape[1:])
+        forma = (-1,) + (1,) * (v.ndim - 1)
+        # Tangente en cada keyframe: diferencia centrada (en los extremos,
+        # la del único tramo vecino).
+        anterior, siguiente = np.r_[0, np.arange(len(t) - 1)], np.r_[np.arange(1, len(t)), len(t) - 1]
+        dt = (t[siguiente] - t[anterior]).reshape(forma)
+        tangente = np.divide(v[siguiente] - v[anterior], dt, out=np.zeros_like(v), where=dt != 0)
+        duracion = np.diff(t).reshape(forma)
+        c1 = v[:-1] + tangente[:-1] * duracion / 3
+        c2 = v[1:] - tangente[1:] * duracion / 3
+        return np.stack([c1, c2], axis=1)
+
+    def __call__(self, t):
+        """
+        Evalúa la pista en todos los tiempos `t`.
+
+        Returns:
+            np.array: Valores (T, ...) (sin el primer eje si t es escalar).
+        """
+        escalar = np.ndim(t) == 0
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        if len(self.tiempos) == 1:
+            resultado = np.broadcast_to(self.valores[0], t.shape + self.valores.shape[1:]).copy()
+            return resultado[0] if escalar else resultado
+        tramo, u = _tramos(self.tiempos, t)
+        u = _suavizar_tramos(self.suavizado, tramo, u).reshape(u.shape + (1,) * (self.valores.ndim - 1))
+        v0, v1 = self.valores[tramo], self.valores[tramo + 1]
+        if self.interpolacion == 'lineal':
+            resultado = v0 + (v1 - v0) * u
+        else:
+            c1, c2 = self.controles[tramo, 0], self.controles[tramo, 1]
+            w = 1 - u
+            resultado = w ** 3 * v0 + 3 * w * w * u * c1 + 3 * w * u * u * c2 + u ** 3 * v1
+        return resultado[0] if escalar else resultado
+
+
+# --- 3. Rotaciones con cuaterniones ---
+def cuaternion_eje_angulo(eje, angulo):
+    """
+    Cuaterniones unitarios (w, x, y, z) de una rotación de `angulo` radianes
+    alrededor de `eje` ('x', 'y', 'z' o un vector, no necesariamente unitario).
+
+    Returns:
+        np.array: (..., 4) con la forma difundida de eje y ángulo.
+    """
+    if isinstance(eje, str):
+        eje = np.eye(3)['xyz'.index(eje)]
+    eje = np.asarray(eje, dtype=np.float64)
+    eje = eje / np.linalg.norm(eje, axis=-1, keepdims=True)
+    mitad = np.asarray(angulo, dtype=np.float64)[..., None] / 2
+    forma = np.broadcast_shapes(mitad.shape[:-1], eje.shape[:-1])
+    return np.concatenate([np.broadcast_to(np.cos(mitad), forma + (1,)),
+                           np.broadcast_to(np.sin(mitad) * eje, forma + (3,))], axis=-1)
+
+
+def matriz_de_cuaternion(q):
+    """Matrices de rotación 4x4 (..., 4, 4) de cuaterniones (w, x, y, z), como `afines`."""
+    q = np.asarray(q, dtype=np.float64)
+    w, x, y, z = np.moveaxis(q / np.linalg.norm(q, axis=-1, keepdims=True), -1, 0)
+    m = np.zeros(q.shape[:-1] + (4, 4))
+    m[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    m[..., 0, 1] = 2 * (x * y - z * w)
+    m[..., 0, 2] = 2 * (x * z + y * w)
+    m[..., 1, 0] = 2 * (x * y + z * w)
+    m[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    m[..., 1, 2] = 2 * (y * z - x * w)
+    m[..., 2, 0] = 2 * (x * z - y * w)
+    m[..., 2, 1] = 2 * (y * z + x * w)
+    m[..., 2, 2] = 1 - 2 * (x * x + y * y)
+    m[..., 3, 3] = 1
+    return m
+
+
+def slerp(q0, q1, u):
+    """
+    Interpolación esférica entre cuaterniones unitarios (..., 4) con u (...,).
+
+    Si los cuaterniones están muy próximos se usa la interpolación lineal
+    normalizada, que es equivalente y evita dividir por sen(ángulo) ~ 0.
+    """
+    u = np.asarray(u, dtype=np.float64)[..., None]
+    coseno = np.sum(q0 * q1, axis=-1, keepdims=True)
+    # q y -q son la misma rotación: se toma el camino corto.
+    q1 = np.where(coseno < 0, -q1, q1)
+    coseno = np.abs(coseno)
+    angulo = np.arccos(np.clip(coseno, -1, 1))
+    seno = np.sin(angulo)
+    cerca = seno < 1e-6
+    seno = np.where(cerca, 1, seno)
+    a = np.where(cerca, 1 - u, np.sin((1 - u) * angulo) / seno)
+    b = np.where(cerca, u, np.sin(u * angulo) / seno)
+    q = a * q0 + b * q1
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+class PistaRotacion:
+    """
+    Rotación 3D animada por keyframes de cuaterniones, interpolada con SLERP.
+
+    Args:
+        tiempos (array-like): Tiempos (K,) crecientes.
+        cuaterniones (array-like): (K, ..., 4) como (w, x, y, z); con
+            (K, M, 4) anima M objetos a la vez.
+        suavizado (str | callable | list): Curva aplicada a u, como en `Pista`.
+    """
+
+    def __init__(self, tiempos, cuaterniones, suavizado='lineal'):
+        self.tiempos = _tiempos(tiempos)
+        q = np.asarray(cuaterniones, dtype=np.float64)
+        if len(q) != len(self.tiempos) or q.shape[-1] != 4:
+            raise ValueError("Debe haber un cuaternión (w, x, y, z) por keyframe.")
+        self.cuaterniones = q / np.linalg.norm(q, axis=-1, keepdims=True)
+        self.suavizado = suavizado
+
+    def __call__(self, t):
+        """Cuaterniones (T, ..., 4) en los tiempos `t`."""
+        escalar = np.ndim(t) == 0
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        q = self.cuaterniones
+        if len(self.tiempos) == 1:
+            resultado = np.broadcast_to(q[0], t.shape + q.shape[1:]).copy()
+        else:
+            tramo, u = _tramos(self.tiempos, t)
+            u = _suavizar_tramos(self.suavizado, tramo, u).reshape(u.shape + (1,) * (q.ndim - 2))
+            resultado = slerp(q[tramo], q[tramo + 1], u)
+        return resultado[0] if escalar else resultado
+
+    def matrices(self, t):
+        """Matrices de rotación (T, ..., 4, 4) para componer con `afines`."""
+        return matriz_de_cuaternion(self(t))
+
+
+# --- 4. Varias pistas a la vez ---
+def evaluar(pistas, t):
+    """
+    Evalúa un diccionario de pistas en los mismos tiempos.
+
+    Args:
+        pistas (dict): Nombre del canal -> `Pista`, `PistaRotacion` o valor
+            fijo.
+        t (array-like): Tiempos (T,).
+
+    Returns:
+        dict: Nombre del canal -> array (T, ...).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    return {nombre: pista(t) if callable(pista) else np.broadcast_to(np.asarray(pista, dtype=np.float64), t.shape)
+            for nombre, pista in pistas.items()}
@@ -8,13 +8,10 @@ Original file is located at
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-import imageio
 
-
-num_frames = 60
-images = []
+import afines
+import exportar
+import pistas
 
 # Definir el cuadrado original centrado en (0,0)
 original_points = np.array([
@@ -25,71 +22,38 @@ original_points = np.array([
     [-0.5, -0.5]  # Cerrar el cuadrado
 ])
 
-# Convertir a coordenadas homogéneas (cada punto es una fila [x, y, 1])
-points = np.hstack([original_points, np.ones((original_points.shape[0], 1))])
-
 # Configuración de la animación
 num_frames = 60
-images = []
-
-for frame in range(num_frames):
-    t = frame / (num_frames - 1)  # t varía de 0 a 1
-
-    # Calcular parámetros de transformación
-    tx = 5 * t      # Desplazamiento en X
-    ty = 3 * t      # Desplazamiento en Y
-    theta = 2 * np.pi * t  # Rotación de 360 grados
-    sx = 1 + 2 * t  # Escala de 1 a 3
-    sy = 1 + 2 * t
-
-    # Matriz de traslación
-    T_translate = np.array([
-        [1, 0, tx],
-        [0, 1, ty],
-        [0, 0, 1]
-    ])
-
-    # Matriz de rotación
-    T_rotate = np.array([
-        [np.cos(theta), -np.sin(theta), 0],
-        [np.sin(theta), np.cos(theta), 0],
-        [0, 0, 1]
-    ])
-
-    # Matriz de escala
-    T_scale = np.array([
-        [sx, 0, 0],
-        [0, sy, 0],
-        [0, 0, 1]
-    ])
-
-    # Combinar transformaciones: escala -> rotación -> traslación
-    T = T_translate @ T_rotate @ T_scale
-
-    # Aplicar transformación a los puntos
-    transformed_points = (T @ points.T).T
-
-    # Extraer coordenadas x e y
-    x = transformed_points[:, 0]
-    y = transformed_points[:, 1]
-
-       # Crear figura y canvas
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.plot(x, y, 'b-', linewidth=2)
-    ax.set_xlim(-1, 6)
-    ax.set_ylim(-1, 4)
-    ax.set_aspect('equal')
-    ax.grid(True)
-
-    # Renderizar y obtener píxeles
-    canvas = FigureCanvas(fig)
-    canvas.draw()
-
-    # Convertir a array numpy (RGBA)
-    image = np.array(canvas.buffer_rgba())
-    images.append(image[..., :3])  # Descartar canal alpha (opcional)
-
-    plt.close(fig)
 
-# Exportar GIF
-imageio.mimsave('transformacion.gif', images, duration=0.1)
\ No newline at end of file
+# Parámetros de todos los frames a la vez (t varía de 0 a 1), como pistas
+# con keyframes: traslación (5, 3), rotación de 360 grados y escala de 1 a 3.
+# Con interpolación lineal son las mismas rampas que `tx = 5 * t`, etc.; el
+# suavizado de cada pista ('suave', 'entrada', 'salida'...) se cambia aquí.
+t = np.arange(num_frames) / (num_frames - 1)
+parametros = pistas.evaluar({
+    'tx': pistas.Pista([0, 1], [0, 5]),            # Desplazamiento en X
+    'ty': pistas.Pista([0, 1], [0, 3]),            # Desplazamiento en Y
+    'theta': pistas.Pista([0, 1], [0, 2 * np.pi]),  # Rotación de 360 grados
+    'sx': pistas.Pista([0, 1], [1, 3]),            # Escala de 1 a 3
+    'sy': pistas.Pista([0, 1], [1, 3]),
+}, t)
+
+# Combinar transformaciones: escala -> rotación -> traslación, como un array
+# (num_frames, 3, 3) con una matriz por frame.
+T = afines.matrices_animacion(parametros)
+
+# Aplicar las transformaciones de todos los frames a los puntos en una sola
+# llamada: (num_frames, 5, 2).
+trayectorias = afines.transformar(T, original_points)
+
+# Una sola figura para toda la animación: en cada frame solo cambian los
+# datos de la línea. `exportar.LienzoNumpy` dibuja la polilínea con NumPy
+# sobre un fondo fijo y es mucho más rápido en animaciones largas.
+usar_numpy = False
+Lienzo = exportar.LienzoNumpy if usar_numpy else exportar.LienzoFigura
+lienzo = Lienzo(xlim=(-1, 6), ylim=(-1, 4), figsize=(6, 4))
+
+# Exportar GIF: cada frame se escribe en cuanto se dibuja, sin guardarlos
+# todos en memoria.
+frames = (lienzo(x, y) for x, y in trayectorias.transpose(0, 2, 1))
+exportar.exportar('transformacion.gif', frames, duration=0.1)
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Grafo de escena jerárquico con NumPy para el taller de Jerarquías y
+Transformaciones.
+
+En la app de React Three Fiber cada `<group>` aplica su posición, rotación y
+escala a todos sus hijos. Aquí se hace lo mismo en Python para jerarquías de
+cientos de miles de nodos:
+
+- Los nodos no son objetos: el grafo guarda arrays con una fila por nodo
+  (padre, nivel, posición, rotación, escala, matriz local y matriz de mundo),
+  es decir, una estructura de arrays.
+- Cambiar la transformación local de un nodo solo lo marca como sucio. Al
+  pedir las matrices de mundo se recalculan las locales marcadas y las de
+  mundo de los nodos marcados y de todos sus descendientes; el resto se
+  reutiliza.
+- El recálculo recorre los niveles de la jerarquía de arriba abajo: en cada
+  nivel, mundo = mundo del padre @ local para todos los nodos sucios del
+  nivel con un solo `np.matmul`, sin recursión en Python.
+
+Las rotaciones son ángulos de Euler en radianes con el orden 'XYZ' de
+three.js (R = Rx @ Ry @ Rz) y la matriz local es T @ R @ S, como en un
+`<group>`.
+
+Ejemplo:
+    grafo = GrafoEscena()
+    sol = grafo.agregar()
+    planeta = grafo.agregar(sol, posicion=(4, 0, 0))
+    luna = grafo.agregar(planeta, posicion=(1.5, 0, 0), escala=0.5)
+    grafo.set_local(planeta, rotacion=(0, 0.5 * t, 0))
+    grafo.posiciones_mundo()[luna]
+"""
+
+import numpy as np
+
+
+def matrices_trs(posicion, rotacion, escala):
+    """
+    Matrices locales T @ R @ S (N, 4, 4) a partir de arrays (N, 3).
+
+    Args:
+        posicion (np.array): Traslaciones (N, 3).
+        rotacion (np.array): Ángulos de Euler 'XYZ' (N, 3) en radianes.
+        escala (np.array): Escalas por eje (N, 3).
+
+    Returns:
+        np.array: Matrices (N, 4, 4).
+    """
+    cx, cy, cz = np.cos(rotacion).T
+    sx, sy, sz = np.sin(rotacion).T
+    m = np.zeros((len(posicion), 4, 4))
+    # R = Rx @ Ry @ Rz desarrollada; cada columna se multiplica por su escala.
+    m[:, 0, 0] = cy * cz
+    m[:, 0, 1] = -cy * sz
+    m[:, 0, 2] = sy
+    m[:, 1, 0] = cx * sz + sx * sy * cz
+    m[:, 1, 1] = cx * cz - sx * sy * sz
+    m[:, 1, 2] = -sx * cy
+    m[:, 2, 0] = sx * sz - cx * sy * cz
+    m[:, 2, 1] = sx * cz + cx * sy * sz
+    m[:, 2, 2] = cx * cy
+    m[:, :3, :3] *= escala[:, None, :]
+    m[:, :3, 3] = posicion
+    m[:, 3, 3] = 1
+    return m
+
+
+class GrafoEscena:
+    """
+    Jerarquía de transformaciones guardada como estructura de arrays.
+
+    Los nodos se identifican por su índice y un padre siempre se crea antes
+    que sus hijos, así que el índice del padre es menor que el del hijo.
+    Los arrays crecen por duplicación, como una lista de Python.
+    """
+
+    def __init__(self, capacidad=1024):
+        self.n = 0
+        self.padre = np.empty(capacidad, dtype=np.int64)
+        self.nivel = np.empty(capacidad, dtype=np.int64)
+        self.posicion = np.empty((capacidad, 3))
+        self.rotacion = np.empty((capacidad, 3))
+        self.escala = np.empty((capacidad, 3))
+        self.local = np.empty((capacidad, 4, 4))
+        self.mundo = np.empty((capacidad, 4, 4))
+        self.sucio_local = np.zeros(capacidad, dtype=bool)
+        self.sucio_mundo = np.zeros(capacidad, dtype=bool)
+        self.nombres = {}
+        self._niveles = None
+
+    def __len__(self):
+        return self.n
+
+    def _crecer(self, minimo):
+        capacidad = len(self.padre)
+        if minimo <= capacidad:
+            return
+        nueva = max(minimo, 2 * capacidad)
+        for atributo in ('padre', 'nivel', 'posicion', 'rotacion', 'escala', 'local', 'mundo',
+                         'sucio_local', 'sucio_mundo'):
+            viejo = getattr(self, atributo)
+            array = np.zeros((nueva,) + viejo.shape[1:], dtype=viejo.dtype)
+            array[:self.n] = viejo[:self.n]
+            setattr(self, atributo, array)
+
+    # --- Construcción ---
+    def agregar_lote(self, padres, posicion=0.0, rotacion=0.0, escala=1.0):
+        """
+        Añade muchos nodos a la vez.
+
+        Args:
+            padres (array-like): Padre de cada nodo nuevo (M,): -1 para una
+                raíz, un nodo existente o un nodo anterior del mismo lote
+                (índice absoluto, menor que el del hijo).
+            posicion, rotacion, escala: Valores comunes (3,) o escalares, o
+                uno por nodo (M, 3).
+
+        Returns:
+            np.array: Índices de los nodos creados.
+        """
+        padres = np.atleast_1d(np.asarray(padres, dtype=np.int64))
+        m = len(padres)
+        ids = np.arange(self.n, self.n + m)
+        if np.any(padres >= ids) or np.any(padres < -1):
+            raise ValueError("El padre de un nodo debe existir antes que él (o ser -1).")
+        self._crecer(self.n + m)
+        self.padre[ids] = padres
+        self.posicion[ids] = np.broadcast_to(np.asarray(posicion, dtype=np.float64), (m, 3))
+        self.rotacion[ids] = np.broadcast_to(np.asarray(rotacion, dtype=np.float64), (m, 3))
+        self.escala[ids] = np.broadcast_to(np.asarray(escala, dtype=np.float64), (m, 3))
+        # Nivel de cada nodo por saltos de punteros: cada nodo acumula la
+        # distancia hasta su antecesor actual y salta al antecesor de este,
+        # así que bastan log2(profundidad) rondas. Los padres de fuera del
+        # lote ya tienen su nivel y cortan la cadena.
+        internos = padres >= self.n
+        antecesor = np.where(internos, padres - self.n, -1)
+        nivel = np.where(internos, 1, 0)
+        externos = (padres >= 0) & ~internos
+        nivel[externos] = self.nivel[padres[externos]] + 1
+        activos = np.flatnonzero(antecesor >= 0)
+        while len(activos):
+            siguiente = antecesor[activos]
+            nivel[activos] += nivel[siguiente]
+            antecesor[activos] = antecesor[siguiente]
+            activos = activos[antecesor[activos] >= 0]
+        self.nivel[ids] = nivel
+        self.sucio_local[ids] = True
+        self.sucio_mundo[ids] = True
+        self.n += m
+        self._niveles = None
+        return ids
+
+    def agregar(self, padre=-1, posicion=(0, 0, 0), rotacion=(0, 0, 0), escala=(1, 1, 1), nombre=None):
+        """Añade un nodo y devuelve su índice."""
+        indice = int(self.agregar_lote([padre], posicion, rotacion, escala)[0])
+        if nombre is not None:
+            self.nombres[nombre] = indice
+        return indice
+
+    def __getitem__(self, nombre):
+        return self.nombres[nombre]
+
+    # --- Transformaciones locales ---
+    def set_local(self, ids, posicion=None, rotacion=None, escala=None):
+        """
+        Cambia la transformación local de uno o varios nodos y los marca
+        como sucios; las matrices se recalculan en la próxima `actualizar`.
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        if posicion is not None:
+            self.posicion[ids] = posicion
+        if rotacion is not None:
+            self.rotacion[ids] = rotacion
+        if escala is not None:
+            self.escala[ids] = escala
+        self.sucio_local[ids] = True
+
+    def marcar(self, ids):
+        """Marca como sucios nodos cuyos arrays se han modificado directamente."""
+        self.sucio_local[ids] = True
+
+    def _orden_niveles(self):
+        """Nodos ordenados por nivel y dónde empieza cada nivel."""
+        if self._niveles is None:
+            nivel = self.nivel[:self.n]
+            orden = np.argsort(nivel, kind='stable')
+            limites = np.searchsorted(nivel[orden], np.arange(nivel.max() + 2 if self.n else 1))
+            self._niveles = (orden, limites)
+        return self._niveles
+
+    # --- Matrices de mundo ---
+    def actualizar(self):
+        """
+        Recalcula las matrices locales sucias y las de mundo de los nodos
+        sucios y sus descendientes, nivel a nivel.
+
+        Returns:
+            int: Número de matrices de mundo recalculadas.
+        """
+        n = self.n
+        if n == 0:
+            return 0
+        locales = np.flatnonzero(self.sucio_local[:n])
+        if len(locales):
+            self.local[locales] = matrices_trs(self.posicion[locales], self.rotacion[locales],
+                                               self.escala[locales])
+            self.sucio_mundo[locales] = True
+            self.sucio_local[locales] = False
+
+        sucio, padre = self.sucio_mundo, self.padre
+        marcados = np.flatnonzero(sucio[:n])
+        if len(marcados) == 0:
+            return 0
+        # Los niveles por encima del nodo sucio más alto no cambian.
+        orden, limites = self._orden_niveles()
+        recalculadas = 0
+        for nivel in range(int(self.nivel[marcados].min()), len(limites) - 1):
+            nodos = orden[limites[nivel]:limites[nivel + 1]]
+            if nivel == 0:
+                raices = nodos[sucio[nodos]]
+                self.mundo[raices] = self.local[raices]
+                recalculadas += len(raices)
+                continue
+            # Un nodo está sucio si lo está él o su padre (que ya se ha
+            # propagado desde los niveles de arriba).
+            sucio[nodos] |= sucio[padre[nodos]]
+            nodos = nodos[sucio[nodos]]
+            if len(nodos):
+                self.mundo[nodos] = np.matmul(self.mundo[padre[nodos]], self.local[nodos])
+                recalculadas += len(nodos)
+        sucio[:n] = False
+        return recalculadas
+
+    def matrices_mundo(self):
+        """Matrices de mundo (N, 4, 4) al día (vista de los arrays del grafo)."""
+        self.actualizar()
+        return self.mundo[:self.n]
+
+    def posiciones_mundo(self):
+        """Posición de cada nodo en coordenadas de mundo, (N, 3)."""
+        return self.matrices_mundo()[:, :3, 3]
+
+
+# --- Ejemplo: el sistema solar de la app ---
+def sistema_solar():
+    """Sol -> Planeta -> Luna con las posiciones de `App.jsx`."""
+    grafo = GrafoEscena()
+    sol = grafo.agregar(nombre='sol')
+    planeta = grafo.agregar(sol, posicion=(4, 0, 0), nombre='planeta')
+    grafo.agregar(planeta, posicion=(1.5, 0, 0), escala=(0.5, 0.5, 0.5), nombre='luna')
+    return grafo
+
+
+def main(segundos=2.0, fps=4):
+    grafo = sistema_solar()
+    for frame in range(int(segundos * fps) + 1):
+        t = frame / fps
+        # Mismas velocidades que `useFrame`: 0.5 rad/s el planeta y 1.5 la luna.
+        grafo.set_local([grafo['planeta'], grafo['luna']], rotacion=[(0, 0.5 * t, 0), (0, 1.5 * t, 0)])
+        posiciones = grafo.posiciones_mundo()
+        print(f"t={t:.2f}s  planeta={np.round(posiciones[grafo['planeta']], 3)}"
+              f"  luna={np.round(posiciones[grafo['luna']], 3)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark de convoluciones: bucle manual vs motor vectorizado vs OpenCV.
+
+Recorre tamaños de imagen (de 256x256 a 8K) y tamaños de kernel (de 3 a 31)
+para las familias de kernels del taller (enfoque, suavizado y bordes) y
+guarda en un JSON el tiempo, el rendimiento en megapíxeles por segundo, la
+memoria pico y el error máximo frente a una referencia con la misma
+semántica de borde y desbordamiento: `cv2.filter2D` para las versiones que
+saturan y reflejan el borde, y el motor vectorizado con ceros fuera y
+valores envueltos para el bucle original. No usa Matplotlib, así que puede
+ejecutarse en un servidor sin pantalla.
+
+Uso:
+    python benchmark.py --salida resultados.json
+    python benchmark.py --tamanos 256x256 1920x1080 --kernels 3 9 --repeticiones 5
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import cv2
+import numpy as np
+
+from convolucion import manual_convolution, manual_convolution_loop
+
+TAMANOS_POR_DEFECTO = ['256x256', '512x512', '1024x1024', '1920x1080', '3840x2160', '7680x4320']
+KERNELS_POR_DEFECTO = [3, 5, 9, 15, 31]
+
+# El bucle en Python tarda minutos en imágenes grandes; solo se mide hasta
+# este número de píxeles salvo que se indique otro límite.
+MAX_PIXELES_BUCLE = 256 * 256
+
+
+# --- Kernels ---
+def kernel_enfoque(n):
+    """Cruz de -1 con el centro compensado; para n=3 es `sharpen_kernel`."""
+    kernel = np.zeros((n, n), dtype=np.int64)
+    kernel[n // 2, :] = -1
+    kernel[:, n // 2] = -1
+    kernel[n // 2, n // 2] = 1 + 2 * (n - 1)
+    return kernel
+
+
+def kernel_suavizado(n):
+    """Promedio de n x n; para n=3 es `blur_kernel`."""
+    return np.full((n, n), 1 / (n * n))
+
+
+def kernel_bordes(n):
+    """Laplaciano extendido (suma 0); para n=3 es `edge_kernel`."""
+    kernel = -np.ones((n, n), dtype=np.int64)
+    kernel[n // 2, n // 2] = n * n - 1
+    return kernel
+
+
+FAMILIAS = {
+    'enfoque': kernel_enfoque,
+    'suavizado': kernel_suavizado,
+    'bordes': kernel_bordes,
+}
+
+
+# --- Implementaciones a comparar ---
+# La versión vectorizada usa saturación y borde reflejado, que es lo que hace
+# cv2.filter2D con ddepth=-1. El bucle original rellena con ceros y envuelve
+# los valores fuera de rango, así que se compara con el motor vectorizado en
+# esa misma configuración (con cv2.filter2D su error solo mediría la
+# diferencia de semántica).
+IMPLEMENTACIONES = {
+    'manual_bucle': lambda img, k: manual_convolution_loop(img, k),
+    'manual_vectorizado': lambda img, k: manual_convolution(img, k, politica='saturar', borde='reflejo_101'),
+    'opencv': lambda img, k: cv2.filter2D(img, -1, k),
+}
+
+REFERENCIAS = {
+    'opencv': lambda img, k: cv2.filter2D(img, -1, k),
+    'envolver_ceros': lambda img, k: manual_convolution(img, k, politica='envolver', borde='constante'),
+}
+REFERENCIA_DE = {'manual_bucle': 'envolver_ceros'}
+
+
+def crear_imagen(alto, ancho, semilla=0):
+    """Imagen de prueba en escala de grises: ruido con formas encima."""
+    rng = np.random.default_rng(semilla)
+    imagen = rng.integers(0, 256, size=(alto, ancho), dtype=np.uint8)
+    cv2.rectangle(imagen, (ancho // 8, alto // 8), (ancho // 2, alto // 2), 255, -1)
+    cv2.circle(imagen, (3 * ancho // 4, 3 * alto // 4), min(alto, ancho) // 6, 0, -1)
+    return imagen
+
+
+def medir(funcion, imagen, kernel, repeticiones):
+    """
+    Ejecuta `funcion` varias veces.
+
+    Returns:
+        tuple: (resultado, mejor tiempo en segundos, memoria pico en MB).
+        La memoria pico se mide con tracemalloc en una ejecución aparte, para
+        que el rastreo no afecte a los tiempos.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(imagen, kernel)
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        funcion(imagen, kernel)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, min(tiempos), pico / 2**20
+
+
+def ejecutar(tamanos, tamanos_kernel, repeticiones, max_pixeles_bucle, implementaciones):
+    """Ejecuta todas las combinaciones y devuelve la lista de resultados."""
+    resultados = []
+    for tamano in tamanos:
+        ancho, alto = (int(v) for v in tamano.lower().split('x'))
+        imagen = crear_imagen(alto, ancho)
+        megapixeles = alto * ancho / 1e6
+
+        for n in tamanos_kernel:
+            for familia, crear_kernel in FAMILIAS.items():
+                kernel = crear_kernel(n)
+                referencias = {}
+
+                for nombre in implementaciones:
+                    if nombre == 'manual_bucle' and alto * ancho > max_pixeles_bucle:
+                        continue
+                    # El bucle es demasiado lento para repetirlo.
+                    veces = 1 if nombre == 'manual_bucle' else repeticiones
+                    salida, tiempo, pico = medir(IMPLEMENTACIONES[nombre], imagen, kernel, veces)
+                    nombre_referencia = REFERENCIA_DE.get(nombre, 'opencv')
+                    if nombre_referencia not in referencias:
+                        referencias[nombre_referencia] = REFERENCIAS[nombre_referencia](imagen, kernel)
+                    error = int(np.abs(salida.astype(np.int64) - referencias[nombre_referencia]).max())
+                    rendimiento = megapixeles / tiempo if tiempo > 0 else None
+
+                    fila = {
+                        'implementacion': nombre,
+                        'kernel': familia,
+                        'tamano_kernel': n,
+                        'ancho': ancho,
+                        'alto': alto,
+                        'tiempo_s': tiempo,
+                        'megapixeles_por_s': rendimiento,
+                        'memoria_pico_mb': pico,
+                        'error_max_abs': error,
+                        'referencia': nombre_referencia,
+                    }
+                    resultados.append(fila)
+                    print(f"{nombre:>19} {familia:>9} {n:>2}x{n:<2} {ancho:>5}x{alto:<5} "
+                          f"{tiempo * 1e3:10.2f} ms "
+                          + (f"{rendimiento:9.2f}" if rendimiento is not None else f"{'-':>9}")
+                          + f" MP/s {pico:8.1f} MB  err={error} (vs {nombre_referencia})", flush=True)
+    return resultados
+
+
+def metadatos():
+    """Información del entorno para poder comparar ejecuciones entre versiones."""
+    return {
+        'fecha': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de convoluciones manuales vs OpenCV.")
+    parser.add_argument('--tamanos', nargs='+', default=TAMANOS_POR_DEFECTO,
+                        help="Tamaños de imagen como ANCHOxALTO (por defecto de 256x256 a 8K).")
+    parser.add_argument('--kernels', nargs='+', type=int, default=KERNELS_POR_DEFECTO,
+                        help="Tamaños de kernel (lado).")
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help="Repeticiones por medida; se guarda el mejor tiempo.")
+    parser.add_argument('--max-pixeles-bucle', type=int, default=MAX_PIXELES_BUCLE,
+                        help="Tamaño máximo (en píxeles) en el que se mide el bucle manual.")
+    parser.add_argument('--implementaciones', nargs='+', default=list(IMPLEMENTACIONES),
+                        choices=list(IMPLEMENTACIONES))
+    parser.add_argument('--salida', default='benchmark_convolucion.json',
+                        help="Archivo JSON donde se guardan los resultados.")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.tamanos, args.kernels, args.repeticiones,
+                          args.max_pixeles_bucle, args.implementaciones)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump({'metadatos': metadatos(), 'resultados': resultados}, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en '{args.salida}'.")
+
+
+if __name__ == '__main__':
+    main()
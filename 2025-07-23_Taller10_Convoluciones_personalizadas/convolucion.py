@@ -0,0 +1,630 @@
+"""
+Motor de convolución 2D del Taller 10.
+
+`manual_convolution` conserva la firma y el resultado de la versión con doble
+bucle (que se mantiene como `manual_convolution_loop` para comparar), pero
+elige entre tres estrategias vectorizadas:
+
+- Ventana deslizante: vistas con stride tricks sobre bandas de filas, sin
+  copiar la imagen completa.
+- Separable: kernels de rango 1 (por ejemplo `blur_kernel`) se aplican como
+  dos pasadas 1-D en aritmética entera exacta.
+- FFT: para kernels grandes, donde el coste por píxel deja de depender del
+  número de coeficientes.
+
+Las rutas rápidas pueden diferir del bucle en el último bit del acumulador
+flotante, lo que cambia el truncado a entero. Por eso se acota el error de
+cada una y los píxeles cuyo valor queda a menos de esa cota de un entero se
+recalculan con el mismo orden de suma que usa `np.sum`.
+
+Opcionalmente se elige el tipo de salida (`ddepth`), el acumulador (int32 o
+float32), la política de conversión (desbordar, truncar o saturar) y el
+borde, de forma que la salida coincida con `cv2.filter2D` sin pasadas extra
+de `astype`/`clip` sobre la imagen completa.
+
+`banco_de_filtros` aplica una pila de kernels en una sola pasada por la
+imagen y `convolucion_por_tiles` aplica el mismo motor a imágenes en disco (`.npy` o
+TIFF mapeados en memoria) repartiendo tiles con halo en un pool de procesos.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Número de coeficientes del kernel a partir del cual se usa la FFT.
+UMBRAL_FFT = 81
+
+# Memoria aproximada que puede ocupar una banda de filas con sus temporales.
+MEMORIA_BANDA = 64 * 2**20
+
+# Si más de esta fracción de píxeles de una banda es ambigua, se recalcula la
+# banda entera con la ventana deslizante en lugar de píxel a píxel.
+FRACCION_AMBIGUA_MAXIMA = 0.25
+
+_EPS = np.finfo(np.float64).eps
+
+
+# --- Implementación de referencia ---
+def manual_convolution_loop(image, kernel):
+    """
+    Aplica una convolución 2D a una imagen utilizando un kernel específico.
+
+    Versión original con doble bucle en Python. Se conserva como referencia
+    para validar y medir el motor vectorizado.
+
+    Args:
+        image (np.array): La imagen de entrada en escala de grises.
+        kernel (np.array): El kernel (matriz de convolución).
+
+    Returns:
+        np.array: La imagen resultante después de la convolución.
+    """
+    img_height, img_width = image.shape
+    kernel_height, kernel_width = kernel.shape
+
+    pad_h = kernel_height // 2
+    pad_w = kernel_width // 2
+
+    output_image = np.zeros_like(image)
+    padded_image = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode='constant', constant_values=0)
+
+    for y in range(img_height):
+        for x in range(img_width):
+            roi = padded_image[y:y + kernel_height, x:x + kernel_width]
+            pixel_value = np.sum(roi * kernel)
+            output_image[y, x] = pixel_value
+
+    return output_image
+
+
+# --- Utilidades comunes ---
+def _tipo_acumulador(image_dtype, kernel_dtype):
+    """Tipo en el que `np.sum(roi * kernel)` acumula para estos dtypes."""
+    tipo_producto = np.result_type(image_dtype, kernel_dtype)
+    return np.zeros(1, dtype=tipo_producto).sum().dtype
+
+
+def _suma_por_pares(termino, inicio, n):
+    """
+    Suma `termino(inicio) ... termino(inicio + n - 1)` en el mismo orden que
+    la reducción por pares de NumPy (8 acumuladores y bloques de 128), de
+    modo que el resultado flotante coincide bit a bit con `np.sum`.
+
+    Los términos se piden de forma perezosa para no tener todos en memoria.
+    """
+    if n < 8:
+        resultado = -0.0
+        for i in range(inicio, inicio + n):
+            resultado = resultado + termino(i)
+        return resultado
+    if n <= 128:
+        parciales = [termino(inicio + j) for j in range(8)]
+        i = 8
+        while i < n - n % 8:
+            for j in range(8):
+                parciales[j] = parciales[j] + termino(inicio + i + j)
+            i += 8
+        resultado = ((parciales[0] + parciales[1]) + (parciales[2] + parciales[3])) + \
+                    ((parciales[4] + parciales[5]) + (parciales[6] + parciales[7]))
+        for i in range(i, n):
+            resultado = resultado + termino(inicio + i)
+        return resultado
+    mitad = n // 2
+    mitad -= mitad % 8
+    return _suma_por_pares(termino, inicio, mitad) + \
+        _suma_por_pares(termino, inicio + mitad, n - mitad)
+
+
+BORDES = ('constante', 'reflejo_101')
+
+
+def _reflejar_101(indices, n):
+    """Índices reflejados sin repetir el borde (cv2.BORDER_REFLECT_101)."""
+    if n == 1:
+        return np.zeros_like(indices)
+    periodo = 2 * n - 2
+    indices = np.abs(indices) % periodo
+    return np.where(indices >= n, periodo - indices, indices)
+
+
+def _extraer_con_halo(image, y0, y1, x0, x1, kernel_shape, borde='constante'):
+    """
+    Copia la región [y0:y1, x0:x1] con el halo que necesita el kernel.
+
+    Con `borde='constante'` lo que cae fuera de la imagen se rellena con
+    ceros (igual que `np.pad` con `mode='constant'` en la versión original);
+    con `'reflejo_101'` se refleja como hace OpenCV por defecto.
+    """
+    kh, kw = kernel_shape
+    ph, pw = kh // 2, kw // 2
+    alto, ancho = image.shape
+
+    if borde == 'reflejo_101':
+        filas = _reflejar_101(np.arange(y0 - ph, y1 - ph + kh - 1), alto)
+        columnas = _reflejar_101(np.arange(x0 - pw, x1 - pw + kw - 1), ancho)
+        # Se lee un único bloque contiguo (barato sobre un memmap) y se reordena.
+        fa, ca = filas.min(), columnas.min()
+        bloque = np.asarray(image[fa:filas.max() + 1, ca:columnas.max() + 1])
+        return bloque[np.ix_(filas - fa, columnas - ca)]
+
+    region = np.zeros((y1 - y0 + kh - 1, x1 - x0 + kw - 1), dtype=image.dtype)
+    ya, yb = max(y0 - ph, 0), min(y1 - ph + kh - 1, alto)
+    xa, xb = max(x0 - pw, 0), min(x1 - pw + kw - 1, ancho)
+    if ya < yb and xa < xb:
+        region[ya - (y0 - ph):yb - (y0 - ph), xa - (x0 - pw):xb - (x0 - pw)] = image[ya:yb, xa:xb]
+    return region
+
+
+def _filas_por_banda(ancho, factor):
+    """Filas por banda para que `factor` temporales float64 quepan en MEMORIA_BANDA."""
+    return max(1, MEMORIA_BANDA // (8 * max(ancho, 1) * factor))
+
+
+def _descomponer_separable(kernel):
+    """
+    Busca `kernel == escala * outer(columna, fila)` con `columna` y `fila`
+    enteros, lo que permite calcular la suma de la ventana de forma exacta
+    con dos pasadas 1-D.
+
+    Returns:
+        tuple | None: (escala, columna, fila) o None si el kernel no es
+        separable de esta forma.
+    """
+    kh, kw = kernel.shape
+    if kh < 2 or kw < 2 or not np.issubdtype(kernel.dtype, np.number) \
+            or np.iscomplexobj(kernel) or not np.all(np.isfinite(kernel)):
+        return None
+    no_nulos = np.abs(kernel[kernel != 0])
+    if no_nulos.size == 0:
+        return None
+
+    escala = 1.0 if np.all(kernel == np.rint(kernel)) else float(no_nulos.min())
+    k_entero = np.rint(kernel / escala)
+    if np.abs(k_entero).max() > 2**31 or \
+            np.abs(k_entero * escala - kernel).max() > 1e-12 * no_nulos.max():
+        return None
+    k_entero = k_entero.astype(np.int64)
+
+    i0, j0 = np.unravel_index(np.argmax(np.abs(k_entero)), k_entero.shape)
+    fila = k_entero[i0] // np.gcd.reduce(k_entero[i0])
+    pivote = fila[j0]
+    if np.any(k_entero[:, j0] % pivote):
+        return None
+    columna = k_entero[:, j0] // pivote
+    if not np.array_equal(np.outer(columna, fila), k_entero):
+        return None
+    return escala, columna, fila
+
+
+# --- Estrategias por banda ---
+# Cada estrategia recibe la banda con halo `region` y devuelve el valor de
+# `sum(roi * kernel)` para cada píxel de la banda, ya sea exacto o una
+# aproximación junto con su cota de error.
+
+def _banda_ventana(region, kernel, acumulador, orden_numpy=True):
+    """
+    Suma sobre la ventana deslizante. Con `orden_numpy` los flotantes se
+    suman en el orden de `np.sum`; si no, se acumula tap a tap.
+    """
+    kh, kw = kernel.shape
+    ventanas = sliding_window_view(region, (kh, kw))
+
+    def termino(t):
+        i, j = divmod(t, kw)
+        return np.multiply(ventanas[:, :, i, j], kernel[i, j], dtype=acumulador)
+
+    if orden_numpy and not np.issubdtype(acumulador, np.integer):
+        return _suma_por_pares(termino, 0, kh * kw)
+    # En enteros la suma es exacta y el orden no importa.
+    resultado = termino(0)
+    for t in range(1, kh * kw):
+        resultado += termino(t)
+    return resultado
+
+
+def _banda_separable(region, separable, alto, ancho):
+    """Suma entera exacta `sum(roi * columna x fila)` con dos pasadas 1-D."""
+    _, columna, fila = separable
+    horizontal = np.zeros((region.shape[0], ancho), dtype=np.int64)
+    for j, coef in enumerate(fila):
+        if coef:
+            horizontal += coef * region[:, j:j + ancho].astype(np.int64)
+    suma = np.zeros((alto, ancho), dtype=np.int64)
+    for i, coef in enumerate(columna):
+        if coef:
+            suma += coef * horizontal[i:i + alto]
+    return suma
+
+
+def _banda_fft(region, kernel, alto, ancho):
+    """Correlación por FFT (la convolución del taller no invierte el kernel)."""
+    forma = region.shape
+    espectro = np.fft.rfft2(region.astype(np.float64), forma) * \
+        np.fft.rfft2(kernel[::-1, ::-1].astype(np.float64), forma)
+    completa = np.fft.irfft2(espectro, forma)
+    kh, kw = kernel.shape
+    return completa[kh - 1:kh - 1 + alto, kw - 1:kw - 1 + ancho]
+
+
+def _cota_fft(region, kernel):
+    """Cota (holgada) del error absoluto de la correlación por FFT."""
+    n = region.size
+    norma_region = np.sqrt(np.sum(np.square(region, dtype=np.float64)))
+    norma_kernel = np.sqrt(np.sum(np.square(kernel, dtype=np.float64)))
+    return 8 * _EPS * max(np.log2(n), 1.0) * norma_region * norma_kernel
+
+
+def _corregir_ambiguos(valor, cota, frontera, region, kernel, acumulador):
+    """
+    Sustituye por el valor exacto los píxeles cuya conversión a entero podría
+    diferir del bucle original: los que están a menos de `cota` de un entero
+    (`frontera=0`, truncado) o de un semientero (`frontera=0.5`, redondeo).
+    """
+    desplazado = valor - frontera
+    ambiguos = np.abs(desplazado - np.rint(desplazado)) <= cota
+    cantidad = np.count_nonzero(ambiguos)
+    if cantidad == 0:
+        return valor
+    if cantidad > FRACCION_AMBIGUA_MAXIMA * valor.size:
+        return _banda_ventana(region, kernel, acumulador)
+
+    kw = kernel.shape[1]
+    yy, xx = np.nonzero(ambiguos)
+
+    def termino(t):
+        i, j = divmod(t, kw)
+        return np.multiply(region[yy + i, xx + j], kernel[i, j], dtype=acumulador)
+
+    valor[ambiguos] = _suma_por_pares(termino, 0, kernel.size)
+    return valor
+
+
+def _convolucionar_banda(region, plan, alto, ancho):
+    """Valor de `sum(roi * kernel)` para una banda, en el tipo del acumulador."""
+    kernel, acumulador = plan.kernel, plan.acumulador
+    if plan.metodo == 'ventana':
+        return _banda_ventana(region, kernel, acumulador, plan.exacto)
+
+    # Solo hay que reproducir el redondeo del bucle si se pidió el modo exacto
+    # y la salida es entera (en flotantes no hay frontera de truncado).
+    corregir = plan.exacto and plan.frontera is not None
+    maximo = float(np.abs(region).max()) if region.size else 0.0
+    # Error de redondeo del propio bucle original al acumular en float64.
+    cota_bucle = (kernel.size + 2) * _EPS * maximo * float(np.abs(kernel).sum())
+
+    if plan.metodo == 'separable':
+        escala, columna, fila = plan.separable
+        suma = _banda_separable(region, plan.separable, alto, ancho)
+        if escala == 1.0:
+            return suma.astype(acumulador)
+        valor = suma * escala
+        if not corregir:
+            return valor.astype(acumulador, copy=False)
+        desvio = np.abs(escala * np.outer(columna, fila) - kernel).sum()
+        cota = cota_bucle + maximo * desvio + _EPS * np.abs(valor).max()
+        return _corregir_ambiguos(valor, cota, plan.frontera, region, kernel, acumulador)
+
+    valor = _banda_fft(region, kernel, alto, ancho)
+    if not np.issubdtype(region.dtype, np.integer):
+        return valor.astype(acumulador)
+    cota_fft = _cota_fft(region, kernel)
+    if np.all(kernel == np.rint(kernel)):
+        if cota_fft < 0.5:
+            # Con datos y kernel enteros el resultado exacto es entero.
+            return np.rint(valor).astype(acumulador)
+        return _banda_ventana(region, kernel, acumulador, plan.exacto)
+    if not corregir:
+        return valor.astype(acumulador, copy=False)
+    return _corregir_ambiguos(valor, cota_fft + cota_bucle, plan.frontera, region, kernel, acumulador)
+
+
+# --- Conversión al tipo de salida ---
+POLITICAS = ('envolver', 'truncar', 'saturar')
+
+# Códigos de profundidad de OpenCV (cv2.CV_8U, cv2.CV_16S, ...) para `ddepth`.
+_DEPTHS_OPENCV = {0: np.uint8, 1: np.int8, 2: np.uint16, 3: np.int16,
+                  4: np.int32, 5: np.float32, 6: np.float64}
+
+
+def _resolver_ddepth(ddepth, image_dtype):
+    """Tipo de salida: -1 conserva el de la imagen, como en `cv2.filter2D`."""
+    if ddepth is None or (isinstance(ddepth, (int, np.integer)) and ddepth == -1):
+        return np.dtype(image_dtype)
+    if isinstance(ddepth, (int, np.integer)):
+        if int(ddepth) not in _DEPTHS_OPENCV:
+            raise ValueError(f"ddepth={ddepth} no es una profundidad de OpenCV soportada.")
+        return np.dtype(_DEPTHS_OPENCV[int(ddepth)])
+    return np.dtype(ddepth)
+
+
+def _convertir(valor, salida, politica):
+    """
+    Escribe la banda `valor` en `salida` aplicando la política de conversión
+    sobre la propia banda, sin recorrer de nuevo la imagen completa.
+
+    - 'envolver': trunca y desborda como la asignación del bucle original.
+    - 'truncar': trunca hacia cero y satura al rango del tipo.
+    - 'saturar': redondea al par más cercano y satura (`saturate_cast` de OpenCV).
+    """
+    if politica == 'envolver' or not np.issubdtype(salida.dtype, np.integer):
+        salida[...] = valor
+        return
+    if np.issubdtype(valor.dtype, np.floating):
+        if politica == 'saturar':
+            np.rint(valor, out=valor)
+        else:
+            np.trunc(valor, out=valor)
+    info = np.iinfo(salida.dtype)
+    np.clip(valor, info.min, info.max, out=valor)
+    salida[...] = valor
+
+
+# --- Planificación ---
+_Plan = namedtuple('_Plan', ['metodo', 'separable', 'kernel', 'acumulador',
+                             'exacto', 'frontera', 'politica', 'borde', 'factor'])
+
+
+def _planificar(image_dtype, kernel, salida_dtype, acumulador=None, politica='envolver', borde='constante'):
+    """
+    Valida las opciones y elige la estrategia una sola vez para toda la imagen.
+
+    Sin `acumulador` explícito se usa el tipo de `np.sum(roi * kernel)` y se
+    reproduce su redondeo exacto (modo exacto). Con un acumulador int32 o
+    float32 se suma directamente en ese tipo, como hace OpenCV.
+    """
+    if politica not in POLITICAS:
+        raise ValueError(f"Política '{politica}' no válida. Usa una de {POLITICAS}.")
+    if borde not in BORDES:
+        raise ValueError(f"Borde '{borde}' no válido. Usa uno de {BORDES}.")
+
+    entero = np.issubdtype(image_dtype, np.integer)
+    kernel_entero = bool(np.all(kernel == np.rint(kernel)))
+    exacto = acumulador is None
+    if exacto:
+        acumulador = _tipo_acumulador(image_dtype, kernel.dtype)
+    else:
+        acumulador = np.dtype(acumulador)
+        if np.issubdtype(acumulador, np.integer) and not (entero and kernel_entero):
+            raise ValueError("Un acumulador entero requiere imagen y kernel con valores enteros.")
+        kernel = kernel.astype(acumulador)
+
+    frontera = None
+    if np.issubdtype(salida_dtype, np.integer):
+        frontera = 0.5 if politica == 'saturar' else 0.0
+
+    if kernel.size > UMBRAL_FFT:
+        metodo, separable, factor = 'fft', None, 6
+    else:
+        # En modo exacto con salida flotante solo es exacta la ruta separable
+        # si el kernel es entero (la suma no redondea).
+        usar_separable = entero and (frontera is not None or kernel_entero or not exacto)
+        separable = _descomponer_separable(kernel) if usar_separable else None
+        metodo, factor = ('separable', 4) if separable is not None else ('ventana', 12)
+    return _Plan(metodo, separable, kernel, acumulador, exacto, frontera, politica, borde, factor)
+
+
+def _convolucionar_region(image, plan, y0, y1, x0, x1, salida):
+    """
+    Escribe en `salida` la convolución de `image[y0:y1, x0:x1]`, procesando
+    la región por bandas de filas para acotar los temporales.
+    """
+    ancho = x1 - x0
+    filas = _filas_por_banda(ancho + plan.kernel.shape[1] - 1, plan.factor)
+    for ya in range(y0, y1, filas):
+        yb = min(ya + filas, y1)
+        region = _extraer_con_halo(image, ya, yb, x0, x1, plan.kernel.shape, plan.borde)
+        valor = _convolucionar_banda(region, plan, yb - ya, ancho)
+        _convertir(valor, salida[ya - y0:yb - y0], plan.politica)
+
+
+# --- Punto de entrada ---
+def manual_convolution(image, kernel, ddepth=-1, acumulador=None, politica='envolver', borde='constante'):
+    """
+    Aplica una convolución 2D a una imagen utilizando un kernel específico.
+
+    Con las opciones por defecto produce exactamente la misma salida que
+    `manual_convolution_loop` (incluido el desbordamiento al convertir al
+    dtype de la imagen), pero sin recorrer los píxeles en Python. La única
+    excepción son las imágenes flotantes con kernels de más de `UMBRAL_FFT`
+    coeficientes: van por la FFT y pueden diferir en los últimos bits, ya
+    que sin truncado a entero no hay nada que corregir. Con
+    `politica='saturar'` y `borde='reflejo_101'` reproduce `cv2.filter2D`.
+
+    Args:
+        image (np.array): La imagen de entrada en escala de grises.
+        kernel (np.array): El kernel (matriz de convolución).
+        ddepth (int | dtype): Tipo de salida. -1 conserva el de la imagen;
+            también acepta códigos de OpenCV (cv2.CV_16S, cv2.CV_32F, ...).
+        acumulador (dtype | None): Tipo de acumulación (np.int32 o
+            np.float32). None reproduce la acumulación de `np.sum`.
+        politica (str): 'envolver', 'truncar' o 'saturar' al convertir a
+            un tipo entero.
+        borde (str): 'constante' (ceros) o 'reflejo_101' (el borde por
+            defecto de OpenCV).
+
+    Returns:
+        np.array: La imagen resultante después de la convolución.
+    """
+    image = np.asarray(image)
+    kernel = np.asarray(kernel)
+    img_height, img_width = image.shape
+
+    salida_dtype = _resolver_ddepth(ddepth, image.dtype)
+    output_image = np.empty(image.shape, dtype=salida_dtype)
+    plan = _planificar(image.dtype, kernel, salida_dtype, acumulador, politica, borde)
+    _convolucionar_region(image, plan, 0, img_height, 0, img_width, output_image)
+    return output_image
+
+
+# --- Banco de filtros ---
+# Memoria por banda del banco: más pequeña que MEMORIA_BANDA para que la banda
+# de entrada siga en caché mientras se le aplican todos los kernels.
+MEMORIA_BANDA_BANCO = 4 * 2**20
+
+
+def banco_de_filtros(image, kernels, ddepth=-1, acumulador=None, politica='envolver', borde='constante'):
+    """
+    Aplica varios kernels a la misma imagen en una sola pasada.
+
+    Cada banda de filas se lee una vez (con el halo del kernel más grande) y
+    se le aplican todos los kernels mientras está en caché, en lugar de
+    recorrer la imagen completa una vez por filtro. Cada kernel usa su propia
+    estrategia (ventana, separable o FFT), así que `salida[k]` es idéntica a
+    `manual_convolution(image, kernels[k], ...)` con las mismas opciones.
+
+    Args:
+        image (np.array): La imagen de entrada en escala de grises.
+        kernels (list | np.array): Lista de kernels 2D (pueden tener tamaños
+            distintos) o un array de forma (K, kh, kw).
+        ddepth, acumulador, politica, borde: Igual que en `manual_convolution`.
+
+    Returns:
+        np.array: Array de forma (K, H, W) con un resultado por kernel.
+    """
+    image = np.asarray(image)
+    kernels = [np.asarray(k) for k in kernels]
+    img_height, img_width = image.shape
+    if not kernels:
+        raise ValueError("El banco de filtros necesita al menos un kernel.")
+
+    salida_dtype = _resolver_ddepth(ddepth, image.dtype)
+    planes = [_planificar(image.dtype, k, salida_dtype, acumulador, politica, borde) for k in kernels]
+    output = np.empty((len(kernels), img_height, img_width), dtype=salida_dtype)
+
+    kh_max = max(k.shape[0] for k in kernels)
+    kw_max = max(k.shape[1] for k in kernels)
+    factor = max(plan.factor for plan in planes)
+    filas = max(1, MEMORIA_BANDA_BANCO // (8 * (img_width + kw_max - 1) * factor))
+    for y0 in range(0, img_height, filas):
+        y1 = min(y0 + filas, img_height)
+        region = _extraer_con_halo(image, y0, y1, 0, img_width, (kh_max, kw_max), borde)
+        for k, plan in enumerate(planes):
+            # Subvista con el halo de este kernel, alineada con su ancla.
+            kh, kw = plan.kernel.shape
+            dy, dx = kh_max // 2 - kh // 2, kw_max // 2 - kw // 2
+            subregion = region[dy:dy + y1 - y0 + kh - 1, dx:dx + img_width + kw - 1]
+            valor = _convolucionar_banda(subregion, plan, y1 - y0, img_width)
+            _convertir(valor, output[k, y0:y1], politica)
+    return output
+
+
+# --- Modo por tiles para imágenes más grandes que la RAM ---
+# Cada proceso abre la entrada y la salida como memmap una sola vez (en el
+# inicializador) y solo lee el tile con su halo, de modo que la memoria
+# residente queda acotada por unos pocos tiles sin importar el tamaño total.
+_ESTADO_TILES = {}
+
+
+def abrir_memmap(ruta, mode='r'):
+    """
+    Abre una imagen 2D como memmap sin cargarla en memoria.
+
+    Admite `.npy` y TIFF sin compresión (por tiras o tiles contiguos). Para
+    TIFF se usa `tifffile`, que solo se importa si hace falta.
+
+    Args:
+        ruta (str): Ruta del archivo `.npy`, `.tif` o `.tiff`.
+        mode (str): Modo de apertura del memmap ('r' o 'r+').
+
+    Returns:
+        np.memmap: La imagen mapeada en memoria.
+    """
+    ruta = str(ruta)
+    if ruta.lower().endswith(('.tif', '.tiff')):
+        try:
+            import tifffile
+        except ImportError as e:
+            raise ImportError("Para leer TIFF por tiles instala tifffile (pip install tifffile).") from e
+        try:
+            imagen = tifffile.memmap(ruta, mode=mode)
+        except ValueError as e:
+            raise ValueError(f"'{ruta}' no se puede mapear en memoria (¿TIFF comprimido?): {e}") from e
+    else:
+        imagen = np.load(ruta, mmap_mode=mode)
+    if imagen.ndim != 2:
+        raise ValueError(f"Se esperaba una imagen 2D en '{ruta}' y tiene forma {imagen.shape}.")
+    return imagen
+
+
+def _dividir_en_tiles(alto, ancho, tile):
+    """Genera las coordenadas (y0, y1, x0, x1) de cada tile."""
+    tile_alto, tile_ancho = tile
+    for y0 in range(0, alto, tile_alto):
+        for x0 in range(0, ancho, tile_ancho):
+            yield y0, min(y0 + tile_alto, alto), x0, min(x0 + tile_ancho, ancho)
+
+
+def _iniciar_trabajador(ruta_entrada, ruta_salida, kernel, opciones):
+    """Abre los memmaps y planifica la convolución una vez por proceso."""
+    entrada = abrir_memmap(ruta_entrada)
+    salida = np.load(ruta_salida, mmap_mode='r+')
+    _ESTADO_TILES['entrada'] = entrada
+    _ESTADO_TILES['salida'] = salida
+    _ESTADO_TILES['plan'] = _planificar(entrada.dtype, kernel, salida.dtype, **opciones)
+
+
+def _procesar_tile(coordenadas):
+    """Convoluciona un tile y lo escribe directamente en el memmap de salida."""
+    y0, y1, x0, x1 = coordenadas
+    salida = _ESTADO_TILES['salida']
+    _convolucionar_region(_ESTADO_TILES['entrada'], _ESTADO_TILES['plan'],
+                          y0, y1, x0, x1, salida[y0:y1, x0:x1])
+    return coordenadas
+
+
+def convolucion_por_tiles(ruta_entrada, kernel, ruta_salida, tile=(2048, 2048), procesos=None,
+                          ddepth=-1, acumulador=None, politica='envolver', borde='constante'):
+    """
+    Aplica `manual_convolution` a una imagen en disco, tile a tile.
+
+    La entrada se lee como memmap (`.npy` o TIFF sin compresión) y cada tile
+    se extrae con un halo del tamaño del kernel, así que el resultado es
+    idéntico al de `manual_convolution` sobre la imagen completa. Los tiles
+    se reparten en un pool de procesos que escriben en un `.npy` de salida
+    mapeado en memoria.
+
+    Args:
+        ruta_entrada (str): Imagen 2D de entrada (`.npy`, `.tif` o `.tiff`).
+        kernel (np.array): El kernel (matriz de convolución).
+        ruta_salida (str): Ruta del `.npy` de salida (se sobrescribe).
+        tile (tuple): Alto y ancho de cada tile en píxeles.
+        procesos (int | None): Número de procesos. None usa todos los núcleos;
+            1 procesa los tiles en el proceso actual.
+        ddepth, acumulador, politica, borde: Igual que en `manual_convolution`.
+
+    Returns:
+        np.memmap: La imagen resultante, mapeada en modo solo lectura.
+    """
+    kernel = np.asarray(kernel)
+    entrada = abrir_memmap(ruta_entrada)
+    alto, ancho = entrada.shape
+    opciones = dict(acumulador=acumulador, politica=politica, borde=borde)
+    salida_dtype = _resolver_ddepth(ddepth, entrada.dtype)
+    # Validar las opciones antes de crear la salida o arrancar procesos.
+    _planificar(entrada.dtype, kernel, salida_dtype, **opciones)
+    salida = np.lib.format.open_memmap(ruta_salida, mode='w+', dtype=salida_dtype, shape=(alto, ancho))
+    del salida  # Se cierra aquí; cada trabajador la abre en modo 'r+'.
+
+    tiles = list(_dividir_en_tiles(alto, ancho, tile))
+    if procesos == 1 or len(tiles) == 1:
+        _iniciar_trabajador(ruta_entrada, ruta_salida, kernel, opciones)
+        try:
+            for coordenadas in tiles:
+                _procesar_tile(coordenadas)
+            _ESTADO_TILES['salida'].flush()
+        finally:
+            _ESTADO_TILES.clear()
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        procesos = procesos or os.cpu_count() or 1
+        # Se agrupan varios tiles por tarea para reducir la comunicación.
+        lote = max(1, len(tiles) // (4 * procesos))
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(ruta_entrada, ruta_salida, kernel, opciones)) as pool:
+            for _ in pool.map(_procesar_tile, tiles, chunksize=lote):
+                pass
+
+    return np.load(ruta_salida, mmap_mode='r')
@@ -2,46 +2,13 @@ import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 
-# --- Paso 1: Implementar la Convolución 2D Manualmente ---
-def manual_convolution(image, kernel):
-    """
-    Aplica una convolución 2D a una imagen utilizando un kernel específico.
-
-    Args:
-        image (np.array): La imagen de entrada en escala de grises.
-        kernel (np.array): El kernel (matriz de convolución).
-
-    Returns:
-        np.array: La imagen resultante después de la convolución.
-    """
-    # Obtener dimensiones de la imagen y el kernel
-    img_height, img_width = image.shape
-    kernel_height, kernel_width = kernel.shape
-
-    # Calcular el padding necesario para manejar los bordes
-    pad_h = kernel_height // 2
-    pad_w = kernel_width // 2
-
-    # Crear una imagen de salida inicializada a ceros
-    output_image = np.zeros_like(image)
+from convolucion import banco_de_filtros
 
-    # Añadir padding a la imagen original para que el kernel pueda operar en los bordes
-    padded_image = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode='constant', constant_values=0)
-
-    # Iterar sobre cada píxel de la imagen (sin el padding)
-    for y in range(img_height):
-        for x in range(img_width):
-            # Extraer la región de interés (ROI) que coincide con el tamaño del kernel
-            # El +1 es para asegurar que se incluye el índice final en el slicing
-            roi = padded_image[y:y + kernel_height, x:x + kernel_width]
-
-            # Aplicar la convolución: multiplicación elemento a elemento y suma
-            pixel_value = np.sum(roi * kernel)
-
-            # Asignar el valor calculado al píxel correspondiente en la imagen de salida
-            output_image[y, x] = pixel_value
-
-    return output_image
+# --- Paso 1: Implementar la Convolución 2D Manualmente ---
+# La versión con doble bucle vive en convolucion.py como `manual_convolution_loop`.
+# `manual_convolution` mantiene su firma y su salida, pero usa ventanas
+# deslizantes, kernels separables o FFT según el kernel. `banco_de_filtros`
+# aplica varios kernels con ese mismo motor en una sola pasada.
 
 # --- Paso 2: Cargar la Imagen ---
 # Para este ejemplo, crearemos una imagen de prueba si no se encuentra una local.
@@ -88,10 +55,13 @@ edge_kernel = np.array([
 
 # --- Paso 4: Aplicar los Filtros ---
 
-# Aplicación de los filtros con la función manual
-manual_sharpened = manual_convolution(gray_image, sharpen_kernel)
-manual_blurred = manual_convolution(gray_image, blur_kernel)
-manual_edges = manual_convolution(gray_image, edge_kernel)
+# Aplicación de los filtros con la implementación manual
+# Los tres kernels se aplican con un banco de filtros, que recorre la imagen
+# una sola vez. Se satura al rango [0, 255] y se reflejan los bordes como hace
+# cv2.filter2D, para que la comparación visual sea justa (sin esto, los
+# valores negativos de edge_kernel se desbordan en lugar de quedar en 0).
+manual_sharpened, manual_blurred, manual_edges = banco_de_filtros(
+    gray_image, [sharpen_kernel, blur_kernel, edge_kernel], politica='saturar', borde='reflejo_101')
 
 # Aplicación de los mismos filtros con la función de OpenCV para comparación
 opencv_sharpened = cv2.filter2D(src=gray_image, ddepth=-1, kernel=sharpen_kernel)
@@ -0,0 +1,145 @@
+"""Pruebas del motor de `convolucion` frente al bucle original y a OpenCV."""
+
+import cv2
+import numpy as np
+import pytest
+
+import convolucion
+from convolucion import banco_de_filtros, convolucion_por_tiles, manual_convolution, manual_convolution_loop
+
+_RNG = np.random.default_rng(0)
+
+# Impares, pares y grandes (más de UMBRAL_FFT coeficientes), enteros y
+# flotantes, separables y no separables.
+KERNELS = {
+    'enfoque': np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]]),
+    'suavizado': np.full((3, 3), 1 / 9),
+    'bordes': np.array([[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]]),
+    'separable': np.outer([1, 2, 1], [1, 4, 6, 4, 1]) / 64,
+    'entero_5': _RNG.integers(-3, 4, (5, 5)),
+    'flotante_5': _RNG.normal(size=(5, 5)),
+    'par_4': _RNG.integers(-2, 3, (4, 4)),
+    'par_2x6': _RNG.normal(size=(2, 6)),
+    'grande_entero': _RNG.integers(-2, 3, (11, 11)),
+    'grande_flotante': _RNG.normal(size=(11, 11)) / 10,
+}
+
+# Kernels para los que cv2.filter2D usa el mismo anclaje (el centro).
+KERNELS_OPENCV = [n for n in KERNELS if n != 'par_2x6']
+
+
+@pytest.fixture(scope='module')
+def imagen():
+    rng = np.random.default_rng(1)
+    imagen = rng.integers(0, 256, size=(37, 45), dtype=np.uint8)
+    cv2.rectangle(imagen, (5, 5), (20, 18), 255, -1)
+    cv2.circle(imagen, (32, 25), 8, 0, -1)
+    return imagen
+
+
+def test_hay_kernels_por_fft():
+    assert KERNELS['grande_entero'].size > convolucion.UMBRAL_FFT
+
+
+# --- Bucle original ---
+@pytest.mark.parametrize('nombre', list(KERNELS))
+def test_igual_que_el_bucle(imagen, nombre):
+    kernel = KERNELS[nombre]
+    assert np.array_equal(manual_convolution(imagen, kernel), manual_convolution_loop(imagen, kernel))
+
+
+@pytest.mark.parametrize('nombre', ['suavizado', 'flotante_5', 'par_2x6'])
+def test_igual_que_el_bucle_en_flotante(imagen, nombre):
+    # Salida flotante con la ventana deslizante: el redondeo de la suma por
+    # pares de np.sum se reproduce bit a bit.
+    imagen = imagen.astype(np.float64) / 7
+    kernel = KERNELS[nombre]
+    assert np.array_equal(manual_convolution(imagen, kernel), manual_convolution_loop(imagen, kernel))
+
+
+def test_fft_en_flotante_cercano_al_bucle(imagen):
+    # Por la FFT, una salida flotante solo coincide hasta el redondeo.
+    imagen = imagen.astype(np.float64) / 7
+    kernel = KERNELS['grande_flotante']
+    np.testing.assert_allclose(manual_convolution(imagen, kernel), manual_convolution_loop(imagen, kernel),
+                               rtol=0, atol=1e-10)
+
+
+# --- OpenCV ---
+def _filter2d(imagen, ddepth, kernel):
+    kernel = kernel.astype(np.float32) if kernel.dtype.kind == 'f' else kernel
+    return cv2.filter2D(imagen, ddepth, kernel, borderType=cv2.BORDER_REFLECT_101)
+
+
+@pytest.mark.parametrize('nombre', KERNELS_OPENCV)
+@pytest.mark.parametrize('acumulador', [None, np.float32])
+def test_saturar_reflejo_igual_que_opencv(imagen, nombre, acumulador):
+    kernel = KERNELS[nombre]
+    salida = manual_convolution(imagen, kernel, acumulador=acumulador, politica='saturar', borde='reflejo_101')
+    assert np.array_equal(salida, _filter2d(imagen, -1, kernel))
+
+
+@pytest.mark.parametrize('nombre', [n for n in KERNELS_OPENCV if KERNELS[n].dtype.kind == 'i'])
+@pytest.mark.parametrize('acumulador', [None, np.int32, np.float32])
+def test_cv_16s_igual_que_opencv(imagen, nombre, acumulador):
+    kernel = KERNELS[nombre]
+    salida = manual_convolution(imagen, kernel, ddepth=cv2.CV_16S, acumulador=acumulador,
+                                politica='saturar', borde='reflejo_101')
+    assert salida.dtype == np.int16
+    assert np.array_equal(salida, _filter2d(imagen, cv2.CV_16S, kernel))
+
+
+@pytest.mark.parametrize('nombre', KERNELS_OPENCV)
+def test_cv_32f_cercano_a_opencv(imagen, nombre):
+    # En float32 OpenCV no suma en nuestro orden: solo se exige la
+    # precisión del tipo.
+    kernel = KERNELS[nombre]
+    salida = manual_convolution(imagen, kernel, ddepth=cv2.CV_32F, acumulador=np.float32,
+                                politica='saturar', borde='reflejo_101')
+    assert salida.dtype == np.float32
+    np.testing.assert_allclose(salida, _filter2d(imagen, cv2.CV_32F, kernel), rtol=1e-5, atol=1e-2)
+
+
+def test_acumulador_entero_con_kernel_flotante(imagen):
+    with pytest.raises(ValueError):
+        manual_convolution(imagen, KERNELS['suavizado'], acumulador=np.int32)
+
+
+# --- Banco de filtros ---
+@pytest.mark.parametrize('opciones', [{}, {'politica': 'saturar', 'borde': 'reflejo_101'},
+                                      {'ddepth': cv2.CV_16S, 'acumulador': np.float32, 'politica': 'truncar'}])
+def test_banco_igual_que_cada_kernel(imagen, opciones):
+    kernels = list(KERNELS.values())
+    banco = banco_de_filtros(imagen, kernels, **opciones)
+    assert banco.shape == (len(kernels),) + imagen.shape
+    for kernel, salida in zip(kernels, banco):
+        assert np.array_equal(salida, manual_convolution(imagen, kernel, **opciones))
+
+
+# --- Tiles ---
+@pytest.mark.parametrize('procesos', [1, 2])
+@pytest.mark.parametrize('nombre', ['enfoque', 'par_2x6', 'grande_flotante'])
+def test_tiles_igual_que_en_memoria(imagen, tmp_path, procesos, nombre):
+    kernel = KERNELS[nombre]
+    entrada = tmp_path / 'entrada.npy'
+    np.save(entrada, imagen)
+    opciones = {'politica': 'saturar', 'borde': 'reflejo_101'}
+    salida = convolucion_por_tiles(entrada, kernel, tmp_path / 'salida.npy', tile=(11, 16),
+                                   procesos=procesos, **opciones)
+    assert np.array_equal(salida, manual_convolution(imagen, kernel, **opciones))
+
+
+def test_tiles_desde_tiff(imagen, tmp_path):
+    tifffile = pytest.importorskip('tifffile')
+    entrada = tmp_path / 'entrada.tif'
+    tifffile.imwrite(entrada, imagen)
+    assert np.array_equal(convolucion.abrir_memmap(entrada), imagen)
+    salida = convolucion_por_tiles(entrada, KERNELS['bordes'], tmp_path / 'salida.npy', tile=(8, 8), procesos=1)
+    assert np.array_equal(salida, manual_convolution(imagen, KERNELS['bordes']))
+
+
+def test_abrir_memmap_rechaza_no_2d(tmp_path):
+    ruta = tmp_path / 'color.npy'
+    np.save(ruta, np.zeros((4, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        convolucion.abrir_memmap(ruta)
@@ -0,0 +1,360 @@
+"""
+Modo de flujo (video o secuencia de imágenes) para el taller Ojos Digitales.
+
+Aplica a cada frame la misma cadena de operadores que `main.py` (escala de
+grises, suavizado, enfoque, Sobel X/Y, Sobel combinado y Laplaciano), pero
+sin Matplotlib y reutilizando buffers preasignados entre frames. La lectura,
+el cálculo y la escritura corren en hilos separados unidos por colas
+acotadas, de modo que la decodificación y la codificación se solapan con el
+procesamiento sin acumular frames en memoria.
+
+Uso:
+    python flujo.py video.mp4 salida.mp4
+    python flujo.py carpeta_frames/ carpeta_salida/ --vista sobel_combinado
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from gradiente import magnitud_sobel
+
+EXTENSIONES_VIDEO = ('.mp4', '.avi', '.mov', '.mkv', '.m4v', '.webm')
+EXTENSIONES_IMAGEN = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+# Mismo kernel de enfoque que en main.py.
+KERNEL_ENFOQUE = np.array([[-1, -1, -1],
+                           [-1,  9, -1],
+                           [-1, -1, -1]])
+
+# Marca de fin de flujo en las colas.
+_FIN = object()
+
+
+# --- 1. Lectura de frames ---
+def es_video(ruta):
+    """Indica si la ruta corresponde a un archivo de video por su extensión."""
+    return str(ruta).lower().endswith(EXTENSIONES_VIDEO)
+
+
+def leer_frames(fuente):
+    """
+    Genera los frames BGR de un video, de una cámara o de una carpeta de
+    imágenes (en orden alfabético).
+
+    Args:
+        fuente (str | int): Ruta a un video, a una carpeta de imágenes o el
+            índice de una cámara.
+
+    Yields:
+        np.array: Cada frame en formato BGR.
+    """
+    if isinstance(fuente, int) or es_video(fuente):
+        captura = cv2.VideoCapture(fuente)
+        if not captura.isOpened():
+            raise FileNotFoundError(f"No se pudo abrir el video '{fuente}'.")
+        try:
+            while True:
+                ok, frame = captura.read()
+                if not ok:
+                    break
+                yield frame
+        finally:
+            captura.release()
+    elif os.path.isdir(fuente):
+        nombres = sorted(n for n in os.listdir(fuente) if n.lower().endswith(EXTENSIONES_IMAGEN))
+        for nombre in nombres:
+            frame = cv2.imread(os.path.join(fuente, nombre))
+            if frame is None:
+                print(f"Aviso: no se pudo leer '{nombre}', se omite.")
+                continue
+            yield frame
+    else:
+        raise FileNotFoundError(f"'{fuente}' no es un video ni una carpeta de imágenes.")
+
+
+def fps_de_fuente(fuente, por_defecto=30.0):
+    """FPS declarados por el video de entrada (o `por_defecto` si no hay)."""
+    if isinstance(fuente, int) or es_video(fuente):
+        captura = cv2.VideoCapture(fuente)
+        fps = captura.get(cv2.CAP_PROP_FPS)
+        captura.release()
+        if fps and fps > 0:
+            return fps
+    return por_defecto
+
+
+# --- 2. Cadena de operadores con buffers reutilizables ---
+class CadenaBordes:
+    """
+    Cadena de operadores del taller con todos los resultados intermedios
+    preasignados. Se crea una vez para un tamaño de frame y `procesar` solo
+    escribe en esos buffers (parámetro `dst` de OpenCV).
+    """
+
+    ETAPAS = ('gris', 'suavizado', 'enfoque', 'sobel_x', 'sobel_y', 'sobel_combinado', 'laplaciano')
+
+    def __init__(self, alto, ancho):
+        forma = (alto, ancho)
+        self.forma = forma
+        for etapa in self.ETAPAS:
+            setattr(self, etapa, np.empty(forma, dtype=np.uint8))
+        # El Laplaciano (ksize=1) de una imagen de 8 bits cabe en int16, así
+        # que no hace falta un buffer en float64 antes de pasar a 8 bits.
+        self._laplaciano_16 = np.empty(forma, dtype=np.int16)
+        # Tiempo acumulado por etapa, para informar de los fps.
+        self.tiempos = {'gris': 0.0, 'suavizado': 0.0, 'enfoque': 0.0, 'sobel': 0.0, 'laplaciano': 0.0}
+        self.frames = 0
+
+    def procesar(self, frame_bgr):
+        """Aplica la cadena completa a un frame BGR."""
+        reloj = time.perf_counter
+        t0 = reloj()
+        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY, dst=self.gris)
+        t1 = reloj()
+        cv2.blur(self.gris, (5, 5), dst=self.suavizado)
+        t2 = reloj()
+        cv2.filter2D(self.gris, -1, KERNEL_ENFOQUE, dst=self.enfoque)
+        t3 = reloj()
+        magnitud_sobel(self.gris, ksize=5, out=self.sobel_combinado, abs_x=self.sobel_x, abs_y=self.sobel_y)
+        t4 = reloj()
+        cv2.Laplacian(self.gris, cv2.CV_16S, dst=self._laplaciano_16)
+        cv2.convertScaleAbs(self._laplaciano_16, dst=self.laplaciano)
+        t5 = reloj()
+
+        self.tiempos['gris'] += t1 - t0
+        self.tiempos['suavizado'] += t2 - t1
+        self.tiempos['enfoque'] += t3 - t2
+        self.tiempos['sobel'] += t4 - t3
+        self.tiempos['laplaciano'] += t5 - t4
+        self.frames += 1
+
+
+def forma_vista(vista, alto, ancho):
+    """Forma del frame de salida para la vista elegida."""
+    if vista == 'mosaico':
+        return (3 * alto, 3 * ancho, 3)
+    return (alto, ancho)
+
+
+def componer_vista(vista, frame_bgr, cadena, destino):
+    """
+    Escribe en `destino` la vista elegida: una etapa concreta o un mosaico
+    3x3 con la misma distribución que la figura de `main.py`.
+    """
+    if vista != 'mosaico':
+        destino[...] = getattr(cadena, vista)
+        return
+    alto, ancho = cadena.forma
+    celdas = [frame_bgr, cadena.gris, cadena.suavizado,
+              cadena.enfoque, cadena.sobel_x, cadena.sobel_y,
+              cadena.sobel_combinado, cadena.laplaciano, None]
+    for i, imagen in enumerate(celdas):
+        fila, columna = divmod(i, 3)
+        celda = destino[fila * alto:(fila + 1) * alto, columna * ancho:(columna + 1) * ancho]
+        if imagen is None:
+            celda[...] = 0
+        elif imagen.ndim == 2:
+            celda[...] = imagen[..., None]
+        else:
+            celda[...] = imagen
+
+
+# --- 3. Escritura de resultados ---
+class EscritorSalida:
+    """Escribe frames en un video (según la extensión) o en una carpeta de PNG."""
+
+    def __init__(self, destino, fps, forma):
+        self.destino = destino
+        self.indice = 0
+        self.video = None
+        if es_video(destino):
+            alto, ancho = forma[:2]
+            codec = cv2.VideoWriter_fourcc(*('XVID' if destino.lower().endswith('.avi') else 'mp4v'))
+            self.video = cv2.VideoWriter(destino, codec, fps, (ancho, alto), len(forma) == 3)
+            if not self.video.isOpened():
+                raise IOError(f"No se pudo crear el video '{destino}'.")
+        else:
+            os.makedirs(destino, exist_ok=True)
+
+    def escribir(self, frame):
+        if self.video is not None:
+            self.video.write(frame)
+        else:
+            cv2.imwrite(os.path.join(self.destino, f"frame_{self.indice:06d}.png"), frame)
+        self.indice += 1
+
+    def cerrar(self):
+        if self.video is not None:
+            self.video.release()
+
+
+# --- 4. Ejecución en hilos con colas acotadas ---
+def _poner(cola, elemento, detener):
+    """`cola.put` que se rinde si otro hilo pidió detener el flujo."""
+    while not detener.is_set():
+        try:
+            cola.put(elemento, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _obtener(cola, detener):
+    """`cola.get` que devuelve `_FIN` si otro hilo pidió detener el flujo."""
+    while not detener.is_set():
+        try:
+            return cola.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _FIN
+
+
+def ejecutar_flujo(fuente, destino, vista='mosaico', tam_cola=8, fps=None, max_frames=None):
+    """
+    Procesa un flujo de frames con tres hilos: decodificación, cálculo y
+    codificación, unidos por colas de tamaño `tam_cola`.
+
+    Los buffers de salida forman un pool de `tam_cola + 2` arrays que el hilo
+    de escritura devuelve al pool al terminar con cada uno, así que no se
+    reserva memoria nueva por frame después del primero.
+
+    Args:
+        fuente (str | int): Video, carpeta de imágenes o índice de cámara.
+        destino (str): Video de salida (.mp4, .avi, ...) o carpeta para PNG.
+        vista (str): 'mosaico' o el nombre de una etapa de `CadenaBordes`.
+        tam_cola (int): Tamaño máximo de cada cola entre hilos.
+        fps (float | None): FPS del video de salida; None usa los de la fuente.
+        max_frames (int | None): Detenerse tras este número de frames.
+
+    Returns:
+        dict: FPS medidos por etapa y en total.
+    """
+    if vista != 'mosaico' and vista not in CadenaBordes.ETAPAS:
+        raise ValueError(f"Vista '{vista}' no válida. Usa 'mosaico' o una de {CadenaBordes.ETAPAS}.")
+    fps = fps or fps_de_fuente(fuente)
+
+    cola_frames = queue.Queue(maxsize=tam_cola)
+    cola_salida = queue.Queue(maxsize=tam_cola)
+    libres = queue.Queue()
+    detener = threading.Event()
+    errores = []
+    tiempos = {'decodificacion': 0.0, 'escritura': 0.0}
+    estado = {'cadena': None, 'escritos': 0}
+
+    def decodificar():
+        try:
+            frames = leer_frames(fuente)
+            leidos = 0
+            while max_frames is None or leidos < max_frames:
+                inicio = time.perf_counter()
+                frame = next(frames, None)
+                tiempos['decodificacion'] += time.perf_counter() - inicio
+                if frame is None or not _poner(cola_frames, frame, detener):
+                    break
+                leidos += 1
+            frames.close()
+        except Exception as e:
+            errores.append(e)
+            detener.set()
+        finally:
+            _poner(cola_frames, _FIN, detener)
+
+    def calcular():
+        try:
+            while True:
+                frame = _obtener(cola_frames, detener)
+                if frame is _FIN:
+                    break
+                cadena = estado['cadena']
+                if cadena is None:
+                    # Los buffers se crean con el tamaño del primer frame.
+                    cadena = estado['cadena'] = CadenaBordes(*frame.shape[:2])
+                    forma = forma_vista(vista, *frame.shape[:2])
+                    for _ in range(tam_cola + 2):
+                        libres.put(np.empty(forma, dtype=np.uint8))
+                    estado['forma'] = forma
+                elif frame.shape[:2] != cadena.forma:
+                    raise ValueError(f"Todos los frames deben medir {cadena.forma}; llegó {frame.shape[:2]}.")
+                cadena.procesar(frame)
+                destino_frame = _obtener(libres, detener)
+                if destino_frame is _FIN:
+                    break
+                componer_vista(vista, frame, cadena, destino_frame)
+                if not _poner(cola_salida, destino_frame, detener):
+                    break
+        except Exception as e:
+            errores.append(e)
+            detener.set()
+        finally:
+            _poner(cola_salida, _FIN, detener)
+
+    def escribir():
+        escritor = None
+        try:
+            while True:
+                frame = _obtener(cola_salida, detener)
+                if frame is _FIN:
+                    break
+                inicio = time.perf_counter()
+                if escritor is None:
+                    escritor = EscritorSalida(destino, fps, estado['forma'])
+                escritor.escribir(frame)
+                tiempos['escritura'] += time.perf_counter() - inicio
+                estado['escritos'] += 1
+                libres.put(frame)
+        except Exception as e:
+            errores.append(e)
+            detener.set()
+        finally:
+            if escritor is not None:
+                escritor.cerrar()
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=f, name=f.__name__, daemon=True) for f in (decodificar, calcular, escribir)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - inicio
+    if errores:
+        raise errores[0]
+
+    frames = estado['escritos']
+    informe = {}
+    etapas = dict(tiempos)
+    if estado['cadena'] is not None:
+        etapas.update(estado['cadena'].tiempos)
+    for etapa, segundos in etapas.items():
+        informe[etapa] = frames / segundos if segundos > 0 else float('inf')
+    informe['total'] = frames / total if total > 0 else float('inf')
+    informe['frames'] = frames
+    return informe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detección de bordes sobre video o secuencias de imágenes.")
+    parser.add_argument('fuente', help="Video de entrada, carpeta de imágenes o índice de cámara.")
+    parser.add_argument('destino', help="Video de salida (.mp4, .avi, ...) o carpeta para los PNG.")
+    parser.add_argument('--vista', default='mosaico', choices=('mosaico',) + CadenaBordes.ETAPAS)
+    parser.add_argument('--cola', type=int, default=8, help="Tamaño de las colas entre hilos.")
+    parser.add_argument('--fps', type=float, default=None, help="FPS del video de salida.")
+    parser.add_argument('--max-frames', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    fuente = int(args.fuente) if args.fuente.isdigit() else args.fuente
+    informe = ejecutar_flujo(fuente, args.destino, args.vista, args.cola, args.fps, args.max_frames)
+
+    print(f"Frames procesados: {informe.pop('frames')}")
+    for etapa, fps in informe.items():
+        print(f"  {etapa:>15}: {fps:10.1f} fps")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Etapa de gradiente Sobel fusionada para el taller Ojos Digitales.
+
+`main.py` calcula `sobel_x` y `sobel_y` como imágenes completas en float64,
+las pasa a 8 bits con `convertScaleAbs` y las mezcla con `addWeighted`: cinco
+buffers del tamaño del frame, dos de ellos en float64. Aquí se recorre la
+imagen por bandas de filas y, para cada banda, se calculan las derivadas en
+int16 (o float32) y se escriben directamente la magnitud y, si se pide, la
+orientación. Los temporales ocupan solo una banda y caben en caché.
+
+Como las derivadas de una imagen de 8 bits con un kernel entero son enteras,
+int16 las representa exactamente (hasta ksize=5) y el resultado coincide
+bit a bit con la versión en float64 de `main.py`.
+"""
+
+import cv2
+import numpy as np
+
+MODOS = ('promedio', 'l2')
+
+# Filas por banda: lo bastante pocas para que los temporales quepan en caché.
+FILAS_BANDA = 64
+
+
+def _respuesta_maxima(ksize):
+    """Máximo valor absoluto de la derivada de una imagen uint8 con este ksize."""
+    suavizado, derivada = cv2.getDerivKernels(1, 0, ksize)
+    return 255 * float(np.abs(suavizado).sum() * np.abs(derivada).sum())
+
+
+def magnitud_sobel(gris, ksize=5, modo='promedio', acumulador=np.int16, out=None,
+                   orientacion=None, abs_x=None, abs_y=None, filas_banda=FILAS_BANDA):
+    """
+    Calcula la magnitud del gradiente de Sobel en una sola pasada por bandas.
+
+    Args:
+        gris (np.array): Imagen en escala de grises (uint8).
+        ksize (int): Tamaño del kernel de Sobel (1, 3, 5 o 7).
+        modo (str): 'promedio' reproduce `addWeighted(|gx|, 0.5, |gy|, 0.5, 0)`
+            sobre las derivadas saturadas a 8 bits, como `main.py`; 'l2'
+            calcula `sqrt(gx² + gy²)`.
+        acumulador (dtype): np.int16 o np.float32 para las derivadas.
+        out (np.array | None): Buffer de salida (uint8, o float32 para
+            obtener la magnitud sin saturar). Se crea si es None.
+        orientacion (np.array | None): Buffer float32 donde escribir el ángulo
+            del gradiente en grados [0, 360).
+        abs_x, abs_y (np.array | None): Buffers uint8 donde escribir
+            `convertScaleAbs(gx)` y `convertScaleAbs(gy)`.
+        filas_banda (int): Filas procesadas en cada banda.
+
+    Returns:
+        np.array: La magnitud (el mismo objeto que `out` si se pasó).
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo '{modo}' no válido. Usa uno de {MODOS}.")
+    acumulador = np.dtype(acumulador)
+    if acumulador == np.int16:
+        if _respuesta_maxima(ksize) > np.iinfo(np.int16).max:
+            raise ValueError(f"Con ksize={ksize} las derivadas no caben en int16; usa acumulador=np.float32.")
+        profundidad = cv2.CV_16S
+    elif acumulador == np.float32:
+        profundidad = cv2.CV_32F
+    else:
+        raise ValueError("El acumulador debe ser np.int16 o np.float32.")
+
+    alto, ancho = gris.shape
+    if out is None:
+        out = np.empty((alto, ancho), dtype=np.uint8)
+    for nombre, buffer in (('out', out), ('orientacion', orientacion), ('abs_x', abs_x), ('abs_y', abs_y)):
+        if buffer is not None and (buffer.shape != (alto, ancho) or not buffer.flags.c_contiguous):
+            raise ValueError(f"'{nombre}' debe ser un array C-contiguo de forma {(alto, ancho)}.")
+    salida_flotante = out.dtype == np.float32
+    if not salida_flotante and out.dtype != np.uint8:
+        raise ValueError("'out' debe ser uint8 o float32.")
+
+    # Halo de filas que necesita el kernel; en los bordes de la imagen OpenCV
+    # refleja igual que al procesar el frame completo.
+    halo = max(ksize, 3) // 2
+    filas_buffer = filas_banda + 2 * halo
+    gx = np.empty((filas_buffer, ancho), dtype=acumulador)
+    gy = np.empty((filas_buffer, ancho), dtype=acumulador)
+    ax = np.empty((filas_banda, ancho), dtype=np.uint8)
+    ay = np.empty((filas_banda, ancho), dtype=np.uint8)
+    necesita_flotantes = modo == 'l2' or salida_flotante or orientacion is not None
+    if necesita_flotantes:
+        fx = np.empty((filas_banda, ancho), dtype=np.float32)
+        fy = np.empty((filas_banda, ancho), dtype=np.float32)
+        magnitud = np.empty((filas_banda, ancho), dtype=np.float32)
+
+    for y0 in range(0, alto, filas_banda):
+        y1 = min(y0 + filas_banda, alto)
+        ya, yb = max(y0 - halo, 0), min(y1 + halo, alto)
+        n, recorte = y1 - y0, slice(y0 - ya, y0 - ya + (y1 - y0))
+        banda = gris[ya:yb]
+        cv2.Sobel(banda, profundidad, 1, 0, dst=gx[:yb - ya], ksize=ksize)
+        cv2.Sobel(banda, profundidad, 0, 1, dst=gy[:yb - ya], ksize=ksize)
+        bx, by = gx[recorte], gy[recorte]
+
+        destino_x = abs_x[y0:y1] if abs_x is not None else ax[:n]
+        destino_y = abs_y[y0:y1] if abs_y is not None else ay[:n]
+        if modo == 'promedio' or abs_x is not None or abs_y is not None:
+            cv2.convertScaleAbs(bx, dst=destino_x)
+            cv2.convertScaleAbs(by, dst=destino_y)
+
+        if necesita_flotantes:
+            fx[:n] = bx
+            fy[:n] = by
+            if orientacion is not None:
+                cv2.phase(fx[:n], fy[:n], angle=orientacion[y0:y1], angleInDegrees=True)
+
+        if modo == 'promedio' and not salida_flotante:
+            cv2.addWeighted(destino_x, 0.5, destino_y, 0.5, 0, dst=out[y0:y1])
+        elif modo == 'promedio':
+            np.abs(fx[:n], out=fx[:n])
+            np.abs(fy[:n], out=fy[:n])
+            cv2.addWeighted(fx[:n], 0.5, fy[:n], 0.5, 0, dst=out[y0:y1])
+        elif salida_flotante:
+            cv2.magnitude(fx[:n], fy[:n], magnitude=out[y0:y1])
+        else:
+            cv2.magnitude(fx[:n], fy[:n], magnitude=magnitud[:n])
+            cv2.convertScaleAbs(magnitud[:n], dst=out[y0:y1])
+    return out
@@ -2,6 +2,8 @@ import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 
+from gradiente import magnitud_sobel
+
 # --- 1. Cargar una imagen a color y convertirla a escala de grises ---
 
 # Cargar la imagen desde un archivo. Asegúrate de tener una imagen en el directorio.
@@ -43,15 +45,13 @@ img_sharpened = cv2.filter2D(img_gris, -1, kernel_sharpening)
 
 # a) Filtro de Sobel en los ejes X y Y
 # Detecta los bordes verticales (gradiente en X) y horizontales (gradiente en Y).
-sobel_x = cv2.Sobel(img_gris, cv2.CV_64F, 1, 0, ksize=5)
-sobel_y = cv2.Sobel(img_gris, cv2.CV_64F, 0, 1, ksize=5)
-
-# Convertimos de nuevo a 8-bit para poder visualizarlos
-sobel_x_abs = cv2.convertScaleAbs(sobel_x)
-sobel_y_abs = cv2.convertScaleAbs(sobel_y)
-
-# Opcional: Combinar Sobel X y Y para obtener una detección de bordes más completa
-sobel_combined = cv2.addWeighted(sobel_x_abs, 0.5, sobel_y_abs, 0.5, 0)
+# magnitud_sobel (gradiente.py) calcula ambas derivadas en int16 por bandas y
+# escribe directamente sus versiones de 8 bits (lo que haría convertScaleAbs)
+# y la combinación de ambas (lo que haría addWeighted con pesos 0.5), sin
+# crear imágenes intermedias en float64.
+sobel_x_abs = np.empty_like(img_gris)
+sobel_y_abs = np.empty_like(img_gris)
+sobel_combined = magnitud_sobel(img_gris, ksize=5, abs_x=sobel_x_abs, abs_y=sobel_y_abs)
 
 # b) Filtro Laplaciano
 # Detecta bordes en todas las direcciones calculando la segunda derivada de la imagen.
@@ -0,0 +1,223 @@
+"""
+Histogramas y estadísticas por canal para el taller De Píxels a Coordenadas.
+
+`main.py` calcula el histograma de grises con `plt.hist`, que aplana la
+imagen y la clasifica con el algoritmo genérico de Matplotlib, y luego llama
+tres veces a `cv2.calcHist` para B, G y R, recorriendo la imagen completa
+cada vez. Aquí se recorre la imagen una sola vez por bandas de filas: cada
+banda se convierte a HSV y grises y se cuentan todos sus canales mientras
+sigue en caché. El conteo de cada plano lo hace `cv2.calcHist`, que sobre
+bandas de 8 bits de `FILAS_BANDA` filas y de 2000 a 4000 columnas es unas
+tres veces más rápido que `np.bincount` (este tiene que convertir cada
+índice a int64 antes de contar).
+
+Como todos los canales son de 8 bits, el histograma contiene toda la
+información: el mínimo, el máximo, la media, la desviación típica y los
+percentiles se obtienen de los conteos sin volver a recorrer los píxeles. Y
+como los conteos se suman, se pueden acumular por tiles de una imagen o a lo
+largo de muchas imágenes para obtener histogramas de un conjunto de datos.
+
+Ejemplo:
+    hist = Histogramas()
+    hist.actualizar(imagen_bgr)
+    hist['gris'], hist.estadisticas()['R']['media']
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+# Canales que aporta cada espacio de color, en el orden en que se guardan.
+CANALES = {
+    'rgb': ('R', 'G', 'B'),
+    'hsv': ('H', 'S', 'V'),
+    'gris': ('gris',),
+}
+ESPACIOS = tuple(CANALES)
+
+# Filas por banda: lo bastante pocas para que la banda y sus conversiones
+# quepan en caché.
+FILAS_BANDA = 256
+
+# calcHist devuelve float32, que cuenta sin error hasta 2**24 por valor; las
+# bandas nunca tienen más píxeles que eso.
+MAX_PIXELES_BANDA = 2**24
+
+
+class Histogramas:
+    """
+    Histogramas de 256 valores por canal que se pueden acumular y fusionar.
+
+    Args:
+        espacios (tuple): Espacios de color a contar ('rgb', 'hsv', 'gris').
+    """
+
+    def __init__(self, espacios=ESPACIOS):
+        for espacio in espacios:
+            if espacio not in CANALES:
+                raise ValueError(f"Espacio '{espacio}' no válido. Usa uno de {ESPACIOS}.")
+        self.espacios = tuple(espacios)
+        self.canales = tuple(c for e in self.espacios for c in CANALES[e])
+        self.conteos = np.zeros((len(self.canales), 256), dtype=np.int64)
+        self.imagenes = 0
+
+    def __getitem__(self, canal):
+        return self.conteos[self.canales.index(canal)]
+
+    @property
+    def pixeles(self):
+        """Número de píxeles contados (el mismo en todos los canales)."""
+        return int(self.conteos[0].sum()) if len(self.canales) else 0
+
+    # --- Conteo ---
+    def _planos(self, banda):
+        """Planos uint8 de la banda en el orden de `self.canales`."""
+        if banda.ndim == 2:
+            if self.espacios != ('gris',):
+                raise ValueError("Una imagen en grises solo admite espacios=('gris',).")
+            return [banda]
+        planos = []
+        for espacio in self.espacios:
+            if espacio == 'rgb':
+                b, g, r = cv2.split(banda)
+                planos += [r, g, b]
+            elif espacio == 'hsv':
+                planos += list(cv2.split(cv2.cvtColor(banda, cv2.COLOR_BGR2HSV)))
+            else:
+                planos.append(cv2.cvtColor(banda, cv2.COLOR_BGR2GRAY))
+        return planos
+
+    def actualizar(self, imagen_bgr, filas_banda=FILAS_BANDA, contar_imagen=True):
+        """
+        Suma a los histogramas los píxeles de una imagen (o de un tile).
+
+        Args:
+            imagen_bgr (np.array): Imagen BGR uint8 como la de `cv2.imread`, o
+                una imagen en grises si solo se cuenta 'gris'.
+            filas_banda (int): Filas de cada banda.
+            contar_imagen (bool): Sumar uno a `imagenes`. Al acumular una
+                imagen por tiles, pasa True en uno solo de ellos.
+
+        Returns:
+            Histogramas: El propio objeto, para encadenar llamadas.
+        """
+        if imagen_bgr.dtype != np.uint8:
+            raise ValueError("Solo se admiten imágenes uint8.")
+        alto, ancho = imagen_bgr.shape[:2]
+        filas_banda = max(1, min(filas_banda, MAX_PIXELES_BANDA // max(ancho, 1)))
+        for y0 in range(0, alto, filas_banda):
+            banda = imagen_bgr[y0:y0 + filas_banda]
+            for conteo, plano in zip(self.conteos, self._planos(banda)):
+                conteo += cv2.calcHist([plano], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+        self.imagenes += int(contar_imagen)
+        return self
+
+    def fusionar(self, otro):
+        """Suma los conteos de otro objeto con los mismos canales (in situ)."""
+        if otro.canales != self.canales:
+            raise ValueError("Solo se pueden fusionar histogramas con los mismos canales.")
+        self.conteos += otro.conteos
+        self.imagenes += otro.imagenes
+        return self
+
+    def __iadd__(self, otro):
+        return self.fusionar(otro)
+
+    def __add__(self, otro):
+        return self.copia().fusionar(otro)
+
+    def copia(self):
+        nuevo = Histogramas(self.espacios)
+        nuevo.conteos[:] = self.conteos
+        nuevo.imagenes = self.imagenes
+        return nuevo
+
+    # --- Estadísticas ---
+    def estadisticas(self, percentiles=(1, 5, 25, 50, 75, 95, 99)):
+        """
+        Estadísticas de cada canal calculadas a partir de los conteos.
+
+        Los percentiles usan la inversa de la distribución acumulada: el
+        percentil p es el menor valor v con al menos el p% de los píxeles
+        menores o iguales que v (como `np.percentile(..., method='inverted_cdf')`).
+
+        Args:
+            percentiles (tuple): Percentiles a calcular, entre 0 y 100.
+
+        Returns:
+            dict: {canal: {'min', 'max', 'media', 'std', 'percentiles'}}.
+        """
+        valores = np.arange(256, dtype=np.int64)
+        resultado = {}
+        for canal, conteo in zip(self.canales, self.conteos):
+            n = int(conteo.sum())
+            if n == 0:
+                resultado[canal] = None
+                continue
+            presentes = np.flatnonzero(conteo)
+            # Sumas enteras exactas; la división se hace al final.
+            suma = int(conteo @ valores)
+            suma_cuadrados = int(conteo @ (valores * valores))
+            media = suma / n
+            varianza = (n * suma_cuadrados - suma * suma) / (n * n)
+            acumulado = np.cumsum(conteo)
+            objetivos = np.ceil(np.asarray(percentiles, dtype=np.float64) / 100 * n)
+            posiciones = np.searchsorted(acumulado, np.maximum(objetivos, 1))
+            resultado[canal] = {
+                'min': int(presentes[0]),
+                'max': int(presentes[-1]),
+                'media': media,
+                'std': float(np.sqrt(varianza)),
+                'percentiles': {p: int(v) for p, v in zip(percentiles, posiciones)},
+            }
+        return resultado
+
+
+# --- Conjuntos de imágenes ---
+def _histogramas_de_archivo(argumentos):
+    ruta, espacios = argumentos
+    imagen = cv2.imread(ruta, cv2.IMREAD_COLOR)
+    if imagen is None:
+        return ruta, None
+    return ruta, Histogramas(espacios).actualizar(imagen).conteos
+
+
+def histogramas_de_archivos(rutas, espacios=ESPACIOS, procesos=None):
+    """
+    Acumula los histogramas de muchas imágenes repartiéndolas en procesos.
+
+    Cada proceso devuelve solo los conteos de su imagen, que se fusionan en
+    el proceso principal, así que la memoria no crece con el número de
+    imágenes.
+
+    Args:
+        rutas (list[str]): Imágenes a contar.
+        espacios (tuple): Espacios de color a contar.
+        procesos (int | None): Procesos del pool (None = todos los núcleos;
+            1 = sin pool).
+
+    Returns:
+        tuple: (Histogramas con el total, lista de rutas que no se pudieron leer).
+    """
+    total = Histogramas(espacios)
+    fallidas = []
+    tareas = [(ruta, espacios) for ruta in rutas]
+    procesos = procesos or os.cpu_count() or 1
+
+    def acumular(resultados):
+        for ruta, conteos in resultados:
+            if conteos is None:
+                fallidas.append(ruta)
+            else:
+                total.conteos += conteos
+                total.imagenes += 1
+
+    if procesos == 1:
+        acumular(map(_histogramas_de_archivo, tareas))
+    else:
+        tam_lote = max(1, min(64, len(tareas) // (4 * procesos)))
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            acumular(pool.map(_histogramas_de_archivo, tareas, chunksize=tam_lote))
+    return total, fallidas
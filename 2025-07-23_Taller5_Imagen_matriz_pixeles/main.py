@@ -2,6 +2,10 @@ import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 
+from histogramas import Histogramas
+from regiones import copiar, rellenar
+from tonos import CadenaTonos
+
 # --- 1. Cargar una imagen en color ---
 # Carga la imagen desde el archivo. cv2.imread la carga en formato BGR por defecto.
 imagen_bgr = cv2.imread('imagen.jpg')
@@ -62,20 +66,22 @@ else:
 
 
     # --- 3. Utilizar slicing para modificar regiones ---
+    # Se copia una vez para poder mostrar la original al lado; las ediciones
+    # escriben sobre vistas de la copia. Los rectángulos son (x0, y0, x1, y1)
+    # y se recortan a los límites de la imagen, así que funcionan con
+    # imágenes más pequeñas que las coordenadas.
     imagen_modificada = imagen_rgb.copy()
 
     # a. Cambiar el color de un área rectangular
     # Seleccionamos un rectángulo desde la fila 100 a la 300 y la columna 150 a la 400.
     # Le asignamos un color azul puro (R=0, G=0, B=255).
-    imagen_modificada[100:300, 150:400] = [0, 0, 255]
+    rellenar(imagen_modificada, (150, 100, 400, 300), [0, 0, 255])  # = imagen_modificada[100:300, 150:400]
 
     # b. Sustituir una región por otra parte de la imagen
-    # Definimos una región de origen (por ejemplo, un parche de 100x150 píxeles)
-    region_origen = imagen_rgb[50:150, 50:200]
-    
-    # Copiamos esa región a una nueva ubicación
-    # La región de destino debe tener las mismas dimensiones.
-    imagen_modificada[350:450, 300:450] = region_origen
+    # Definimos una región de origen (por ejemplo, un parche de 100x150
+    # píxeles, imagen_rgb[50:150, 50:200]) y la copiamos con su esquina
+    # superior izquierda en (x=300, y=350), es decir, en [350:450, 300:450].
+    copiar(imagen_modificada, (50, 50, 200, 150), (300, 350), fuente=imagen_rgb)
 
     # Visualización de las modificaciones
     plt.figure(figsize=(12, 6))
@@ -91,26 +97,31 @@ else:
     plt.show()
 
     # --- 4. Calcular y visualizar el histograma de intensidades ---
-    # Convertimos la imagen a escala de grises para el histograma de intensidad
-    imagen_gris = cv2.cvtColor(imagen_bgr, cv2.COLOR_BGR2GRAY)
-
-    # a. Calcular el histograma con Matplotlib (más directo)
+    # Una sola pasada cuenta los canales RGB, HSV y la escala de grises, y
+    # de los conteos salen también las estadísticas de cada canal.
+    histogramas = Histogramas().actualizar(imagen_bgr)
+    estadisticas = histogramas.estadisticas()
+    for canal in histogramas.canales:
+        e = estadisticas[canal]
+        print(f"{canal:>4}: min={e['min']:3d} max={e['max']:3d} media={e['media']:7.2f} "
+              f"std={e['std']:6.2f} mediana={e['percentiles'][50]:3d}")
+
+    # a. Histograma de intensidades (escala de grises)
     plt.figure(figsize=(10, 5))
     plt.title("Histograma de Intensidades (Escala de Grises)")
-    plt.hist(imagen_gris.ravel(), 256, [0, 256])
+    plt.bar(np.arange(256), histogramas['gris'], width=1.0)
+    plt.xlim([0, 256])
     plt.xlabel('Intensidad de Píxel')
     plt.ylabel('Cantidad de Píxeles')
     plt.grid(True)
     plt.show()
 
-    # b. Histograma de color con OpenCV y Matplotlib
-    colores = ('b', 'g', 'r') # OpenCV carga en BGR
+    # b. Histograma de color
+    colores = {'B': 'b', 'G': 'g', 'R': 'r'}
     plt.figure(figsize=(10, 5))
     plt.title("Histograma de Color")
-    for i, col in enumerate(colores):
-        # cv2.calcHist([imagen], [canal], mask, [tamaño_hist], [rango])
-        hist_color = cv2.calcHist([imagen_bgr], [i], None, [256], [0, 256])
-        plt.plot(hist_color, color = col)
+    for canal, col in colores.items():
+        plt.plot(histogramas[canal], color = col)
         plt.xlim([0, 256])
     plt.xlabel('Intensidad de Píxel')
     plt.ylabel('Cantidad de Píxeles')
@@ -125,7 +136,10 @@ else:
     alpha = 1.5  # Factor de contraste
     beta = 50    # Valor de brillo
 
-    ajuste_manual = np.clip(alpha * imagen_rgb.astype(np.float32) + beta, 0, 255).astype(np.uint8)
+    # La ecuación solo puede dar 256 resultados, así que se evalúa una vez
+    # sobre una tabla (LUT) en lugar de sobre cada píxel en float32. El
+    # resultado es el mismo que np.clip(alpha * f + beta, 0, 255).astype(np.uint8).
+    ajuste_manual = CadenaTonos().alpha_beta(alpha, beta).aplicar(imagen_rgb)
 
     # b. Ajuste con cv2.convertScaleAbs()
     # Esta función hace esencialmente lo mismo de forma optimizada.
@@ -0,0 +1,295 @@
+"""
+Edición de regiones sobre vistas de la imagen para el taller De Píxels a
+Coordenadas.
+
+`main.py` modifica regiones con asignaciones por slicing con coordenadas
+fijas: si la imagen es más pequeña que el rectángulo, los slices se recortan
+solos pero los tamaños de origen y destino dejan de coincidir y la
+asignación falla. Aquí cada operación recorta el rectángulo a los límites de
+la imagen (y el origen en la misma medida) y escribe directamente sobre la
+vista del destino, sin copiar la imagen completa.
+
+Los rectángulos son (x0, y0, x1, y1) con x1 e y1 excluidos, como las cajas de
+las herramientas de anotación: el rectángulo de `imagen[100:300, 150:400]` es
+(150, 100, 400, 300). Las funciones `*_lote` aceptan un array (N, 4) de
+rectángulos y los aplican con una sola operación sobre la imagen.
+
+Ejemplo:
+    rellenar(imagen, (150, 100, 400, 300), (0, 0, 255))
+    copiar(imagen, (50, 50, 200, 150), (300, 350))
+    rellenar_lote(imagen, cajas, (0, 255, 0))
+"""
+
+import cv2
+import numpy as np
+
+
+# --- 1. Recorte a los límites ---
+def recortar_rects(rects, forma):
+    """
+    Recorta rectángulos (N, 4) a una imagen de forma (alto, ancho, ...).
+
+    Returns:
+        tuple: (rectángulos recortados como int64, máscara de los que no
+        quedan vacíos).
+    """
+    rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+    alto, ancho = forma[:2]
+    recortados = np.empty_like(rects)
+    np.clip(rects[:, 0::2], 0, ancho, out=recortados[:, 0::2])
+    np.clip(rects[:, 1::2], 0, alto, out=recortados[:, 1::2])
+    validos = (recortados[:, 2] > recortados[:, 0]) & (recortados[:, 3] > recortados[:, 1])
+    return recortados, validos
+
+
+def vista(imagen, rect):
+    """Vista (sin copia) del rectángulo recortado a la imagen; puede estar vacía."""
+    (x0, y0, x1, y1), = recortar_rects(rect, imagen.shape)[0]
+    return imagen[y0:max(y0, y1), x0:max(x0, x1)]
+
+
+def _color(imagen, color):
+    """Color como array del dtype de la imagen, listo para difundirse."""
+    return np.asarray(color, dtype=imagen.dtype)
+
+
+# --- 2. Operaciones sobre un rectángulo ---
+def rellenar(imagen, rect, color):
+    """
+    Rellena un rectángulo con un color, in situ.
+
+    Args:
+        imagen (np.array): Imagen a modificar.
+        rect (tuple): (x0, y0, x1, y1).
+        color: Valor escalar o por canal.
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    vista(imagen, rect)[...] = _color(imagen, color)
+    return imagen
+
+
+def copiar(imagen, rect_origen, destino, fuente=None):
+    """
+    Copia una región sobre `imagen` con su esquina superior izquierda en
+    `destino`, recortando lo que quede fuera de la imagen o de la fuente.
+
+    Args:
+        imagen (np.array): Imagen a modificar.
+        rect_origen (tuple): (x0, y0, x1, y1) en la fuente.
+        destino (tuple): (x, y) de la esquina superior izquierda en `imagen`.
+        fuente (np.array | None): Imagen de origen; por defecto la propia
+            imagen (las regiones pueden solaparse).
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    fuente = imagen if fuente is None else fuente
+    (x0, y0, x1, y1), = recortar_rects(rect_origen, fuente.shape)[0]
+    dx, dy = destino[0] - rect_origen[0], destino[1] - rect_origen[1]
+    # Rectángulo de destino del origen ya recortado, recortado a su vez a la
+    # imagen; el origen se ajusta en la misma medida.
+    (u0, v0, u1, v1), = recortar_rects((x0 + dx, y0 + dy, x1 + dx, y1 + dy), imagen.shape)[0]
+    if u1 > u0 and v1 > v0:
+        imagen[v0:v1, u0:u1] = fuente[v0 - dy:v1 - dy, u0 - dx:u1 - dx]
+    return imagen
+
+
+def mezclar(imagen, rect, color, alpha):
+    """
+    Mezcla un rectángulo con un color: (1 - alpha) * imagen + alpha * color,
+    redondeado y saturado como `cv2.addWeighted`, in situ.
+
+    Args:
+        imagen (np.array): Imagen uint8 a modificar.
+        rect (tuple): (x0, y0, x1, y1).
+        color: Valor escalar o por canal, o un parche de la forma del
+            rectángulo (se recorta igual que él).
+        alpha (float): Peso del color, entre 0 y 1.
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    region = vista(imagen, rect)
+    if region.size == 0:
+        return imagen
+    color = _color(imagen, color)
+    if color.ndim >= 2:
+        x0, y0 = max(rect[0], 0) - rect[0], max(rect[1], 0) - rect[1]
+        capa = color[y0:y0 + region.shape[0], x0:x0 + region.shape[1]]
+    else:
+        capa = np.broadcast_to(color, region.shape)
+    cv2.addWeighted(region, 1 - alpha, np.ascontiguousarray(capa), alpha, 0, dst=region)
+    return imagen
+
+
+def pegar_con_mascara(imagen, parche, mascara, destino):
+    """
+    Pega los píxeles de `parche` donde `mascara` es distinta de cero, con la
+    esquina superior izquierda en `destino`, in situ.
+
+    Args:
+        imagen (np.array): Imagen a modificar.
+        parche (np.array): Píxeles a pegar (mismos canales que la imagen).
+        mascara (np.array): Máscara 2D del tamaño del parche.
+        destino (tuple): (x, y) de la esquina superior izquierda.
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    alto, ancho = parche.shape[:2]
+    x, y = destino
+    (u0, v0, u1, v1), = recortar_rects((x, y, x + ancho, y + alto), imagen.shape)[0]
+    if u1 <= u0 or v1 <= v0:
+        return imagen
+    recorte = (slice(v0 - y, v1 - y), slice(u0 - x, u1 - x))
+    seleccion = mascara[recorte].astype(bool)
+    if parche.ndim == 3:
+        seleccion = seleccion[..., None]
+    np.copyto(imagen[v0:v1, u0:u1], parche[recorte], where=seleccion)
+    return imagen
+
+
+# --- 3. Lotes de rectángulos ---
+def mascara_de_rects(rects, forma):
+    """
+    Máscara booleana de la unión de muchos rectángulos.
+
+    Se marca +1/-1 en las cuatro esquinas de cada rectángulo y dos sumas
+    acumuladas reconstruyen la cobertura, así que el coste no depende del
+    tamaño de los rectángulos. Solo se construye sobre la caja que los
+    contiene a todos.
+
+    Returns:
+        tuple: (máscara de la caja envolvente, (x0, y0, x1, y1) de esa caja),
+        o (None, None) si no queda ningún rectángulo dentro de la imagen.
+    """
+    rects, validos = recortar_rects(rects, forma)
+    rects = rects[validos]
+    if len(rects) == 0:
+        return None, None
+    x0, y0 = rects[:, 0].min(), rects[:, 1].min()
+    x1, y1 = rects[:, 2].max(), rects[:, 3].max()
+    rects = rects - (x0, y0, x0, y0)
+    diferencias = np.zeros((y1 - y0 + 1, x1 - x0 + 1), dtype=np.int32)
+    np.add.at(diferencias, (rects[:, 1], rects[:, 0]), 1)
+    np.add.at(diferencias, (rects[:, 1], rects[:, 2]), -1)
+    np.add.at(diferencias, (rects[:, 3], rects[:, 0]), -1)
+    np.add.at(diferencias, (rects[:, 3], rects[:, 2]), 1)
+    np.cumsum(diferencias, axis=0, out=diferencias)
+    np.cumsum(diferencias, axis=1, out=diferencias)
+    return diferencias[:-1, :-1] > 0, (x0, y0, x1, y1)
+
+
+def rects_disjuntos(rects, forma):
+    """
+    Parte la unión de muchos rectángulos en rectángulos disjuntos.
+
+    Las coordenadas se comprimen a las esquinas distintas, así que la
+    rejilla de celdas tiene como mucho (2N)² elementos y no depende del
+    tamaño de la imagen ni de la caja envolvente; cada tramo horizontal de
+    celdas cubiertas es un rectángulo de salida.
+
+    Returns:
+        np.array: Rectángulos (M, 4) como (x0, y0, x1, y1), sin solapes y
+        recortados a la imagen, ordenados por filas.
+    """
+    rects, validos = recortar_rects(rects, forma)
+    rects = rects[validos]
+    if len(rects) == 0:
+        return np.empty((0, 4), dtype=np.int64)
+    xs, ys = np.unique(rects[:, 0::2]), np.unique(rects[:, 1::2])
+    ix0, ix1 = np.searchsorted(xs, rects[:, 0]), np.searchsorted(xs, rects[:, 2])
+    iy0, iy1 = np.searchsorted(ys, rects[:, 1]), np.searchsorted(ys, rects[:, 3])
+    diferencias = np.zeros((len(ys), len(xs)), dtype=np.int32)
+    np.add.at(diferencias, (iy0, ix0), 1)
+    np.add.at(diferencias, (iy0, ix1), -1)
+    np.add.at(diferencias, (iy1, ix0), -1)
+    np.add.at(diferencias, (iy1, ix1), 1)
+    np.cumsum(diferencias, axis=0, out=diferencias)
+    np.cumsum(diferencias, axis=1, out=diferencias)
+    cubiertas = (diferencias[:-1, :-1] > 0).astype(np.int8)
+    # Inicio (+1) y fin (-1) de cada tramo de celdas cubiertas de una fila.
+    cambios = np.diff(cubiertas, axis=1, prepend=0, append=0)
+    filas, inicios = np.nonzero(cambios == 1)
+    fines = np.nonzero(cambios == -1)[1]
+    return np.column_stack([xs[inicios], ys[filas], xs[fines], ys[filas + 1]])
+
+
+def rellenar_lote(imagen, rects, color):
+    """
+    Rellena muchos rectángulos con un mismo color, in situ, con una sola
+    escritura sobre la unión de todos ellos.
+
+    Args:
+        imagen (np.array): Imagen a modificar.
+        rects (array-like): Rectángulos (N, 4) como (x0, y0, x1, y1).
+        color: Valor escalar o por canal.
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    mascara, caja = mascara_de_rects(rects, imagen.shape)
+    if mascara is None:
+        return imagen
+    region = vista(imagen, caja)
+    if region.ndim == 3:
+        mascara = mascara[..., None]
+    np.copyto(region, _color(imagen, color), where=mascara)
+    return imagen
+
+
+def mezclar_lote(imagen, rects, color, alpha):
+    """
+    Mezcla muchos rectángulos con un color, in situ. Los píxeles cubiertos
+    por varios rectángulos se mezclan una sola vez: la unión se parte en
+    rectángulos disjuntos (`rects_disjuntos`) y solo se tocan sus píxeles.
+
+    Args:
+        imagen (np.array): Imagen uint8 a modificar.
+        rects (array-like): Rectángulos (N, 4) como (x0, y0, x1, y1).
+        color: Valor escalar o por canal.
+        alpha (float): Peso del color, entre 0 y 1.
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    # Se mezcla cada trozo disjunto de la unión sobre su propia vista, sin
+    # temporales del tamaño de la caja envolvente; la capa de color es una
+    # sola, del tamaño del trozo más grande, y cada trozo usa una subvista.
+    trozos = rects_disjuntos(rects, imagen.shape)
+    if len(trozos) == 0:
+        return imagen
+    alto = int((trozos[:, 3] - trozos[:, 1]).max())
+    ancho = int((trozos[:, 2] - trozos[:, 0]).max())
+    capa = np.empty((alto, ancho) + imagen.shape[2:], dtype=imagen.dtype)
+    capa[...] = _color(imagen, color)
+    for x0, y0, x1, y1 in trozos.tolist():
+        region = imagen[y0:y1, x0:x1]
+        cv2.addWeighted(region, 1 - alpha, capa[:y1 - y0, :x1 - x0], alpha, 0, dst=region)
+    return imagen
+
+
+def rellenar_rects(imagen, rects, colores):
+    """
+    Rellena cada rectángulo con su propio color, in situ. Si se solapan,
+    gana el último.
+
+    Args:
+        imagen (np.array): Imagen a modificar.
+        rects (array-like): Rectángulos (N, 4) como (x0, y0, x1, y1).
+        colores (array-like): Colores (N,) o (N, canales).
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    rects, validos = recortar_rects(rects, imagen.shape)
+    colores = np.asarray(colores, dtype=imagen.dtype)
+    if len(colores) != len(rects):
+        raise ValueError("Debe haber un color por rectángulo.")
+    # Con colores distintos el orden importa; el recorte ya está hecho en
+    # bloque y cada escritura es una asignación sobre una vista.
+    for (x0, y0, x1, y1), color in zip(rects[validos].tolist(), colores[validos]):
+        imagen[y0:y1, x0:x1] = color
+    return imagen
@@ -0,0 +1,15 @@
+"""Pruebas de `histogramas`: acumular por tiles frente a la imagen entera."""
+
+import numpy as np
+
+from histogramas import Histogramas
+
+
+def test_tiles_cuentan_una_imagen():
+    imagen = np.random.default_rng(0).integers(0, 256, (40, 30, 3), dtype=np.uint8)
+    entera = Histogramas().actualizar(imagen)
+    por_tiles = Histogramas()
+    for k, y0 in enumerate(range(0, 40, 16)):
+        por_tiles.actualizar(imagen[y0:y0 + 16], contar_imagen=k == 0)
+    assert np.array_equal(por_tiles.conteos, entera.conteos)
+    assert por_tiles.imagenes == entera.imagenes == 1
@@ -0,0 +1,44 @@
+"""Pruebas de `regiones`: mezcla por lotes sobre la unión de rectángulos."""
+
+import cv2
+import numpy as np
+import pytest
+
+import regiones
+
+
+def _union(rects, forma):
+    mascara, caja = regiones.mascara_de_rects(rects, forma)
+    union = np.zeros(forma[:2], dtype=bool)
+    if mascara is not None:
+        union[caja[1]:caja[3], caja[0]:caja[2]] = mascara
+    return union
+
+
+@pytest.mark.parametrize('canales', [None, 1, 3, 4])
+def test_mezclar_lote_solo_toca_la_union(canales):
+    rng = np.random.default_rng(canales or 0)
+    for _ in range(50):
+        alto, ancho = rng.integers(1, 60, 2)
+        forma = (alto, ancho) if canales is None else (alto, ancho, canales)
+        imagen = rng.integers(0, 256, forma, dtype=np.uint8)
+        rects = rng.integers(-10, 70, (rng.integers(0, 12), 4))
+        color = rng.integers(0, 256, canales or ())
+        alpha = rng.uniform()
+        obtenida = regiones.mezclar_lote(imagen.copy(), rects, color, alpha)
+
+        capa = np.ascontiguousarray(np.broadcast_to(color.astype(np.uint8), forma))
+        mezcla = cv2.addWeighted(imagen, 1 - alpha, capa, alpha, 0).reshape(forma)
+        union = _union(rects, forma).reshape(forma[:2] + (1,) * (imagen.ndim - 2))
+        assert np.array_equal(obtenida, np.where(union, mezcla, imagen))
+
+
+def test_rects_disjuntos_cubren_la_union_sin_solapes():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        rects = rng.integers(-10, 70, (rng.integers(0, 15), 4))
+        cobertura = np.zeros((50, 60), dtype=np.int64)
+        for x0, y0, x1, y1 in regiones.rects_disjuntos(rects, cobertura.shape):
+            cobertura[y0:y1, x0:x1] += 1
+        assert cobertura.max(initial=0) <= 1
+        assert np.array_equal(cobertura > 0, _union(rects, cobertura.shape))
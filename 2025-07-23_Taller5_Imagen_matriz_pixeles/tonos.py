@@ -0,0 +1,224 @@
+"""
+Operaciones de punto con tablas de consulta (LUT) para el taller De Píxels a
+Coordenadas.
+
+Una operación de punto sobre una imagen de 8 bits (brillo y contraste,
+gamma, curvas, ecualización...) solo puede producir 256 resultados distintos
+por canal. `main.py` calcula `alpha * f(x) + beta` convirtiendo la imagen
+completa a float32, lo que crea tres temporales del tamaño de la imagen; aquí
+la transformación se evalúa una sola vez sobre los 256 valores posibles y la
+imagen se recorre con `cv2.LUT`, que puede escribir sobre la propia imagen.
+
+Varias operaciones seguidas se componen en una sola tabla (256, canales), así
+que una cadena de cualquier longitud cuesta una única pasada sobre los píxeles.
+
+Ejemplo:
+    cadena = CadenaTonos().alpha_beta(1.5, 50).gamma(0.8).curva([(0, 0), (128, 160), (255, 255)], canal=0)
+    cadena.aplicar(imagen, out=imagen)   # in situ
+    for frame in cadena.aplicar_flujo(frames):
+        ...
+"""
+
+import cv2
+import numpy as np
+
+VALORES = np.arange(256)
+
+
+# --- 1. Tablas de una operación ---
+def lut_alpha_beta(alpha, beta, redondear=False):
+    """
+    Tabla de g(x) = alpha * f(x) + beta saturada a [0, 255].
+
+    Args:
+        alpha (float): Contraste.
+        beta (float): Brillo.
+        redondear (bool): False trunca como `np.clip(...).astype(np.uint8)`
+            en float32 (el ajuste manual de `main.py`); True reproduce
+            `cv2.convertScaleAbs` (valor absoluto y redondeo).
+
+    Returns:
+        np.array: Tabla uint8 de 256 valores.
+    """
+    if redondear:
+        # convertScaleAbs trabaja en float32 con multiplicación y suma
+        # fusionadas: el producto intermedio no se redondea.
+        valores = float(np.float32(alpha)) * VALORES + float(np.float32(beta))
+        valores = np.rint(np.abs(valores.astype(np.float32)))
+    else:
+        valores = alpha * VALORES.astype(np.float32) + beta
+    return np.clip(valores, 0, 255).astype(np.uint8)
+
+
+def lut_gamma(gamma):
+    """Tabla de la corrección gamma 255 * (f(x) / 255) ** gamma, redondeada."""
+    if gamma <= 0:
+        raise ValueError("gamma debe ser positivo.")
+    return np.rint(255 * (VALORES / 255) ** gamma).astype(np.uint8)
+
+
+def lut_curva(puntos):
+    """
+    Tabla de una curva de tonos definida por puntos de control.
+
+    Args:
+        puntos (list[tuple]): Pares (entrada, salida) en [0, 255]; entre ellos
+            la curva se interpola linealmente.
+
+    Returns:
+        np.array: Tabla uint8 de 256 valores.
+    """
+    puntos = sorted(puntos)
+    entradas, salidas = zip(*puntos)
+    return np.clip(np.rint(np.interp(VALORES, entradas, salidas)), 0, 255).astype(np.uint8)
+
+
+def lut_ecualizacion(histograma):
+    """
+    Tabla de ecualización a partir de un histograma de 256 valores.
+
+    Sigue la fórmula de `cv2.equalizeHist`, así que aplicada a la imagen de la
+    que sale el histograma da el mismo resultado. El histograma puede venir de
+    `histogramas.Histogramas`, lo que permite ecualizar con el histograma de
+    todo un conjunto de imágenes.
+    """
+    histograma = np.asarray(histograma, dtype=np.int64)
+    total = int(histograma.sum())
+    presentes = np.flatnonzero(histograma)
+    if len(presentes) == 0:
+        return VALORES.astype(np.uint8)
+    primero = presentes[0]
+    if histograma[primero] == total:
+        return np.full(256, primero, dtype=np.uint8)
+    escala = 255 / (total - histograma[primero])
+    acumulado = np.cumsum(histograma) - histograma[primero]
+    tabla = np.clip(np.rint(acumulado * escala), 0, 255).astype(np.uint8)
+    tabla[:primero + 1] = 0
+    return tabla
+
+
+def _histograma_canal(imagen, canal):
+    plano = imagen if imagen.ndim == 2 else imagen[..., canal]
+    return cv2.calcHist([plano], [0], None, [256], [0, 256]).ravel()
+
+
+# --- 2. Cadena de operaciones ---
+class CadenaTonos:
+    """
+    Secuencia de operaciones de punto que se compila en una sola LUT.
+
+    Cada método añade un paso y devuelve la propia cadena. `canal` indica a
+    qué canal de la imagen se aplica el paso (0, 1, 2 en el orden de la
+    imagen: BGR si viene de `cv2.imread`); None lo aplica a todos.
+    """
+
+    def __init__(self):
+        self.pasos = []
+
+    def _agregar(self, tabla, canal):
+        self.pasos.append((np.asarray(tabla, dtype=np.uint8), canal))
+        return self
+
+    def alpha_beta(self, alpha, beta, redondear=False, canal=None):
+        return self._agregar(lut_alpha_beta(alpha, beta, redondear), canal)
+
+    def gamma(self, gamma, canal=None):
+        return self._agregar(lut_gamma(gamma), canal)
+
+    def curva(self, puntos, canal=None):
+        return self._agregar(lut_curva(puntos), canal)
+
+    def tabla(self, tabla, canal=None):
+        """Añade una tabla uint8 de 256 valores cualquiera."""
+        if np.shape(tabla) != (256,):
+            raise ValueError("La tabla debe tener 256 valores.")
+        return self._agregar(tabla, canal)
+
+    def ecualizar(self, histograma=None, canal=None):
+        """
+        Ecualiza con un histograma fijo o, si es None, con el de cada imagen
+        en el momento de aplicar la cadena (el histograma se toma de la
+        imagen que llega a este paso, no de la original).
+        """
+        if histograma is None:
+            self.pasos.append((None, canal))
+            return self
+        return self._agregar(lut_ecualizacion(histograma), canal)
+
+    @property
+    def dinamica(self):
+        """True si algún paso depende de la imagen (ecualización sin histograma)."""
+        return any(tabla is None for tabla, _ in self.pasos)
+
+    def compilar(self, canales=1, imagen=None):
+        """
+        Compone todos los pasos en una tabla (256, canales).
+
+        Args:
+            canales (int): Canales de las imágenes a las que se aplicará.
+            imagen (np.array | None): Imagen necesaria si la cadena es dinámica.
+
+        Returns:
+            np.array: Tabla uint8 donde `tabla[v, c]` es el resultado del
+            valor v en el canal c.
+        """
+        compuesta = np.repeat(VALORES.astype(np.uint8)[:, None], canales, axis=1)
+        for tabla, canal in self.pasos:
+            seleccion = range(canales) if canal is None else [canal]
+            for c in seleccion:
+                if tabla is None:
+                    if imagen is None:
+                        raise ValueError("La cadena ecualiza con el histograma de la imagen; pasa `imagen`.")
+                    # Histograma de la imagen transformada hasta este paso,
+                    # obtenido reasignando los conteos sin tocar los píxeles.
+                    original = _histograma_canal(imagen, c)
+                    histograma = np.bincount(compuesta[:, c], weights=original, minlength=256)
+                    paso = lut_ecualizacion(histograma)
+                else:
+                    paso = tabla
+                compuesta[:, c] = paso[compuesta[:, c]]
+        return compuesta
+
+    def aplicar(self, imagen, out=None, tabla=None):
+        """
+        Aplica la cadena con una sola pasada de `cv2.LUT`.
+
+        Args:
+            imagen (np.array): Imagen uint8 de 1 a 4 canales.
+            out (np.array | None): Destino; puede ser la propia imagen para
+                trabajar in situ. Si es None se crea uno nuevo.
+            tabla (np.array | None): Tabla ya compilada para estas imágenes.
+
+        Returns:
+            np.array: La imagen transformada (`out` si se pasó).
+        """
+        if imagen.dtype != np.uint8:
+            raise ValueError("Solo se admiten imágenes uint8.")
+        canales = 1 if imagen.ndim == 2 else imagen.shape[2]
+        if tabla is None:
+            tabla = self.compilar(canales, imagen)
+        # cv2.LUT espera una tabla de 256 elementos con 1 canal o con tantos
+        # canales como la imagen.
+        tabla = np.ascontiguousarray(tabla[None, :, 0] if canales == 1 else tabla[None])
+        return cv2.LUT(imagen, tabla, dst=out)
+
+    def aplicar_flujo(self, frames, in_situ=True):
+        """
+        Aplica la cadena a una secuencia de frames.
+
+        La tabla se compila una sola vez con el primer frame, salvo que la
+        cadena sea dinámica, en cuyo caso se recompila para cada frame.
+
+        Args:
+            frames (iterable): Frames uint8 con el mismo número de canales.
+            in_situ (bool): Escribir el resultado sobre el propio frame.
+
+        Yields:
+            np.array: Cada frame transformado.
+        """
+        tabla = None
+        for frame in frames:
+            if tabla is None or self.dinamica:
+                canales = 1 if frame.ndim == 2 else frame.shape[2]
+                tabla = self.compilar(canales, frame)
+            yield self.aplicar(frame, out=frame if in_situ else None, tabla=tabla)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Renderizado por tiles, en paralelo, de escenas con líneas, círculos y
+triángulos.
+
+`mmain.py` dibuja cada figura en un hilo sobre una imagen de tamaño fijo
+(`width, height`). Aquí una `Escena` guarda las primitivas en el orden en que
+se añaden y `renderizar` recibe el tamaño de la imagen:
+
+1. La caja envolvente de cada primitiva se reparte entre los tiles de
+   pantalla que toca (binning), todo con NumPy.
+2. Cada tile es un trabajo independiente: dibuja sus primitivas, en orden,
+   sobre su propia región del framebuffer. Como dos tiles no comparten
+   píxeles, se pueden repartir entre un pool de procesos sin sincronizarlos.
+3. Con procesos, el framebuffer vive en memoria compartida
+   (`multiprocessing.shared_memory`) y cada proceso escribe directamente en
+   él; no se copian tiles de vuelta.
+
+Las coordenadas de los píxeles se calculan en coordenadas de la imagen
+completa con las funciones de `raster.py` y luego se recortan al tile, así
+que el resultado coincide píxel a píxel con dibujar las mismas primitivas en
+orden sobre un único lienzo.
+
+Ejemplo:
+    escena = Escena().triangulo((30, 50), (100, 150), (160, 60)).linea(20, 20, 180, 120)
+    poster = escena.renderizar(7680, 4320, procesos=8)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import raster
+
+# Lado de los tiles (ancho, alto); None = todo el ancho de la imagen. Los
+# triángulos se rellenan con una asignación de Python por fila y tile, así
+# que partir las filas en varios tiles multiplica ese coste: por defecto los
+# tiles son franjas horizontales.
+TILE = (None, 128)
+
+EJECUTORES = ('procesos', 'hilos')
+
+
+# --- 1. Dibujo de una primitiva sobre un tile ---
+def _dibujar(vista, x0, y0, primitiva):
+    """Dibuja una primitiva sobre la vista de un tile cuya esquina es (x0, y0)."""
+    tipo, datos, color = primitiva
+    if tipo == 'linea':
+        xs, ys = raster.puntos_bresenham(*datos)
+    elif tipo == 'circulo':
+        xs, ys = raster.puntos_circulo(*datos)
+    else:
+        # Solo se interpolan los tramos de las filas del tile.
+        ys, inicio, fin = raster.spans_triangulo(*datos, filas=(y0, y0 + vista.shape[0]))
+        raster.rellenar_spans(vista, ys - y0, inicio - x0, fin - x0, color)
+        return
+    raster.dibujar_puntos(vista, xs - x0, ys - y0, color)
+
+
+def _dibujar_tile(lienzo, primitivas, trabajo):
+    x0, y0, x1, y1, indices = trabajo
+    vista = lienzo[y0:y1, x0:x1]
+    for i in indices:
+        _dibujar(vista, x0, y0, primitivas[i])
+
+
+# --- 2. Trabajo de cada proceso ---
+# Framebuffer compartido y primitivas de cada proceso; los prepara
+# `_iniciar_trabajador`.
+_LIENZO = None
+_MEMORIA = None
+_PRIMITIVAS = None
+
+
+def _iniciar_trabajador(nombre, forma, primitivas):
+    global _LIENZO, _MEMORIA, _PRIMITIVAS
+    # Se conserva la referencia a la memoria compartida mientras viva el
+    # proceso: si se libera, el array deja de ser válido.
+    _MEMORIA = shared_memory.SharedMemory(name=nombre)
+    _LIENZO = np.ndarray(forma, dtype=np.uint8, buffer=_MEMORIA.buf)
+    _PRIMITIVAS = primitivas
+
+
+def _procesar_tile(trabajo):
+    _dibujar_tile(_LIENZO, _PRIMITIVAS, trabajo)
+    return len(trabajo[4])
+
+
+# --- 3. Escena ---
+class Escena:
+    """
+    Lista ordenada de primitivas a dibujar. Cada método añade una y devuelve
+    la propia escena; las posteriores tapan a las anteriores.
+    """
+
+    def __init__(self):
+        self.primitivas = []
+
+    def linea(self, x0, y0, x1, y1, color=raster.ROJO):
+        self.primitivas.append(('linea', (int(x0), int(y0), int(x1), int(y1)), tuple(color)))
+        return self
+
+    def circulo(self, x0, y0, radius, color=raster.AZUL):
+        self.primitivas.append(('circulo', (int(x0), int(y0), int(radius)), tuple(color)))
+        return self
+
+    def triangulo(self, p1, p2, p3, color=raster.VERDE):
+        puntos = tuple((int(x), int(y)) for x, y in (p1, p2, p3))
+        self.primitivas.append(('triangulo', puntos, tuple(color)))
+        return self
+
+    def __len__(self):
+        return len(self.primitivas)
+
+    def cajas(self):
+        """
+        Cajas envolventes (N, 4) de las primitivas como (x0, y0, x1, y1), con
+        x1 e y1 excluidos.
+        """
+        cajas = np.zeros((len(self.primitivas), 4), dtype=np.int64)
+        for i, (tipo, datos, _) in enumerate(self.primitivas):
+            if tipo == 'circulo':
+                x, y, r = datos
+                cajas[i] = (x - r, y - r, x + r + 1, y + r + 1) if r >= 0 else (0, 0, 0, 0)
+            else:
+                xs, ys = (datos[0::2], datos[1::2]) if tipo == 'linea' else zip(*datos)
+                cajas[i] = (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+        return cajas
+
+    def trabajos(self, ancho, alto, tile=TILE):
+        """
+        Reparte las primitivas entre los tiles que tocan.
+
+        Args:
+            ancho, alto (int): Tamaño de la imagen.
+            tile (int | tuple): Lado de los tiles, o (ancho, alto) con None
+                para todo el ancho o alto de la imagen.
+
+        Returns:
+            list: (x0, y0, x1, y1, índices) de cada tile con alguna
+            primitiva, con los índices en el orden de la escena y los tiles
+            más cargados primero.
+        """
+        tile_x, tile_y = (tile, tile) if np.isscalar(tile) else tile
+        tile_x, tile_y = tile_x or ancho, tile_y or alto
+        cajas = self.cajas()
+        np.clip(cajas[:, 0::2], 0, ancho, out=cajas[:, 0::2])
+        np.clip(cajas[:, 1::2], 0, alto, out=cajas[:, 1::2])
+        validas = np.flatnonzero((cajas[:, 2] > cajas[:, 0]) & (cajas[:, 3] > cajas[:, 1]))
+        x0, y0, x1, y1 = cajas[validas].T
+        tx0, ty0 = x0 // tile_x, y0 // tile_y
+        nx, ny = (x1 - 1) // tile_x - tx0 + 1, (y1 - 1) // tile_y - ty0 + 1
+        cuantos = nx * ny
+        primitiva = np.repeat(validas, cuantos)
+        local = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        k = np.repeat(np.arange(len(validas)), cuantos)
+        tiles_x = -(-ancho // tile_x)
+        tile_id = (ty0[k] + local // nx[k]) * tiles_x + tx0[k] + local % nx[k]
+        # Orden estable: dentro de cada tile se conserva el de la escena.
+        orden = np.argsort(tile_id, kind='stable')
+        tile_id, primitiva = tile_id[orden], primitiva[orden]
+        ids, inicios, cuenta = np.unique(tile_id, return_index=True, return_counts=True)
+
+        trabajos = []
+        for t, i, c in sorted(zip(ids.tolist(), inicios.tolist(), cuenta.tolist()), key=lambda x: -x[2]):
+            x, y = (t % tiles_x) * tile_x, (t // tiles_x) * tile_y
+            trabajos.append((x, y, min(x + tile_x, ancho), min(y + tile_y, alto), primitiva[i:i + c]))
+        return trabajos
+
+    def renderizar(self, ancho, alto, fondo=(255, 255, 255), tile=TILE, procesos=None, ejecutor='procesos'):
+        """
+        Dibuja la escena en una imagen nueva.
+
+        Args:
+            ancho, alto (int): Tamaño de la imagen.
+            fondo (tuple): Color de fondo.
+            tile (int | tuple): Lado de los tiles, como en `trabajos`.
+            procesos (int | None): Trabajadores del pool (None = todos los
+                núcleos; 1 = sin pool, en el proceso actual).
+            ejecutor (str): 'procesos' escribe en memoria compartida desde un
+                pool de procesos; 'hilos' escribe en el lienzo desde un pool
+                de hilos (solo compensa si NumPy libera el GIL lo bastante).
+
+        Returns:
+            np.array: Imagen RGB uint8 (alto, ancho, 3).
+        """
+        if ejecutor not in EJECUTORES:
+            raise ValueError(f"Ejecutor '{ejecutor}' no válido. Usa uno de {EJECUTORES}.")
+        trabajos = self.trabajos(ancho, alto, tile)
+        procesos = min(procesos or os.cpu_count() or 1, max(len(trabajos), 1))
+
+        if procesos == 1 or ejecutor == 'hilos':
+            lienzo = raster.crear_lienzo(ancho, alto, fondo)
+            if procesos == 1:
+                for trabajo in trabajos:
+                    _dibujar_tile(lienzo, self.primitivas, trabajo)
+            else:
+                with ThreadPoolExecutor(max_workers=procesos) as pool:
+                    list(pool.map(lambda t: _dibujar_tile(lienzo, self.primitivas, t), trabajos))
+            return lienzo
+
+        forma = (alto, ancho, 3)
+        memoria = shared_memory.SharedMemory(create=True, size=int(np.prod(forma)))
+        try:
+            compartido = np.ndarray(forma, dtype=np.uint8, buffer=memoria.buf)
+            compartido[...] = fondo
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                     initargs=(memoria.name, forma, self.primitivas)) as pool:
+                list(pool.map(_procesar_tile, trabajos))
+            lienzo = compartido.copy()
+            del compartido
+        finally:
+            memoria.close()
+            memoria.unlink()
+        return lienzo
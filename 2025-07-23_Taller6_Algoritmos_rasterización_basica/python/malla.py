@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Rasterización de mallas completas con funciones de arista y z-buffer.
+
+`fill_triangle` rellena un triángulo de un color fijo ordenando sus vértices
+en Python. Para dibujar las mallas de los talleres 8 y 9 (de miles a millones
+de triángulos) aquí se procesan todos a la vez:
+
+1. Cada triángulo se limita a su caja envolvente y se reparte entre los
+   tiles de pantalla que toca. Cada par (triángulo, tile) es un trabajo con
+   una región de como mucho `tile` x `tile` píxeles.
+2. Los trabajos se agrupan por el tamaño de su región (redondeado a
+   potencias de dos en cada eje) y se evalúan en bloques: para K trabajos de
+   Sx x Sy píxeles se calculan las tres funciones de arista sobre una
+   rejilla (K, Sx*Sy). Un triángulo pequeño solo evalúa los píxeles de su
+   caja, no los de todo el tile.
+3. Los fragmentos que pasan el test se resuelven contra un z-buffer float32
+   (gana la menor profundidad; en un empate exacto, cualquiera de los
+   empatados), que guarda también qué triángulo quedó delante en cada píxel.
+4. Al terminar se colorea una sola vez cada píxel visible, interpolando los
+   colores de los vértices de su triángulo, en lugar de colorear también los
+   fragmentos que luego quedan tapados.
+
+Los píxeles se muestrean en su centro y los bordes compartidos siguen la
+regla arriba-izquierda, así que dos triángulos adyacentes no pintan dos
+veces el mismo píxel.
+
+Ejemplo:
+    triangulos, profundidad = proyeccion_ortografica(malla.vertices, malla.faces, 1920, 1080)
+    lienzo, zbuffer = rasterizar_malla(triangulos, profundidad, colores, 1920, 1080)
+"""
+
+import numpy as np
+
+TILE = 64
+
+# Píxeles evaluados por bloque: acota la memoria de los temporales (K, Sx*Sy).
+PIXELES_POR_BLOQUE = 2**20
+
+
+def proyeccion_ortografica(vertices, caras, ancho, alto, margen=0.05):
+    """
+    Proyecta una malla 3D mirando desde +z y la encaja en la imagen.
+
+    Args:
+        vertices (np.array): Vértices (V, 3).
+        caras (np.array): Índices de los triángulos (N, 3).
+        ancho, alto (int): Tamaño de la imagen.
+        margen (float): Fracción de la imagen que se deja libre en cada borde.
+
+    Returns:
+        tuple: (triángulos (N, 3, 2) en píxeles, profundidad (N, 3)); menor
+        profundidad es más cercano a la cámara.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    minimo, maximo = vertices[:, :2].min(axis=0), vertices[:, :2].max(axis=0)
+    extension = np.maximum(maximo - minimo, 1e-12)
+    escala = (1 - 2 * margen) * min(ancho / extension[0], alto / extension[1])
+    centro = (minimo + maximo) / 2
+    pantalla = np.empty((len(vertices), 2))
+    pantalla[:, 0] = ancho / 2 + (vertices[:, 0] - centro[0]) * escala
+    # En la imagen la y crece hacia abajo.
+    pantalla[:, 1] = alto / 2 - (vertices[:, 1] - centro[1]) * escala
+    caras = np.asarray(caras)
+    return pantalla[caras], -vertices[caras, 2]
+
+
+def _arista(ax, ay, bx, by, px, py):
+    """Función de arista: positiva si p queda a un lado de a->b."""
+    return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+
+
+def _trabajos(cajas, tile):
+    """
+    Reparte las cajas (N, 4) de los triángulos entre los tiles que tocan.
+
+    Returns:
+        tuple: (índice de triángulo, x0, y0, x1, y1) de cada trabajo, con la
+        región ya limitada al tile.
+    """
+    x0, y0, x1, y1 = cajas.T
+    tx0, ty0 = x0 // tile, y0 // tile
+    nx, ny = (x1 - 1) // tile - tx0 + 1, (y1 - 1) // tile - ty0 + 1
+    cuantos = nx * ny
+    triangulo = np.repeat(np.arange(len(cajas)), cuantos)
+    # Posición de cada trabajo dentro de los de su triángulo.
+    local = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+    tx = tx0[triangulo] + local % nx[triangulo]
+    ty = ty0[triangulo] + local // nx[triangulo]
+    return (triangulo,
+            np.maximum(x0[triangulo], tx * tile), np.maximum(y0[triangulo], ty * tile),
+            np.minimum(x1[triangulo], (tx + 1) * tile), np.minimum(y1[triangulo], (ty + 1) * tile))
+
+
+def rasterizar_malla(triangulos, profundidad=None, colores=None, ancho=None, alto=None,
+                     lienzo=None, zbuffer=None, fondo=(255, 255, 255), tile=TILE):
+    """
+    Rasteriza un lote de triángulos con z-buffer e interpolación de color.
+
+    Args:
+        triangulos (np.array): Vértices en píxeles, (N, 3, 2).
+        profundidad (np.array | None): Profundidad de cada vértice (N, 3);
+            gana la menor. Con None se dibuja en orden, como llamadas
+            sucesivas a `fill_triangle`: cada triángulo tapa a los anteriores.
+        colores (np.array | None): Colores RGB por vértice (N, 3, 3), por
+            triángulo (N, 3) o uno común (3,), en [0, 255]. Por defecto, verde
+            como `fill_triangle`.
+        ancho, alto (int | None): Tamaño de la imagen si no se pasa `lienzo`.
+        lienzo (np.array | None): Imagen uint8 (alto, ancho, 3) sobre la que
+            dibujar, para acumular varias llamadas.
+        zbuffer (np.array | None): Z-buffer float32 (alto, ancho) que
+            acompaña a `lienzo`.
+        fondo (tuple): Color de fondo si se crea el lienzo.
+        tile (int): Lado de los tiles de pantalla.
+
+    Returns:
+        tuple: (lienzo, zbuffer).
+    """
+    triangulos = np.asarray(triangulos, dtype=np.float64).reshape(-1, 3, 2)
+    n = len(triangulos)
+    if lienzo is None:
+        lienzo = np.empty((alto, ancho, 3), dtype=np.uint8)
+        lienzo[...] = fondo
+    alto, ancho = lienzo.shape[:2]
+    if zbuffer is None:
+        zbuffer = np.full((alto, ancho), np.inf, dtype=np.float32)
+    if not (lienzo.flags.c_contiguous and zbuffer.flags.c_contiguous) or zbuffer.dtype != np.float32:
+        raise ValueError("'lienzo' y 'zbuffer' deben ser C-contiguos y 'zbuffer' float32.")
+    if profundidad is None:
+        profundidad = np.repeat(-np.arange(n, dtype=np.float64)[:, None], 3, axis=1)
+    profundidad = np.asarray(profundidad, dtype=np.float64).reshape(n, 3)
+    colores = np.asarray((0, 255, 0) if colores is None else colores, dtype=np.float32)
+    colores = np.broadcast_to(colores[:, None, :] if colores.ndim == 2 else colores, (n, 3, 3))
+
+    # --- Preparación por triángulo ---
+    vx, vy = triangulos[..., 0], triangulos[..., 1]
+    area = _arista(vx[:, 0], vy[:, 0], vx[:, 1], vy[:, 1], vx[:, 2], vy[:, 2])
+    # Con área negativa se invierten las aristas para que "dentro" sea >= 0.
+    signo = np.sign(area)
+    # Aristas: 0 = v1->v2, 1 = v2->v0, 2 = v0->v1 (la i se opone al vértice i).
+    siguiente, otro = [1, 2, 0], [2, 0, 1]
+    ax, ay = vx[:, siguiente], vy[:, siguiente]
+    bx, by = vx[:, otro], vy[:, otro]
+    ex, ey = (bx - ax) * signo[:, None], (by - ay) * signo[:, None]
+    # Regla arriba-izquierda: un píxel justo sobre la arista solo cuenta si
+    # la arista es superior (horizontal, recorrida hacia la izquierda) o
+    # izquierda (recorrida hacia abajo en la orientación normalizada).
+    arriba_izquierda = (ey > 0) | ((ey == 0) & (ex < 0))
+    # "w > 0, o w == 0 en aristas arriba-izquierda" se evalúa como una sola
+    # comparación w > umbral, con un umbral justo por debajo de 0 en estas.
+    umbral = np.where(arriba_izquierda, -np.finfo(np.float64).smallest_subnormal, 0.0)
+
+    # La profundidad y el color son lineales en el píxel dentro de cada
+    # triángulo: se guardan sus incrementos por columna y por fila para no
+    # tener que combinar los valores de los tres vértices en cada fragmento.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverso = 1 / np.abs(area)
+        z_dx = -(profundidad * ey).sum(axis=1) * inverso
+        z_dy = (profundidad * ex).sum(axis=1) * inverso
+        c_dx = -np.einsum('nvc,nv->nc', colores, ey) * inverso[:, None]
+        c_dy = np.einsum('nvc,nv->nc', colores, ex) * inverso[:, None]
+
+    # Caja de píxeles cuyo centro puede quedar dentro, recortada a la imagen.
+    cajas = np.empty((n, 4), dtype=np.int64)
+    cajas[:, 0] = np.clip(np.ceil(vx.min(axis=1) - 0.5), 0, ancho)
+    cajas[:, 1] = np.clip(np.ceil(vy.min(axis=1) - 0.5), 0, alto)
+    cajas[:, 2] = np.clip(np.floor(vx.max(axis=1) - 0.5) + 1, 0, ancho)
+    cajas[:, 3] = np.clip(np.floor(vy.max(axis=1) - 0.5) + 1, 0, alto)
+    visibles = (area != 0) & (cajas[:, 2] > cajas[:, 0]) & (cajas[:, 3] > cajas[:, 1])
+    indices = np.flatnonzero(visibles)
+    if len(indices) == 0:
+        return lienzo, zbuffer
+
+    triangulo, x0, y0, x1, y1 = _trabajos(cajas[indices], tile)
+    triangulo = indices[triangulo]
+    # Rejilla de cada trabajo: potencias de dos en cada eje, para que haya
+    # pocos grupos y poco desperdicio en triángulos alargados.
+    lado_x = 1 << np.ceil(np.log2(x1 - x0)).astype(np.int64)
+    lado_y = 1 << np.ceil(np.log2(y1 - y0)).astype(np.int64)
+    orden = np.lexsort((triangulo, lado_x, lado_y))
+    triangulo, x0, y0, x1, y1, lado_x, lado_y = (
+        a[orden] for a in (triangulo, x0, y0, x1, y1, lado_x, lado_y))
+
+    colores_planos = lienzo.reshape(-1, 3)
+    z_plano = zbuffer.reshape(-1)
+    visible = np.full(alto * ancho, -1, dtype=np.int32 if n < 2**31 else np.int64)
+    cambia = (lado_x[1:] != lado_x[:-1]) | (lado_y[1:] != lado_y[:-1])
+    inicios = np.flatnonzero(np.r_[True, cambia])
+    for inicio, fin in zip(inicios, np.r_[inicios[1:], len(triangulo)]):
+        sx, sy = int(lado_x[inicio]), int(lado_y[inicio])
+        gx, gy = np.arange(sx * sy) % sx, np.arange(sx * sy) // sx
+        columnas, filas = np.arange(sx), np.arange(sy)
+        por_bloque = max(1, PIXELES_POR_BLOQUE // (sx * sy))
+        for b in range(inicio, fin, por_bloque):
+            bloque = slice(b, min(b + por_bloque, fin))
+            t, ox, oy = triangulo[bloque], x0[bloque], y0[bloque]
+            fuera_x = columnas >= (x1[bloque] - ox)[:, None]
+            fuera_y = filas >= (y1[bloque] - oy)[:, None]
+
+            # Cada función de arista es lineal en el píxel, así que sobre la
+            # rejilla es la suma de un término por columna y otro por fila:
+            # w = (base - ey * gx) + ex * gy. Las columnas y filas que se
+            # salen de la región valen -inf para que no pasen el test.
+            base = np.empty((len(t), 3))
+            w = np.empty((len(t), sy, sx))
+            dentro = np.ones((len(t), sy, sx), dtype=bool)
+            for i in range(3):
+                base[:, i] = ex[t, i] * (oy + 0.5 - ay[t, i]) - ey[t, i] * (ox + 0.5 - ax[t, i])
+                por_columna = base[:, i, None] - ey[t, i, None] * columnas
+                por_fila = ex[t, i, None] * filas
+                por_columna[fuera_x] = -np.inf
+                por_fila[fuera_y] = -np.inf
+                np.add(por_columna[:, None, :], por_fila[:, :, None], out=w)
+                dentro &= w > umbral[t, i, None, None]
+            dentro = dentro.reshape(len(t), -1)
+
+            k, j = np.nonzero(dentro)
+            if len(k) == 0:
+                continue
+            fx, fy = gx[j], gy[j]
+            # Profundidad en el origen de cada trabajo; en cada fragmento solo
+            # se suman los incrementos.
+            z_origen = (base * profundidad[t]).sum(axis=1) * inverso[t]
+            z = (z_origen[k] + z_dx[t][k] * fx + z_dy[t][k] * fy).astype(np.float32)
+            pixel = (oy[k] + fy) * ancho + ox[k] + fx
+
+            # Test de profundidad de todo el bloque a la vez: `minimum.at`
+            # deja en el z-buffer el fragmento más cercano de cada píxel y
+            # solo se anotan los que lo igualan y mejoran el valor previo.
+            anterior = z_plano[pixel]
+            np.minimum.at(z_plano, pixel, z)
+            ganadores = np.flatnonzero((z < anterior) & (z == z_plano[pixel]))
+            visible[pixel[ganadores]] = t[k[ganadores]]
+
+    # --- Color de los píxeles visibles ---
+    escritos = np.flatnonzero(visible >= 0)
+    for b in range(0, len(escritos), PIXELES_POR_BLOQUE):
+        pixel = escritos[b:b + PIXELES_POR_BLOQUE]
+        tv = visible[pixel]
+        cx = pixel % ancho + 0.5 - vx[tv, 0]
+        cy = pixel // ancho + 0.5 - vy[tv, 0]
+        color = colores[tv, 0] + c_dx[tv] * cx[:, None] + c_dy[tv] * cy[:, None]
+        colores_planos[pixel] = np.clip(np.rint(color), 0, 255).astype(np.uint8)
+    return lienzo, zbuffer
@@ -4,13 +4,17 @@ Solución al Taller - Rasterización desde Cero (Versión Multi-Imagen)
 """
 
 # Importar librerías necesarias
-from PIL import Image
 import matplotlib.pyplot as plt
 
+from escena import Escena
+
 # ✅ 1. Preparar el entorno de dibujo
 width, height = 200, 200
 
 # --- Definición de los Algoritmos Modificados ---
+# Versiones de referencia, píxel a píxel sobre PIL. El dibujo de abajo usa
+# las versiones vectorizadas de `raster.py` (a través de `escena.py`), que dan
+# exactamente los mismos píxeles; estas se conservan para comparar con ellas.
 
 def bresenham(pixels, x0, y0, x1, y1):
     """
@@ -88,41 +92,47 @@ def fill_triangle(pixels, p1, p2, p3):
                     pixels[x, y] = (0, 255, 0)  # Verde
 
 # --- Creación y Dibujo en Imágenes Separadas ---
+def main(ancho=width, alto=height, procesos=None):
+    # Las figuras se definen sobre el lienzo de 200x200 y se escalan al
+    # tamaño pedido; cada escena se renderiza por tiles en paralelo.
+    sx, sy = ancho / width, alto / height
+
+    def escalar(x, y):
+        return round(x * sx), round(y * sy)
+
+    # 🖼️ Imagen 1: Línea
+    image_line = Escena().linea(*escalar(20, 20), *escalar(180, 120)).renderizar(ancho, alto, procesos=procesos)
+
+    # 🖼️ Imagen 2: Círculo
+    image_circle = Escena().circulo(*escalar(100, 100), round(40 * min(sx, sy))).renderizar(ancho, alto, procesos=procesos)
 
-# 🖼️ Imagen 1: Línea
-image_line = Image.new('RGB', (width, height), 'white')
-pixels_line = image_line.load()
-bresenham(pixels_line, 20, 20, 180, 120)
+    # 🖼️ Imagen 3: Triángulo
+    image_triangle = Escena().triangulo(escalar(30, 50), escalar(100, 150), escalar(160, 60)).renderizar(
+        ancho, alto, procesos=procesos)
 
-# 🖼️ Imagen 2: Círculo
-image_circle = Image.new('RGB', (width, height), 'white')
-pixels_circle = image_circle.load()
-midpoint_circle(pixels_circle, 100, 100, 40)
+    print("✅ ¡Tres imágenes generadas con éxito!")
 
-# 🖼️ Imagen 3: Triángulo
-image_triangle = Image.new('RGB', (width, height), 'white')
-pixels_triangle = image_triangle.load()
-fill_triangle(pixels_triangle, (30, 50), (100, 150), (160, 60))
+    # ✅ 5. Mostrar los resultados en una sola figura
+    fig, axs = plt.subplots(1, 3, figsize=(18, 6))
 
-print("✅ ¡Tres imágenes generadas con éxito!")
+    # Mostrar la línea
+    axs[0].imshow(image_line)
+    axs[0].set_title('1. Línea (Bresenham)', fontsize=14)
+    axs[0].axis('off')
 
-# ✅ 5. Mostrar los resultados en una sola figura
-fig, axs = plt.subplots(1, 3, figsize=(18, 6))
+    # Mostrar el círculo
+    axs[1].imshow(image_circle)
+    axs[1].set_title('2. Círculo (Punto Medio)', fontsize=14)
+    axs[1].axis('off')
 
-# Mostrar la línea
-axs[0].imshow(image_line)
-axs[0].set_title('1. Línea (Bresenham)', fontsize=14)
-axs[0].axis('off')
+    # Mostrar el triángulo
+    axs[2].imshow(image_triangle)
+    axs[2].set_title('3. Triángulo (Scanline)', fontsize=14)
+    axs[2].axis('off')
 
-# Mostrar el círculo
-axs[1].imshow(image_circle)
-axs[1].set_title('2. Círculo (Punto Medio)', fontsize=14)
-axs[1].axis('off')
+    plt.tight_layout()
+    plt.show()
 
-# Mostrar el triángulo
-axs[2].imshow(image_triangle)
-axs[2].set_title('3. Triángulo (Scanline)', fontsize=14)
-axs[2].axis('off')
 
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
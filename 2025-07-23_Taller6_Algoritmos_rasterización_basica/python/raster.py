@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Rasterización vectorizada con NumPy para el taller Rasterización desde Cero.
+
+Las funciones de `mmain.py` escriben un píxel cada vez a través de
+`pixels[x, y] = (...)` de PIL: una llamada de Python y una comprobación de
+límites por píxel. Aquí el lienzo es un array de NumPy (alto, ancho, 3) y
+cada algoritmo genera de golpe las coordenadas de todos sus píxeles:
+
+- Bresenham: el píxel i de la línea tiene una fórmula cerrada en el eje
+  mayor y el menor, así que se calcula con `np.arange`.
+- Punto medio: la x de cada y del primer octante es una raíz cuadrada entera
+  y los otros siete octantes salen por simetría.
+- Scanline: los extremos de cada fila se calculan en bloque y cada fila se
+  rellena con una asignación por slice.
+
+El resultado coincide píxel a píxel con las versiones de referencia de
+`mmain.py`, que se conservan para poder compararlas.
+
+Ejemplo:
+    lienzo = crear_lienzo(200, 200)
+    bresenham(lienzo, 20, 20, 180, 120)
+    Image.fromarray(lienzo)
+"""
+
+import numpy as np
+
+ROJO = (255, 0, 0)
+VERDE = (0, 255, 0)
+AZUL = (0, 0, 255)
+
+
+def crear_lienzo(ancho, alto, fondo=(255, 255, 255)):
+    """Lienzo RGB uint8 de forma (alto, ancho, 3), como `Image.new('RGB', ...)`."""
+    lienzo = np.empty((alto, ancho, 3), dtype=np.uint8)
+    lienzo[...] = fondo
+    return lienzo
+
+
+def dibujar_puntos(lienzo, xs, ys, color):
+    """Pinta los puntos (xs, ys) que caen dentro del lienzo."""
+    alto, ancho = lienzo.shape[:2]
+    dentro = (xs >= 0) & (xs < ancho) & (ys >= 0) & (ys < alto)
+    lienzo[ys[dentro], xs[dentro]] = color
+    return lienzo
+
+
+# --- 1. Líneas (Bresenham) ---
+def puntos_bresenham(x0, y0, x1, y1):
+    """
+    Coordenadas de los píxeles de la línea de Bresenham de (x0, y0) a (x1, y1).
+
+    En el paso i se avanza un píxel en el eje mayor y `(2*i*menor + mayor - 1)
+    // (2*mayor)` píxeles en el menor, que es lo que acumula el término de
+    error del algoritmo (incluido su desempate).
+
+    Returns:
+        tuple: (xs, ys) como arrays int64, en el orden en que se recorren.
+    """
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    mayor, menor = max(dx, dy), min(dx, dy)
+    pasos = np.arange(mayor + 1, dtype=np.int64)
+    avance_menor = (2 * pasos * menor + mayor - 1) // (2 * mayor) if mayor else pasos
+    if dx >= dy:
+        return x0 + sx * pasos, y0 + sy * avance_menor
+    return x0 + sx * avance_menor, y0 + sy * pasos
+
+
+def bresenham(lienzo, x0, y0, x1, y1, color=ROJO):
+    """Dibuja una línea (roja por defecto) en el lienzo."""
+    return dibujar_puntos(lienzo, *puntos_bresenham(x0, y0, x1, y1), color)
+
+
+# --- 2. Circunferencias (punto medio) ---
+def _raiz_entera(n):
+    """floor(sqrt(n)) exacto para un array de enteros no negativos."""
+    raiz = np.floor(np.sqrt(n)).astype(np.int64)
+    raiz -= raiz * raiz > n
+    raiz += (raiz + 1) * (raiz + 1) <= n
+    return raiz
+
+
+def puntos_circulo(x0, y0, radius):
+    """
+    Coordenadas de los píxeles de la circunferencia del punto medio.
+
+    En el primer octante, para cada y el algoritmo elige la x con
+    `x = (1 + isqrt(4 * (r² - y²) + 1)) // 2`; la variable de decisión `p`
+    solo es la forma incremental de evaluar esa comparación.
+
+    Returns:
+        tuple: (xs, ys) como arrays int64 (con los puntos repetidos entre
+        octantes, igual que la versión de referencia).
+    """
+    if radius < 0:
+        vacio = np.empty(0, dtype=np.int64)
+        return vacio, vacio
+    if radius == 0:
+        return np.array([x0] * 8, dtype=np.int64), np.array([y0] * 8, dtype=np.int64)
+    y = np.arange(radius + 1, dtype=np.int64)
+    x = (1 + _raiz_entera(4 * (radius * radius - y * y) + 1)) // 2
+    x, y = x[x >= y], y[x >= y]
+    dxs = np.concatenate([x, y, -x, -y, -x, -y, x, y])
+    dys = np.concatenate([y, x, y, x, -y, -x, -y, -x])
+    return x0 + dxs, y0 + dys
+
+
+def midpoint_circle(lienzo, x0, y0, radius, color=AZUL):
+    """Dibuja una circunferencia (azul por defecto) en el lienzo."""
+    return dibujar_puntos(lienzo, *puntos_circulo(x0, y0, radius), color)
+
+
+# --- 3. Triángulos (scanline) ---
+def spans_triangulo(p1, p2, p3, filas=None):
+    """
+    Tramos horizontales del relleno por scanline.
+
+    Reproduce la interpolación de `fill_triangle` (truncando con `int()`), así
+    que los tramos son los mismos que los de la versión de referencia.
+
+    Args:
+        filas (tuple | None): (y_inicio, y_fin) para calcular solo los tramos
+            de esas filas (y_fin excluida); los valores son los mismos que
+            los del triángulo completo.
+
+    Returns:
+        tuple: (ys, x_inicio, x_fin) como arrays int64, con x_fin incluido.
+    """
+    (x1, y1), (x2, y2), (x3, y3) = sorted([p1, p2, p3], key=lambda p: p[1])
+    primera, ultima = filas if filas is not None else (y1, y3)
+    if y1 == y3:
+        vacio = np.empty(0, dtype=np.int64)
+        return vacio, vacio, vacio
+
+    def interpolar(y_inicio, y_fin, x_inicio, x_fin):
+        if y_fin == y_inicio:
+            return np.empty(0, dtype=np.int64)
+        pendiente = (x_fin - x_inicio) / (y_fin - y_inicio)
+        ys = np.arange(max(y_inicio, primera), max(min(y_fin, ultima), primera))
+        return (x_inicio + pendiente * (ys - y_inicio)).astype(np.int64)
+
+    x_izquierda = np.concatenate([interpolar(y1, y2, x1, x2), interpolar(y2, y3, x2, x3)])
+    x_derecha = interpolar(y1, y3, x1, x3)
+    ys = np.arange(max(y1, primera), max(min(y3, ultima), primera), dtype=np.int64)
+    return ys, np.minimum(x_izquierda, x_derecha), np.maximum(x_izquierda, x_derecha)
+
+
+def rellenar_spans(lienzo, ys, inicio, fin, color):
+    """Rellena los tramos [inicio, fin] de las filas ys que caen en el lienzo."""
+    alto, ancho = lienzo.shape[:2]
+    # Recorte al lienzo en bloque; luego una asignación por fila.
+    dentro = (ys >= 0) & (ys < alto)
+    ys, inicio, fin = ys[dentro], np.maximum(inicio[dentro], 0), np.minimum(fin[dentro], ancho - 1)
+    for y, a, b in zip(ys.tolist(), inicio.tolist(), fin.tolist()):
+        if a <= b:
+            lienzo[y, a:b + 1] = color
+    return lienzo
+
+
+def fill_triangle(lienzo, p1, p2, p3, color=VERDE):
+    """Rellena un triángulo (verde por defecto) en el lienzo."""
+    return rellenar_spans(lienzo, *spans_triangulo(p1, p2, p3), color)
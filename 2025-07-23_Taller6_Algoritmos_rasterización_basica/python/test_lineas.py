@@ -0,0 +1,36 @@
+"""Pruebas de `lineas`: grosor del modo 'grueso' y mezcla en orden."""
+
+import numpy as np
+import pytest
+
+import lineas
+
+
+def _perfil(segmento, ancho, vertical):
+    lienzo = np.zeros((40, 40, 3), dtype=np.uint8)
+    lineas.dibujar_lineas(lienzo, [segmento], anchos=ancho, colores=(255, 255, 255), modo='grueso')
+    return np.flatnonzero(lienzo[20, :, 0] if vertical else lienzo[:, 20, 0])
+
+
+@pytest.mark.parametrize('ancho', [1, 2, 3, 4, 5, 6])
+@pytest.mark.parametrize('posicion', [10, 10.25, 10.5, 10.75])
+@pytest.mark.parametrize('vertical', [False, True])
+def test_grueso_cubre_tantas_filas_como_su_grosor(ancho, posicion, vertical):
+    segmento = [posicion, 5, posicion, 35] if vertical else [5, posicion, 35, posicion]
+    filas = _perfil(segmento, ancho, vertical)
+    assert len(filas) == ancho
+    assert np.array_equal(filas, np.arange(filas[0], filas[0] + ancho))
+
+
+def test_grueso_independiente_del_sentido():
+    for segmento in ([5, 10, 35, 10], [35, 10, 5, 10]):
+        assert np.array_equal(_perfil(segmento, 3, False), [8, 9, 10])
+
+
+def test_mezcla_en_orden_de_segmentos():
+    lienzo = np.zeros((10, 10, 3), dtype=np.uint8)
+    segmentos = [[0, 5, 10, 5], [0, 5, 10, 5]]
+    lineas.dibujar_lineas(lienzo, segmentos, anchos=1, colores=[(255, 0, 0), (0, 0, 255)], alpha=0.5,
+                          modo='grueso')
+    # Rojo al 50 % sobre negro y después azul al 50 %: (64, 0, 128).
+    assert tuple(lienzo[4, 5]) == (64, 0, 128)
@@ -0,0 +1,63 @@
+"""Pruebas de `raster`: píxel a píxel frente a las referencias de `mmain.py`."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import mmain
+import raster
+
+
+def _referencia(funcion, *args):
+    imagen = Image.new('RGB', (mmain.width, mmain.height), 'white')
+    funcion(imagen.load(), *args)
+    return np.asarray(imagen)
+
+
+def _vectorizada(funcion, *args):
+    lienzo = raster.crear_lienzo(mmain.width, mmain.height)
+    funcion(lienzo, *args)
+    return lienzo
+
+
+LINEAS = [(20, 20, 180, 120), (180, 120, 20, 20), (5, 190, 7, 3), (0, 0, 0, 0), (50, 50, 150, 50),
+          (70, 10, 70, 160), (-30, -10, 230, 250), (199, 0, 0, 199), (10, 100, 300, 101)]
+CIRCULOS = [(100, 100, 40), (0, 0, 30), (190, 50, 25), (100, 100, 0), (100, 100, 1), (60, 150, 140)]
+TRIANGULOS = [((30, 50), (100, 150), (160, 60)), ((10, 10), (190, 10), (100, 180)),
+              ((100, 20), (20, 180), (180, 180)), ((-40, 30), (250, 90), (120, 260)),
+              ((10, 10), (50, 10), (90, 10)), ((5, 5), (5, 195), (6, 100)), ((0, 0), (199, 199), (0, 199))]
+
+
+@pytest.mark.parametrize('extremos', LINEAS)
+def test_bresenham(extremos):
+    assert np.array_equal(_vectorizada(raster.bresenham, *extremos), _referencia(mmain.bresenham, *extremos))
+
+
+@pytest.mark.parametrize('circulo', CIRCULOS)
+def test_midpoint_circle(circulo):
+    assert np.array_equal(_vectorizada(raster.midpoint_circle, *circulo),
+                          _referencia(mmain.midpoint_circle, *circulo))
+
+
+@pytest.mark.parametrize('vertices', TRIANGULOS)
+def test_fill_triangle(vertices):
+    assert np.array_equal(_vectorizada(raster.fill_triangle, *vertices),
+                          _referencia(mmain.fill_triangle, *vertices))
+
+
+def test_triangulos_aleatorios():
+    rng = np.random.default_rng(0)
+    for vertices in rng.integers(-50, 250, (200, 3, 2)).tolist():
+        vertices = [tuple(v) for v in vertices]
+        assert np.array_equal(_vectorizada(raster.fill_triangle, *vertices),
+                              _referencia(mmain.fill_triangle, *vertices)), vertices
+
+
+def test_lineas_y_circulos_aleatorios():
+    rng = np.random.default_rng(1)
+    for x0, y0, x1, y1, r in rng.integers(-50, 250, (200, 5)).tolist():
+        assert np.array_equal(_vectorizada(raster.bresenham, x0, y0, x1, y1),
+                              _referencia(mmain.bresenham, x0, y0, x1, y1)), (x0, y0, x1, y1)
+        r = abs(r) % 120
+        assert np.array_equal(_vectorizada(raster.midpoint_circle, x0, y0, r),
+                              _referencia(mmain.midpoint_circle, x0, y0, r)), (x0, y0, r)
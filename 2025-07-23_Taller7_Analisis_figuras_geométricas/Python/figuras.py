@@ -0,0 +1,303 @@
+"""
+Propiedades de muchos contornos a la vez para el taller de Análisis de
+Figuras Geométricas.
+
+`main.py` recorre los contornos en Python y llama a `cv2.contourArea` (dos
+veces), `cv2.arcLength` y `cv2.moments` para cada uno. Con máscaras de
+segmentación de decenas de miles de manchas ese bucle domina el tiempo. Aquí
+todos los contornos se empaquetan en un único array de puntos (N, 2) con el
+desplazamiento de cada uno, y las propiedades salen de fórmulas de polígonos
+evaluadas sobre todas las aristas a la vez y sumadas por contorno con
+`np.add.reduceat`:
+
+- Área y momentos hasta orden 3 por el teorema de Green (las mismas fórmulas
+  que usa `cv2.moments` con un contorno), y con ellos el centroide y los
+  siete momentos de Hu.
+- Perímetro como suma de las longitudes de las aristas del contorno cerrado
+  (`cv2.arcLength(c, True)`).
+- Caja envolvente con `np.minimum.reduceat` / `np.maximum.reduceat`
+  (`cv2.boundingRect`) y circularidad 4·pi·área / perímetro².
+
+El resultado es una tabla columnar (array estructurado de NumPy, que
+`pandas.DataFrame` acepta directamente) con una fila por contorno. El dibujo
+de contornos y etiquetas es un paso aparte y opcional (`dibujar`).
+
+Ejemplo:
+    contornos, _ = cv2.findContours(mascara, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    tabla = analizar_contornos(contornos, area_minima=20)
+    tabla['area'], tabla['cx'], tabla['hu1']
+"""
+
+import cv2
+import numpy as np
+
+CAMPOS = [
+    ('indice', np.int64),       # Posición del contorno en la lista de entrada
+    ('area', np.float64),
+    ('perimetro', np.float64),
+    ('cx', np.float64),
+    ('cy', np.float64),
+    ('x', np.int32),            # Caja envolvente como cv2.boundingRect
+    ('y', np.int32),
+    ('ancho', np.int32),
+    ('alto', np.int32),
+    ('circularidad', np.float64),
+] + [(f'hu{i}', np.float64) for i in range(1, 8)]
+
+TIPO_TABLA = np.dtype(CAMPOS)
+
+# Formas de `clasificar`, por código.
+FORMAS = ('circulo', 'rectangulo', 'triangulo', 'poligono')
+CIRCULO, RECTANGULO, TRIANGULO, POLIGONO = range(len(FORMAS))
+# Circularidad mínima de un círculo rasterizado (con CHAIN_APPROX_SIMPLE un
+# círculo de radio 10 da ~0.83 y un octógono ~0.81).
+UMBRAL_CIRCULARIDAD = 0.82
+
+
+# --- 1. Contornos empaquetados ---
+def empaquetar(contornos):
+    """
+    Junta una lista de contornos de OpenCV en un solo array.
+
+    Args:
+        contornos (list): Contornos de `cv2.findContours` ((n, 1, 2)) o
+            arrays (n, 2), todos con la misma forma.
+
+    Returns:
+        tuple: (puntos (N, 2) float64, inicio de cada contorno (C,),
+        número de puntos de cada contorno (C,)).
+    """
+    longitudes = np.array([len(c) for c in contornos], dtype=np.int64)
+    if longitudes.sum() == 0:
+        return np.empty((0, 2)), np.zeros(len(contornos), dtype=np.int64), longitudes
+    puntos = np.concatenate(contornos).reshape(-1, 2).astype(np.float64)
+    inicios = np.cumsum(longitudes) - longitudes
+    return puntos, inicios, longitudes
+
+
+def _siguientes(inicios, longitudes):
+    """Índice del punto siguiente a cada punto, cerrando cada contorno."""
+    siguiente = np.arange(1, longitudes.sum() + 1)
+    validos = longitudes > 0
+    siguiente[inicios[validos] + longitudes[validos] - 1] = inicios[validos]
+    return siguiente
+
+
+def _sumar(valores, inicios, longitudes, reduccion=np.add):
+    """Reducción por contorno de un array por punto (0 para contornos vacíos)."""
+    sumas = np.zeros((len(inicios),) + valores.shape[1:])
+    validos = longitudes > 0
+    if validos.any():
+        sumas[validos] = reduccion.reduceat(valores, inicios[validos], axis=0)
+    return sumas
+
+
+# --- 2. Momentos de polígonos ---
+def momentos_poligonos(puntos, inicios, longitudes):
+    """
+    Momentos espaciales de orden <= 3 de cada contorno, como `cv2.moments`.
+
+    Cada momento es una suma sobre las aristas (x0, y0) -> (x1, y1) de un
+    polinomio por el producto cruzado a = x0·y1 - x1·y0.
+
+    Returns:
+        dict: Arrays (C,) 'm00', 'm10', 'm01', 'm20', 'm11', 'm02', 'm30',
+        'm21', 'm12' y 'm03'.
+    """
+    siguiente = _siguientes(inicios, longitudes)
+    x0, y0 = puntos[:, 0], puntos[:, 1]
+    x1, y1 = x0[siguiente], y0[siguiente]
+    a = x0 * y1 - x1 * y0
+    sx, sy = x0 + x1, y0 + y1
+    xx, yy = x0 * x0 + x1 * x1, y0 * y0 + y1 * y1
+
+    terminos = {
+        'm00': (a, 2),
+        'm10': (a * sx, 6),
+        'm01': (a * sy, 6),
+        'm20': (a * (xx + x0 * x1), 12),
+        'm11': (a * (2 * (x0 * y0 + x1 * y1) + x0 * y1 + x1 * y0), 24),
+        'm02': (a * (yy + y0 * y1), 12),
+        'm30': (a * sx * xx, 20),
+        'm21': (a * (x0 * x0 * (3 * y0 + y1) + 2 * x0 * x1 * sy + x1 * x1 * (y0 + 3 * y1)), 60),
+        'm12': (a * (y0 * y0 * (3 * x0 + x1) + 2 * y0 * y1 * sx + y1 * y1 * (x0 + 3 * x1)), 60),
+        'm03': (a * sy * yy, 20),
+    }
+    # Una reducción 1D por momento: mucho más rápida que `reduceat` sobre un
+    # array (N, 10).
+    m = {nombre: _sumar(valores, inicios, longitudes) / divisor
+         for nombre, (valores, divisor) in terminos.items()}
+    # Como OpenCV, los momentos no dependen del sentido de recorrido.
+    signo = np.where(m['m00'] < 0, -1.0, 1.0)
+    return {nombre: valor * signo for nombre, valor in m.items()}
+
+
+def momentos_hu(m):
+    """
+    Los siete momentos invariantes de Hu a partir de los momentos espaciales.
+
+    Returns:
+        np.array: (C, 7); 0 para contornos de área nula.
+    """
+    m00 = m['m00']
+    valido = np.abs(m00) > np.finfo(np.float32).eps
+    m00 = np.where(valido, m00, 1)
+    cx, cy = m['m10'] / m00, m['m01'] / m00
+    # Momentos centrales.
+    mu20 = m['m20'] - cx * m['m10']
+    mu11 = m['m11'] - cx * m['m01']
+    mu02 = m['m02'] - cy * m['m01']
+    mu30 = m['m30'] - cx * (3 * mu20 + cx * m['m10'])
+    mu21 = m['m21'] - cx * (2 * mu11 + cx * m['m01']) - cy * mu20
+    mu12 = m['m12'] - cy * (2 * mu11 + cy * m['m10']) - cx * mu02
+    mu03 = m['m03'] - cy * (3 * mu02 + cy * m['m01'])
+    # Momentos centrales normalizados.
+    s2, s3 = m00 ** -2, m00 ** -2.5
+    n20, n11, n02 = mu20 * s2, mu11 * s2, mu02 * s2
+    n30, n21, n12, n03 = mu30 * s3, mu21 * s3, mu12 * s3, mu03 * s3
+
+    t0, t1 = n30 + n12, n21 + n03
+    q0, q1 = t0 * t0, t1 * t1
+    d = n20 - n02
+    hu = np.stack([
+        n20 + n02,
+        d * d + 4 * n11 * n11,
+        (n30 - 3 * n12) ** 2 + (3 * n21 - n03) ** 2,
+        q0 + q1,
+        (n30 - 3 * n12) * t0 * (q0 - 3 * q1) + (3 * n21 - n03) * t1 * (3 * q0 - q1),
+        d * (q0 - q1) + 4 * n11 * t0 * t1,
+        (3 * n21 - n03) * t0 * (q0 - 3 * q1) - (n30 - 3 * n12) * t1 * (3 * q0 - q1),
+    ], axis=1)
+    hu[~valido] = 0
+    return hu
+
+
+# --- 3. Tabla de propiedades ---
+def analizar_contornos(contornos, area_minima=0):
+    """
+    Calcula las propiedades de todos los contornos a la vez.
+
+    Args:
+        contornos (list): Contornos de `cv2.findContours`.
+        area_minima (float): Se descartan los contornos de área menor (ruido).
+
+    Returns:
+        np.array: Tabla estructurada con los campos de `CAMPOS`, una fila
+        por contorno conservado. El centroide es el de los momentos; si el
+        área es nula, el primer punto del contorno.
+    """
+    puntos, inicios, longitudes = empaquetar(contornos)
+    indices = np.arange(len(longitudes))
+    if len(puntos) == 0:
+        return np.zeros(0, dtype=TIPO_TABLA)
+    # Coordenadas relativas al primer punto de cada contorno: los momentos
+    # centrales no cambian y se evita la cancelación con coordenadas grandes.
+    primeros = puntos[np.minimum(inicios, len(puntos) - 1)]
+    locales = puntos - np.repeat(primeros, longitudes, axis=0)
+
+    # El área (fórmula del lazo) es barata: se filtra antes de lo demás, así
+    # que el ruido descartado no se procesa.
+    siguiente = _siguientes(inicios, longitudes)
+    cruz = locales[:, 0] * locales[siguiente, 1] - locales[siguiente, 0] * locales[:, 1]
+    conservar = np.abs(_sumar(cruz, inicios, longitudes)) / 2 >= area_minima
+    if not conservar.all():
+        por_punto = np.repeat(conservar, longitudes)
+        puntos, locales = puntos[por_punto], locales[por_punto]
+        indices, primeros, longitudes = indices[conservar], primeros[conservar], longitudes[conservar]
+        inicios = np.cumsum(longitudes) - longitudes
+
+    tabla = np.zeros(len(indices), dtype=TIPO_TABLA)
+    tabla['indice'] = indices
+    m = momentos_poligonos(locales, inicios, longitudes)
+    tabla['area'] = m['m00']
+    # Longitud de las aristas, cerrando cada contorno.
+    aristas = puntos[_siguientes(inicios, longitudes)] - puntos
+    tabla['perimetro'] = _sumar(np.hypot(aristas[:, 0], aristas[:, 1]), inicios, longitudes)
+
+    con_area = m['m00'] != 0
+    m00 = np.where(con_area, m['m00'], 1)
+    tabla['cx'] = primeros[:, 0] + np.where(con_area, m['m10'] / m00, 0)
+    tabla['cy'] = primeros[:, 1] + np.where(con_area, m['m01'] / m00, 0)
+
+    minimos = _sumar(puntos, inicios, longitudes, np.minimum)
+    maximos = _sumar(puntos, inicios, longitudes, np.maximum)
+    tabla['x'], tabla['y'] = minimos.T
+    tabla['ancho'], tabla['alto'] = (maximos - minimos + 1).T
+
+    perimetro = tabla['perimetro']
+    tabla['circularidad'] = np.where(perimetro > 0, 4 * np.pi * tabla['area'] / np.where(perimetro > 0, perimetro, 1) ** 2, 0)
+    hu = momentos_hu(m)
+    for i in range(7):
+        tabla[f'hu{i + 1}'] = hu[:, i]
+    return tabla
+
+
+def analizar_mascara(mascara, area_minima=0, modo=cv2.RETR_EXTERNAL):
+    """
+    Busca los contornos de una máscara binaria y calcula sus propiedades.
+
+    Returns:
+        tuple: (contornos, tabla de `analizar_contornos`).
+    """
+    contornos, _ = cv2.findContours(mascara, modo, cv2.CHAIN_APPROX_SIMPLE)
+    return contornos, analizar_contornos(contornos, area_minima)
+
+
+# --- 4. Clasificación ---
+def clasificar(contornos, tabla, epsilon=0.02):
+    """
+    Clasifica cada fila de la tabla como círculo, rectángulo, triángulo o
+    polígono.
+
+    El número de vértices sale de `cv2.approxPolyDP` con una tolerancia
+    proporcional al perímetro: 3 es un triángulo y 4 un rectángulo; con más
+    de 6 vértices y circularidad alta, un círculo; el resto, polígonos.
+
+    Args:
+        contornos (list): Contornos originales.
+        tabla (np.array): Tabla de `analizar_contornos`.
+        epsilon (float): Tolerancia de la aproximación, en fracción del
+            perímetro.
+
+    Returns:
+        np.array: Códigos int8 (índices de `FORMAS`), uno por fila.
+    """
+    vertices = np.fromiter((len(cv2.approxPolyDP(contornos[i], epsilon * p, True))
+                            for i, p in zip(tabla['indice'], tabla['perimetro'])),
+                           dtype=np.int64, count=len(tabla))
+    clases = np.full(len(tabla), POLIGONO, dtype=np.int8)
+    clases[(vertices > 6) & (tabla['circularidad'] >= UMBRAL_CIRCULARIDAD)] = CIRCULO
+    clases[vertices == 4] = RECTANGULO
+    clases[vertices == 3] = TRIANGULO
+    return clases
+
+
+# --- 5. Dibujo (opcional) ---
+def dibujar(imagen, contornos, tabla, etiquetas=True, color_contorno=(0, 255, 0),
+            color_centroide=(255, 0, 0), color_texto=(255, 255, 255)):
+    """
+    Dibuja los contornos de la tabla, su centroide y, opcionalmente, sus
+    métricas, como el bucle de `main.py`, in situ.
+
+    Args:
+        imagen (np.array): Imagen BGR sobre la que dibujar.
+        contornos (list): Contornos originales.
+        tabla (np.array): Tabla de `analizar_contornos`.
+        etiquetas (bool): Escribir área, perímetro y centroide junto a cada
+            figura (la parte más lenta con muchas figuras).
+
+    Returns:
+        np.array: La propia imagen.
+    """
+    seleccion = [contornos[i] for i in tabla['indice']]
+    # Todos los contornos con una sola llamada.
+    cv2.drawContours(imagen, seleccion, -1, color_contorno, 2)
+    for fila in tabla:
+        cx, cy = int(fila['cx']), int(fila['cy'])
+        cv2.circle(imagen, (cx, cy), 5, color_centroide, -1)
+        if etiquetas:
+            textos = (f"Area: {int(fila['area'])}", f"Perimetro: {fila['perimetro']:.2f}",
+                      f"Centroide: ({cx}, {cy})")
+            for dy, texto in zip((-20, 0, 20), textos):
+                cv2.putText(imagen, texto, (cx - 60, cy + dy), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color_texto, 1)
+    return imagen
@@ -2,6 +2,8 @@ import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 
+import figuras
+
 # --- 1. Generación de una imagen binarizada de ejemplo ---
 # Creamos una imagen en negro de 500x500 píxeles
 height, width = 500, 500
@@ -35,47 +37,17 @@ output_image = cv2.cvtColor(binary_image, cv2.COLOR_GRAY2BGR)
 # --- 3. Cálculo de Propiedades y Etiquetado ---
 print(f"Se encontraron {len(contours)} figuras en la imagen.")
 
-# Iteramos sobre cada contorno detectado
-for i, c in enumerate(contours):
-    # Omitimos contornos muy pequeños que podrían ser ruido
-    if cv2.contourArea(c) < 20:
-        continue
-
-    # a. Calcular Área
-    area = cv2.contourArea(c)
-
-    # b. Calcular Perímetro
-    # El segundo argumento (True) indica que la forma es cerrada.
-    perimeter = cv2.arcLength(c, True)
-
-    # c. Calcular Centroide a partir de los momentos
-    M = cv2.moments(c)
-    # Evitamos la división por cero si el momento m00 es 0
-    if M["m00"] != 0:
-        cx = int(M["m10"] / M["m00"])
-        cy = int(M["m01"] / M["m00"])
-    else:
-        # Si el área es cero, usamos el primer punto del contorno como referencia
-        cx, cy = c[0][0]
-
-    # d. Dibujar el contorno sobre la imagen de salida
-    # El -1 en el cuarto argumento dibuja todos los contornos encontrados.
-    # Aquí usamos [c] para dibujar uno por uno.
-    cv2.drawContours(output_image, [c], -1, (0, 255, 0), 2) # Contorno en verde
-
-    # e. Etiquetar cada figura con sus métricas
-    # Colocamos un punto en el centroide para visualizarlo
-    cv2.circle(output_image, (cx, cy), 5, (255, 0, 0), -1) # Centroide en azul
-
-    # Preparamos las etiquetas de texto
-    label_area = f"Area: {int(area)}"
-    label_perimeter = f"Perimetro: {perimeter:.2f}"
-    label_centroid = f"Centroide: ({cx}, {cy})"
-
-    # Posicionamos y dibujamos las etiquetas cerca del centroide
-    cv2.putText(output_image, label_area, (cx - 60, cy - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    cv2.putText(output_image, label_perimeter, (cx - 60, cy), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    cv2.putText(output_image, label_centroid, (cx - 60, cy + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+# Área, perímetro, centroide, caja envolvente, circularidad y momentos de Hu
+# de todos los contornos a la vez, como una tabla con una fila por figura.
+# Se omiten los contornos muy pequeños que podrían ser ruido.
+tabla = figuras.analizar_contornos(contours, area_minima=20)
+for fila in tabla:
+    print(f"Figura {fila['indice']}: área={fila['area']:.1f}, perímetro={fila['perimetro']:.2f}, "
+          f"centroide=({fila['cx']:.1f}, {fila['cy']:.1f}), circularidad={fila['circularidad']:.3f}")
+
+# Dibujar los contornos y etiquetar cada figura con sus métricas: un paso
+# aparte, que se puede omitir cuando solo interesa la tabla.
+figuras.dibujar(output_image, contours, tabla)
 
 
 # --- 4. Visualización de Resultados ---
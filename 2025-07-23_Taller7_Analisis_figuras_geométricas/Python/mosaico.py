@@ -0,0 +1,313 @@
+"""
+Componentes conexas de máscaras gigantes por tiles, con memoria acotada.
+
+`main.py` llama a `cv2.findContours` sobre una `binary_image` entera en
+memoria; con las máscaras de 100k x 100k píxeles de un escaneo completo de
+una lámina eso no cabe. Aquí la máscara se lee de disco como memmap (un
+`.npy` o un `np.memmap`) y se procesa por tiles en un pool de procesos:
+
+- Cada proceso lee su tile (más un píxel de margen para el perímetro),
+  etiqueta sus componentes con `cv2.connectedComponentsWithStats`
+  (8-conectividad) y devuelve solo estadísticas por componente y las
+  etiquetas de sus cuatro bordes.
+- Las componentes que cruzan bordes de tiles se unen con una union-find
+  vectorizada sobre las parejas de etiquetas vecinas a ambos lados de cada
+  costura.
+- Las estadísticas son sumas exactas (enteras) que se acumulan al unir:
+  área en píxeles, perímetro como número de lados de píxel que dan al fondo,
+  sumas de coordenadas para el centroide y caja envolvente.
+
+Así la tabla global es idéntica a la de una sola pasada sobre la máscara
+entera (`tile=None`) y la memoria depende del tamaño del tile, no del de la
+máscara. Esto vale para memmaps y rutas: un array normal ya está entero en
+memoria y se procesa por tiles en el proceso actual, sin pool, para no
+copiarlo a cada proceso.
+
+Ejemplo:
+    mascara = np.load('lamina.npy', mmap_mode='r')
+    tabla = analizar_mosaico(mascara, tile=4096, area_minima=50)
+    tabla['area'], tabla['perimetro'], tabla['cx'], tabla['cy']
+"""
+
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+TILE = 4096
+
+TIPO_COMPONENTES = np.dtype([
+    ('area', np.int64),         # Píxeles de la componente
+    ('perimetro', np.int64),    # Lados de píxel que dan al fondo o al borde
+    ('cx', np.float64),
+    ('cy', np.float64),
+    ('x', np.int64),            # Caja envolvente, como CC_STAT_LEFT/TOP/...
+    ('y', np.int64),
+    ('ancho', np.int64),
+    ('alto', np.int64),
+])
+
+
+# --- 1. Origen de la máscara ---
+def describir(mascara):
+    """
+    Descripción de la máscara que cada proceso puede volver a abrir sin
+    copiarla: la ruta de un `.npy`, la posición en su archivo de un
+    `np.memmap` (también de una vista recortada, como `lamina[y0:y1, x0:x1]`)
+    o, para un array en memoria, el propio array.
+    """
+    if isinstance(mascara, (str, os.PathLike)):
+        return ('npy', os.fspath(mascara))
+    mapa = getattr(mascara, '_mmap', None)
+    if isinstance(mascara, np.memmap) and mascara.filename and mapa is not None:
+        # Una vista conserva el `offset` del memmap original, así que la
+        # posición real de sus datos en el archivo sale de su dirección
+        # respecto al inicio del mapa (que empieza en un múltiplo de
+        # ALLOCATIONGRANULARITY).
+        inicio_mapa = mascara.offset - mascara.offset % mmap.ALLOCATIONGRANULARITY
+        direccion_mapa = np.frombuffer(mapa, dtype=np.uint8).ctypes.data
+        desplazamiento = inicio_mapa + mascara.ctypes.data - direccion_mapa
+        return ('memmap', mascara.filename, mascara.dtype.str, mascara.shape, mascara.strides,
+                desplazamiento)
+    return ('array', np.asarray(mascara))
+
+
+def abrir(fuente):
+    """Abre en modo lectura la máscara de `describir`."""
+    if fuente[0] == 'npy':
+        return np.load(fuente[1], mmap_mode='r')
+    if fuente[0] == 'memmap':
+        _, ruta, tipo, forma, pasos, desplazamiento = fuente
+        archivo = np.memmap(ruta, dtype=np.uint8, mode='r')
+        return np.ndarray(forma, dtype=tipo, buffer=archivo, offset=desplazamiento, strides=pasos)
+    return fuente[1]
+
+
+def tiles(alto, ancho, tile=TILE):
+    """Rectángulos (y0, y1, x0, x1) de los tiles, por filas."""
+    alto_tile, ancho_tile = (alto, ancho) if tile is None else (tile, tile)
+    return [(y0, min(y0 + alto_tile, alto), x0, min(x0 + ancho_tile, ancho))
+            for y0 in range(0, alto, alto_tile) for x0 in range(0, ancho, ancho_tile)]
+
+
+# --- 2. Trabajo de cada tile ---
+def analizar_tile(mascara, y0, y1, x0, x1):
+    """
+    Etiqueta un tile y resume sus componentes.
+
+    Returns:
+        dict: 'estadisticas' (n, 8) int64 por componente local (área,
+        perímetro, suma de x, suma de y, x mínima, y mínima, x máxima,
+        y máxima, en coordenadas globales) y las etiquetas locales (0 =
+        fondo, 1..n) de los bordes 'arriba', 'abajo', 'izquierda' y
+        'derecha'.
+    """
+    alto, ancho = mascara.shape
+    # Tile con un píxel de margen; fuera de la máscara es fondo.
+    ey0, ey1, ex0, ex1 = max(y0 - 1, 0), min(y1 + 1, alto), max(x0 - 1, 0), min(x1 + 1, ancho)
+    margen = np.zeros((y1 - y0 + 2, x1 - x0 + 2), dtype=np.uint8)
+    margen[ey0 - y0 + 1:ey1 - y0 + 1, ex0 - x0 + 1:ex1 - x0 + 1] = np.asarray(mascara[ey0:ey1, ex0:ex1]) != 0
+    binaria = margen[1:-1, 1:-1]
+
+    n, etiquetas, stats, _ = cv2.connectedComponentsWithStats(binaria, connectivity=8, ltype=cv2.CV_32S)
+    # Lados expuestos de cada píxel: 4 menos sus vecinos 4-conexos de figura.
+    vecinos = margen[:-2, 1:-1] + margen[2:, 1:-1] + margen[1:-1, :-2] + margen[1:-1, 2:]
+    planas = etiquetas.ravel()
+    figura = np.flatnonzero(planas)
+    etiqueta = planas[figura]
+    expuestos = 4 - vecinos.ravel()[figura]
+    w = x1 - x0
+
+    estadisticas = np.empty((n - 1, 8), dtype=np.int64)
+    estadisticas[:, 0] = stats[1:, cv2.CC_STAT_AREA]
+    # Sumas con bincount (float64): exactas mientras no pasen de 2**53.
+    estadisticas[:, 1] = np.bincount(etiqueta, expuestos, minlength=n)[1:]
+    estadisticas[:, 2] = np.bincount(etiqueta, figura % w, minlength=n)[1:]
+    estadisticas[:, 3] = np.bincount(etiqueta, figura // w, minlength=n)[1:]
+    estadisticas[:, 2] += x0 * estadisticas[:, 0]
+    estadisticas[:, 3] += y0 * estadisticas[:, 0]
+    estadisticas[:, 4] = stats[1:, cv2.CC_STAT_LEFT] + x0
+    estadisticas[:, 5] = stats[1:, cv2.CC_STAT_TOP] + y0
+    estadisticas[:, 6] = estadisticas[:, 4] + stats[1:, cv2.CC_STAT_WIDTH] - 1
+    estadisticas[:, 7] = estadisticas[:, 5] + stats[1:, cv2.CC_STAT_HEIGHT] - 1
+    return {
+        'estadisticas': estadisticas,
+        'arriba': etiquetas[0].copy(), 'abajo': etiquetas[-1].copy(),
+        'izquierda': etiquetas[:, 0].copy(), 'derecha': etiquetas[:, -1].copy(),
+    }
+
+
+# Máscara de cada proceso; la abre `_iniciar_trabajador`.
+_MASCARA = None
+
+
+def _iniciar_trabajador(fuente):
+    global _MASCARA
+    cv2.setNumThreads(1)
+    _MASCARA = abrir(fuente)
+
+
+def _procesar_tile(rectangulo):
+    return analizar_tile(_MASCARA, *rectangulo)
+
+
+# --- 3. Costuras y union-find ---
+def _parejas_costura(a, b):
+    """Parejas (a[i], b[i + d]) 8-vecinas a ambos lados de una costura (-1 = fondo)."""
+    n = len(a)
+    parejas = []
+    for d in (-1, 0, 1):
+        pa = a[max(0, -d):n - max(0, d)]
+        pb = b[max(0, d):n - max(0, -d)]
+        validas = (pa >= 0) & (pb >= 0)
+        parejas.append(np.stack([pa[validas], pb[validas]], axis=1))
+    return np.concatenate(parejas)
+
+
+def unir(n, parejas):
+    """
+    Union-find vectorizada: raíz de cada uno de los n elementos tras unir
+    las parejas (P, 2). La raíz es el menor índice de cada grupo.
+    """
+    raiz = np.arange(n)
+    u, v = parejas[:, 0], parejas[:, 1]
+    while len(u):
+        ru, rv = raiz[u], raiz[v]
+        distintas = ru != rv
+        if not distintas.any():
+            break
+        u, v, ru, rv = u[distintas], v[distintas], ru[distintas], rv[distintas]
+        # Cada raíz mayor se cuelga de la menor y se comprimen los caminos
+        # saltando punteros hasta que todos apuntan a una raíz.
+        np.minimum.at(raiz, np.maximum(ru, rv), np.minimum(ru, rv))
+        while True:
+            siguiente = raiz[raiz]
+            if np.array_equal(siguiente, raiz):
+                break
+            raiz = siguiente
+    return raiz
+
+
+# --- 4. Tabla global ---
+def analizar_mosaico(mascara, tile=TILE, area_minima=0, procesos=None):
+    """
+    Componentes conexas (8-conectividad) de una máscara, por tiles.
+
+    Args:
+        mascara (np.array | np.memmap | str): Máscara (alto, ancho), distinto
+            de 0 es figura; un memmap o la ruta de un `.npy` se abre en cada
+            proceso sin copiarse. Un array en memoria se procesa siempre en
+            el proceso actual, por tiles pero sin pool.
+        tile (int | None): Lado de los tiles; None = una sola pasada.
+        area_minima (int): Se descartan las componentes más pequeñas.
+        procesos (int | None): Procesos del pool (None = todos los núcleos;
+            1 = sin pool, en el proceso actual). Solo se usa con memmaps y
+            rutas.
+
+    Returns:
+        np.array: Tabla con los campos de `TIPO_COMPONENTES`, una fila por
+        componente, ordenada por la esquina superior izquierda de la caja.
+    """
+    fuente = describir(mascara)
+    alto, ancho = abrir(fuente).shape
+    if alto == 0 or ancho == 0:
+        return np.empty(0, dtype=TIPO_COMPONENTES)
+    rectangulos = tiles(alto, ancho, tile)
+    # Un array en memoria se copiaría entero a cada proceso (va en los
+    # argumentos del inicializador): solo los memmaps y las rutas de `.npy`
+    # se reparten entre procesos con la memoria acotada por el tile.
+    if fuente[0] == 'array':
+        procesos = 1
+    procesos = min(procesos or os.cpu_count() or 1, len(rectangulos))
+    if procesos == 1:
+        _iniciar_trabajador(fuente)
+        resultados = [_procesar_tile(r) for r in rectangulos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(fuente,)) as pool:
+            resultados = list(pool.map(_procesar_tile, rectangulos))
+
+    # Etiqueta global de la componente local l del tile k: desplazamiento
+    # del tile + l - 1 (el fondo queda en -1).
+    cuantas = np.array([len(r['estadisticas']) for r in resultados], dtype=np.int64)
+    desplazamientos = np.cumsum(cuantas) - cuantas
+    estadisticas = np.concatenate([r['estadisticas'] for r in resultados]) if len(resultados) else \
+        np.empty((0, 8), dtype=np.int64)
+
+    def globales(k, borde):
+        locales = resultados[k][borde].astype(np.int64)
+        return np.where(locales > 0, locales - 1 + desplazamientos[k], -1)
+
+    # Costuras completas a lo largo de cada línea de tiles: las parejas
+    # diagonales que cruzan una esquina de tiles también aparecen.
+    filas = sorted({r[0] for r in rectangulos})
+    columnas = sorted({r[2] for r in rectangulos})
+    por_columna = len(columnas)
+    parejas = [np.empty((0, 2), dtype=np.int64)]
+    for i in range(len(filas) - 1):
+        arriba = np.concatenate([globales(i * por_columna + j, 'abajo') for j in range(por_columna)])
+        abajo = np.concatenate([globales((i + 1) * por_columna + j, 'arriba') for j in range(por_columna)])
+        parejas.append(_parejas_costura(arriba, abajo))
+    for j in range(por_columna - 1):
+        izquierda = np.concatenate([globales(i * por_columna + j, 'derecha') for i in range(len(filas))])
+        derecha = np.concatenate([globales(i * por_columna + j + 1, 'izquierda') for i in range(len(filas))])
+        parejas.append(_parejas_costura(izquierda, derecha))
+    raiz = unir(len(estadisticas), np.concatenate(parejas))
+
+    # Acumular las estadísticas de cada grupo de etiquetas unidas.
+    _, grupo = np.unique(raiz, return_inverse=True)
+    m = grupo.max() + 1 if len(grupo) else 0
+    sumas = np.zeros((m, 4), dtype=np.int64)
+    np.add.at(sumas, grupo, estadisticas[:, :4])
+    minimos = np.full((m, 2), np.iinfo(np.int64).max)
+    np.minimum.at(minimos, grupo, estadisticas[:, 4:6])
+    maximos = np.full((m, 2), -1, dtype=np.int64)
+    np.maximum.at(maximos, grupo, estadisticas[:, 6:8])
+
+    tabla = np.empty(m, dtype=TIPO_COMPONENTES)
+    tabla['area'], tabla['perimetro'] = sumas[:, 0], sumas[:, 1]
+    tabla['cx'], tabla['cy'] = sumas[:, 2] / sumas[:, 0], sumas[:, 3] / sumas[:, 0]
+    tabla['x'], tabla['y'] = minimos.T
+    tabla['ancho'], tabla['alto'] = (maximos - minimos + 1).T
+    tabla = tabla[tabla['area'] >= area_minima]
+    orden = np.lexsort((tabla['area'], tabla['cx'], tabla['cy'], tabla['x'], tabla['y']))
+    return tabla[orden]
+
+
+# --- 5. Ejemplo ---
+def mascara_de_ejemplo(ruta, alto=6000, ancho=6000, manchas=20000, semilla=0):
+    """Guarda en `ruta` (.npy) una máscara con manchas circulares, por franjas."""
+    rng = np.random.default_rng(semilla)
+    centros = rng.uniform((0, 0), (ancho, alto), (manchas, 2)).astype(int)
+    radios = rng.integers(2, 60, manchas)
+    salida = np.lib.format.open_memmap(ruta, mode='w+', dtype=np.uint8, shape=(alto, ancho))
+    franja = 1024
+    for y0 in range(0, alto, franja):
+        y1 = min(y0 + franja, alto)
+        bloque = np.zeros((y1 - y0, ancho), dtype=np.uint8)
+        cerca = np.abs(centros[:, 1] - (y0 + y1) / 2) <= (y1 - y0) / 2 + radios
+        for (x, y), r in zip(centros[cerca], radios[cerca]):
+            cv2.circle(bloque, (int(x), int(y - y0)), int(r), 1, -1)
+        salida[y0:y1] = bloque
+    salida.flush()
+    del salida
+
+
+def main(ruta='mascara_mosaico.npy', tile=1024, procesos=None):
+    if not os.path.exists(ruta):
+        mascara_de_ejemplo(ruta)
+    mascara = np.load(ruta, mmap_mode='r')
+    inicio = time.perf_counter()
+    tabla = analizar_mosaico(mascara, tile=tile, procesos=procesos)
+    print(f"{len(tabla)} componentes en {time.perf_counter() - inicio:.2f} s con tiles de {tile}")
+    inicio = time.perf_counter()
+    referencia = analizar_mosaico(mascara, tile=None)
+    print(f"Una sola pasada: {time.perf_counter() - inicio:.2f} s; "
+          f"tablas {'idénticas' if np.array_equal(tabla, referencia) else 'DISTINTAS'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""
+Análisis de figuras sobre un flujo de máscaras de segmentación, con
+identificadores estables entre frames.
+
+`main.py` analiza una sola imagen binarizada. Aquí cada frame de un vídeo (o
+de un modelo de segmentación) pasa por el mismo análisis de `figuras`
+(tabla de área, perímetro, centroide... y forma: círculo, rectángulo,
+triángulo o polígono) y cada figura se asocia con la del frame anterior más
+cercana:
+
+- Los centroides del frame anterior se indexan en una rejilla uniforme con
+  celdas del tamaño de la distancia máxima de asociación, así que cada
+  figura solo se compara con las de las 3x3 celdas vecinas en lugar de con
+  todas.
+- Las parejas se eligen de menor a mayor distancia (parejas mutuamente más
+  cercanas, por rondas vectorizadas).
+- El estado de los objetos seguidos (identificador, último centroide, forma
+  y frames sin ver) se guarda en arrays que crecen por duplicación, y la
+  máscara binaria se escribe siempre en el mismo buffer.
+
+Ejemplo:
+    seguidor = Seguidor(distancia_maxima=40)
+    for mascara in mascaras:
+        contornos, tabla = seguidor.actualizar(mascara)
+        tabla['id'], tabla['forma'], tabla['cx'], tabla['cy']
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+import figuras
+
+TIPO_SEGUIMIENTO = np.dtype([('id', np.int64), ('forma', np.int8)] + figuras.CAMPOS)
+
+# Desplazamientos de las 3x3 celdas vecinas de la rejilla.
+_VECINAS = np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1]), axis=-1).reshape(-1, 2)
+
+
+def _claves(celdas):
+    """Una clave int64 por celda (ix, iy) de la rejilla."""
+    return celdas[..., 0] * (1 << 32) + celdas[..., 1]
+
+
+# --- 1. Asociación con una rejilla ---
+def emparejar(previos, actuales, distancia_maxima):
+    """
+    Asocia puntos de dos frames consecutivos.
+
+    Args:
+        previos (np.array): Centroides (T, 2) del frame anterior.
+        actuales (np.array): Centroides (M, 2) del frame actual.
+        distancia_maxima (float): Distancia máxima de una pareja.
+
+    Returns:
+        tuple: (índices en `actuales`, índices en `previos`) de las parejas;
+        cada punto aparece como mucho en una.
+    """
+    vacio = np.empty(0, dtype=np.int64)
+    if len(previos) == 0 or len(actuales) == 0:
+        return vacio, vacio
+    # Rejilla de los puntos previos: claves de celda ordenadas.
+    claves = _claves(np.floor(previos / distancia_maxima).astype(np.int64))
+    orden = np.argsort(claves, kind='stable')
+    ordenadas = claves[orden]
+
+    # Candidatos: los previos de las 9 celdas vecinas de cada punto actual.
+    celdas = np.floor(actuales / distancia_maxima).astype(np.int64)
+    vecinas = _claves(celdas[:, None, :] + _VECINAS).ravel()
+    inicio = np.searchsorted(ordenadas, vecinas, 'left')
+    cuantos = np.searchsorted(ordenadas, vecinas, 'right') - inicio
+    actual = np.repeat(np.arange(len(vecinas)) // len(_VECINAS), cuantos)
+    local = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+    previo = orden[np.repeat(inicio, cuantos) + local]
+    distancia = np.hypot(*(actuales[actual] - previos[previo]).T)
+    cerca = distancia <= distancia_maxima
+    actual, previo, distancia = actual[cerca], previo[cerca], distancia[cerca]
+
+    # En cada ronda se aceptan las parejas en que cada punto es el más
+    # cercano del otro (la más corta de todas siempre lo es) y se descartan
+    # las demás parejas de los puntos ya asociados.
+    elegidos_a, elegidos_p = [], []
+    while len(distancia):
+        o = np.lexsort((previo, actual, distancia))
+        mejor_a = o[np.unique(actual[o], return_index=True)[1]]
+        mejor_p = o[np.unique(previo[o], return_index=True)[1]]
+        mutuas = np.intersect1d(mejor_a, mejor_p)
+        elegidos_a.append(actual[mutuas])
+        elegidos_p.append(previo[mutuas])
+        libres = ~np.isin(actual, actual[mutuas]) & ~np.isin(previo, previo[mutuas])
+        actual, previo, distancia = actual[libres], previo[libres], distancia[libres]
+    if not elegidos_a:
+        return vacio, vacio
+    return np.concatenate(elegidos_a), np.concatenate(elegidos_p)
+
+
+# --- 2. Seguimiento ---
+class Seguidor:
+    """
+    Analiza frames de máscaras y mantiene identificadores estables.
+
+    Un objeto que no se asocia durante más de `perdidos_maximos` frames se
+    olvida; una figura sin pareja recibe un identificador nuevo.
+    """
+
+    def __init__(self, distancia_maxima=40.0, perdidos_maximos=5, area_minima=20, umbral=0,
+                 capacidad=256):
+        self.distancia_maxima = distancia_maxima
+        self.perdidos_maximos = perdidos_maximos
+        self.area_minima = area_minima
+        self.umbral = umbral
+        self.n = 0
+        self.siguiente_id = 0
+        self.ids = np.empty(capacidad, dtype=np.int64)
+        self.centros = np.empty((capacidad, 2))
+        self.formas = np.empty(capacidad, dtype=np.int8)
+        self.perdidos = np.empty(capacidad, dtype=np.int64)
+        self._mascara = None
+
+    def __len__(self):
+        return self.n
+
+    def _crecer(self, minimo):
+        capacidad = len(self.ids)
+        if minimo <= capacidad:
+            return
+        nueva = max(minimo, 2 * capacidad)
+        for atributo in ('ids', 'centros', 'formas', 'perdidos'):
+            viejo = getattr(self, atributo)
+            array = np.empty((nueva,) + viejo.shape[1:], dtype=viejo.dtype)
+            array[:self.n] = viejo[:self.n]
+            setattr(self, atributo, array)
+
+    def _binarizar(self, frame):
+        """Máscara uint8 del frame; si hay que umbralizar, en el buffer fijo."""
+        if frame.dtype == np.uint8 and self.umbral == 0:
+            return frame
+        if self._mascara is None or self._mascara.shape != frame.shape:
+            self._mascara = np.empty(frame.shape, dtype=np.uint8)
+        np.greater(frame, self.umbral, out=self._mascara.view(bool))
+        return self._mascara
+
+    def actualizar(self, frame):
+        """
+        Analiza un frame y asocia sus figuras con los objetos seguidos.
+
+        Args:
+            frame (np.array): Máscara (alto, ancho): uint8 (distinto de 0 es
+                figura), booleana o de probabilidades (se compara con
+                `umbral`).
+
+        Returns:
+            tuple: (contornos, tabla) con los campos de `figuras.CAMPOS` más
+            'id' (estable entre frames) y 'forma' (índice de
+            `figuras.FORMAS`).
+        """
+        contornos, tabla = figuras.analizar_mascara(self._binarizar(frame), self.area_minima)
+        formas = figuras.clasificar(contornos, tabla)
+        centros = np.column_stack([tabla['cx'], tabla['cy']])
+
+        n = self.n
+        actuales, previos = emparejar(self.centros[:n], centros, self.distancia_maxima)
+        ids = np.empty(len(tabla), dtype=np.int64)
+        ids[actuales] = self.ids[previos]
+        self.centros[previos] = centros[actuales]
+        self.formas[previos] = formas[actuales]
+        self.perdidos[:n] += 1
+        self.perdidos[previos] = 0
+
+        # Olvidar los objetos perdidos demasiado tiempo (compactando) y
+        # añadir las figuras nuevas al final.
+        conservar = np.flatnonzero(self.perdidos[:n] <= self.perdidos_maximos)
+        if len(conservar) < n:
+            for array in (self.ids, self.centros, self.formas, self.perdidos):
+                array[:len(conservar)] = array[conservar]
+            self.n = len(conservar)
+        nuevos = np.ones(len(tabla), dtype=bool)
+        nuevos[actuales] = False
+        nuevos = np.flatnonzero(nuevos)
+        ids[nuevos] = np.arange(self.siguiente_id, self.siguiente_id + len(nuevos))
+        self.siguiente_id += len(nuevos)
+        self._crecer(self.n + len(nuevos))
+        fin = self.n + len(nuevos)
+        self.ids[self.n:fin] = ids[nuevos]
+        self.centros[self.n:fin] = centros[nuevos]
+        self.formas[self.n:fin] = formas[nuevos]
+        self.perdidos[self.n:fin] = 0
+        self.n = fin
+
+        salida = np.empty(len(tabla), dtype=TIPO_SEGUIMIENTO)
+        for campo in figuras.TIPO_TABLA.names:
+            salida[campo] = tabla[campo]
+        salida['id'] = ids
+        salida['forma'] = formas
+        return contornos, salida
+
+    def procesar(self, frames):
+        """Aplica `actualizar` a cada frame de un iterable, a medida que llegan."""
+        for frame in frames:
+            yield self.actualizar(frame)
+
+
+# --- 3. Ejemplo: figuras en movimiento a 1080p ---
+def frames_sinteticos(num_frames, ancho=1920, alto=1080, cantidad=60, semilla=0):
+    """
+    Máscaras con círculos, rectángulos y triángulos que se desplazan.
+
+    Cada frame se dibuja en el mismo buffer: es válido hasta pedir el
+    siguiente.
+    """
+    rng = np.random.default_rng(semilla)
+    posiciones = rng.uniform((100, 100), (ancho - 100, alto - 100), (cantidad, 2))
+    velocidades = rng.uniform(-8, 8, (cantidad, 2))
+    tamanos = rng.uniform(15, 40, cantidad)
+    tipos = np.arange(cantidad) % 3
+    mascara = np.zeros((alto, ancho), dtype=np.uint8)
+    for _ in range(num_frames):
+        mascara.fill(0)
+        for (x, y), r, tipo in zip(posiciones.astype(int), tamanos.astype(int), tipos):
+            if tipo == 0:
+                cv2.circle(mascara, (x, y), r, 255, -1)
+            elif tipo == 1:
+                cv2.rectangle(mascara, (x - r, y - r // 2), (x + r, y + r // 2), 255, -1)
+            else:
+                cv2.fillPoly(mascara, [np.array([[x - r, y + r], [x + r, y + r], [x, y - r]], np.int32)], 255)
+        yield mascara
+        posiciones += velocidades
+        # Rebote en los bordes.
+        fuera = (posiciones < 60) | (posiciones > (ancho - 60, alto - 60))
+        velocidades[fuera] *= -1
+
+
+def main(num_frames=120):
+    seguidor = Seguidor(distancia_maxima=40)
+    inicio = time.perf_counter()
+    for frame, (_, tabla) in enumerate(seguidor.procesar(frames_sinteticos(num_frames))):
+        if frame % 30 == 0:
+            cuantas = np.bincount(tabla['forma'], minlength=len(figuras.FORMAS))
+            print(f"frame {frame}: {len(tabla)} figuras, ids hasta {tabla['id'].max()}, "
+                  + ", ".join(f"{forma}={c}" for forma, c in zip(figuras.FORMAS, cuantas)))
+    segundos = time.perf_counter() - inicio
+    print(f"{num_frames} frames en {segundos:.2f} s ({num_frames / segundos:.1f} fps, incluido el dibujo)")
+
+
+if __name__ == '__main__':
+    main()
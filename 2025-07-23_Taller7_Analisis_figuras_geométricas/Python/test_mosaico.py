@@ -0,0 +1,55 @@
+"""Pruebas de `mosaico`: vistas de memmap frente a su copia en memoria."""
+
+import numpy as np
+import pytest
+
+import mosaico
+
+
+@pytest.fixture
+def mascara():
+    rng = np.random.default_rng(0)
+    return (rng.random((50, 60)) < 0.5).astype(np.uint8)
+
+
+def _vistas(mascara, tmp_path):
+    crudo = np.memmap(tmp_path / 'mascara.bin', dtype=np.uint8, mode='w+', shape=mascara.shape)
+    crudo[:] = mascara
+    crudo.flush()
+    np.save(tmp_path / 'mascara.npy', mascara)
+    npy = np.load(tmp_path / 'mascara.npy', mmap_mode='r')
+    return [
+        (crudo, mascara),
+        (crudo[10:40, 5:45], mascara[10:40, 5:45]),
+        (npy[5:], mascara[5:]),
+        (crudo[::-2, 3:50:3], mascara[::-2, 3:50:3]),
+        (npy.T, mascara.T),
+    ]
+
+
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_vista_de_memmap_igual_que_su_copia(mascara, tmp_path, procesos):
+    for vista, region in _vistas(mascara, tmp_path):
+        esperada = mosaico.analizar_mosaico(np.array(region), tile=9, procesos=1)
+        obtenida = mosaico.analizar_mosaico(vista, tile=9, procesos=procesos)
+        assert np.array_equal(obtenida, esperada)
+
+
+def test_tiles_igual_que_una_sola_pasada(mascara):
+    referencia = mosaico.analizar_mosaico(mascara, tile=None, procesos=1)
+    for tile in (1, 7, 16):
+        assert np.array_equal(mosaico.analizar_mosaico(mascara, tile=tile, procesos=1), referencia)
+
+
+@pytest.mark.parametrize('forma', [(0, 0), (0, 7), (7, 0)])
+@pytest.mark.parametrize('tile', [4, None])
+def test_mascara_vacia(forma, tile):
+    tabla = mosaico.analizar_mosaico(np.zeros(forma, dtype=np.uint8), tile=tile)
+    assert tabla.dtype == mosaico.TIPO_COMPONENTES and len(tabla) == 0
+
+
+def test_array_en_memoria_sin_pool(mascara, monkeypatch):
+    # Un array normal no se copia a un pool aunque se pidan procesos.
+    monkeypatch.setattr(mosaico, 'ProcessPoolExecutor', None)
+    referencia = mosaico.analizar_mosaico(mascara, tile=None, procesos=1)
+    assert np.array_equal(mosaico.analizar_mosaico(mascara, tile=9, procesos=2), referencia)
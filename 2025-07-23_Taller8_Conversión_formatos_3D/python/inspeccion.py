@@ -0,0 +1,256 @@
+"""
+Inspección de mallas en paralelo con un índice de propiedades en disco.
+
+`main.py` carga cada archivo en serie con `trimesh.load(..., force='mesh')`
+y vuelve a cargar los mismos archivos varias veces en una ejecución (el
+análisis, la conversión y el informe comparativo). Con una biblioteca de
+miles de modelos eso son minutos en cada informe. Aquí:
+
+- Las propiedades de cada archivo (vértices, caras, si es hermética, tipo
+  de color, límites y hash SHA-256 del archivo) se calculan en un pool de
+  procesos, una sola vez.
+- Se guardan en un índice JSON en disco cuya entrada de cada ruta solo es
+  válida mientras coincidan la fecha de modificación y el tamaño del
+  archivo; si el archivo cambia, se vuelve a inspeccionar.
+- El informe de pandas se construye desde el índice, así que repetirlo
+  sobre una biblioteca ya inspeccionada solo cuesta un `os.stat` por
+  archivo.
+- Las mallas que ya se cargaron para otra cosa (como el análisis de
+  `main.py`) pasan al índice con `registrar`, sin cargarse otra vez.
+
+Con `topologia=False`, los STL y OBJ solo se sondean con `sondeo` (conteos
+de la cabecera o de líneas, sin cargar la malla) y la hermeticidad y el
+color quedan sin calcular; trimesh solo carga los demás formatos.
+
+Los archivos externos de un modelo (p. ej. los `.bin` de un `.gltf`) no
+forman parte de la clave: si solo cambian ellos, usa `refrescar`.
+
+Ejemplo:
+    inspector = InspectorMallas('indice_mallas.json')
+    informe = inspector.informe(glob.glob('modelos/**/*.stl', recursive=True))
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+import trimesh
+
+import sondeo
+
+INDICE = 'indice_mallas.json'
+# Versión del formato de las entradas: si cambia, se ignoran las antiguas.
+VERSION = 2
+
+
+# --- 1. Propiedades de un archivo ---
+def hash_archivo(ruta, bloque=2**20):
+    """SHA-256 del contenido de un archivo, leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for datos in iter(lambda: f.read(bloque), b''):
+            h.update(datos)
+    return h.hexdigest()
+
+
+def _firma(ruta):
+    """Fecha de modificación (ns) y tamaño: la clave de validez del índice."""
+    info = os.stat(ruta)
+    return info.st_mtime_ns, info.st_size
+
+
+def propiedades_malla(ruta, topologia=True):
+    """
+    Carga una malla y calcula sus propiedades.
+
+    Args:
+        ruta (str): Archivo de la malla.
+        topologia (bool): Cargar la malla completa. Si es False y el formato
+            se puede sondear, solo se leen cabecera y conteos: 'hermetica' y
+            'color' quedan en None, igual que 'vertices' en un STL (sus
+            vértices no están indexados) y la caja en un OBJ o STL ASCII.
+
+    Returns:
+        dict: Entrada del índice: 'mtime_ns', 'tamano', 'topologia', 'hash',
+        'vertices', 'caras', 'hermetica', 'color' (tipo de `visual.kind` o
+        None), 'minimo' y 'maximo' (esquinas de la caja), o 'error' si no se
+        pudo cargar.
+    """
+    mtime_ns, tamano = _firma(ruta)
+    sondeable = os.path.splitext(ruta)[1].lower() in sondeo.SONDEOS
+    entrada = {'version': VERSION, 'mtime_ns': mtime_ns, 'tamano': tamano,
+               'topologia': topologia or not sondeable}
+    try:
+        entrada['hash'] = hash_archivo(ruta)
+        if not entrada['topologia']:
+            info = sondeo.sondear(ruta, limites=True)
+            entrada.update({'vertices': info.get('vertices'), 'caras': info['caras'], 'hermetica': None,
+                            'color': None, 'minimo': info.get('minimo'), 'maximo': info.get('maximo')})
+            return entrada
+        entrada.update(_medidas(trimesh.load(ruta, force='mesh')))
+    except Exception as e:
+        entrada['error'] = f"{type(e).__name__}: {e}"
+    return entrada
+
+
+def propiedades_de_malla(ruta, malla):
+    """
+    Entrada del índice de una malla que ya está cargada, sin volver a
+    cargarla; solo se lee el archivo para el hash.
+
+    Args:
+        ruta (str): Archivo del que se cargó la malla, sin cambios desde
+            entonces.
+        malla (trimesh.Trimesh): Malla cargada con `force='mesh'`.
+
+    Returns:
+        dict: Entrada completa, como la de `propiedades_malla`.
+    """
+    mtime_ns, tamano = _firma(ruta)
+    entrada = {'version': VERSION, 'mtime_ns': mtime_ns, 'tamano': tamano, 'topologia': True,
+               'hash': hash_archivo(ruta)}
+    entrada.update(_medidas(malla))
+    return entrada
+
+
+def _medidas(malla):
+    limites = malla.bounds if len(malla.vertices) else None
+    return {
+        'vertices': len(malla.vertices),
+        'caras': len(malla.faces),
+        'hermetica': bool(malla.is_watertight),
+        'color': getattr(malla.visual, 'kind', None) or None,
+        'minimo': None if limites is None else limites[0].tolist(),
+        'maximo': None if limites is None else limites[1].tolist(),
+    }
+
+
+# --- 2. Índice en disco ---
+class InspectorMallas:
+    """
+    Propiedades de mallas con un índice JSON en disco como caché.
+
+    Args:
+        ruta_indice (str | None): Archivo del índice (None = solo en memoria).
+        procesos (int | None): Procesos del pool (None = todos los núcleos;
+            1 = sin pool, en el proceso actual).
+        topologia (bool): Cargar las mallas completas (hermeticidad y
+            color) o solo sondear STL y OBJ, como en `propiedades_malla`.
+            Una entrada completa también sirve cuando solo se sondea.
+    """
+
+    def __init__(self, ruta_indice=INDICE, procesos=None, topologia=True):
+        self.ruta_indice = ruta_indice
+        self.procesos = procesos
+        self.topologia = topologia
+        self.indice = {}
+        if ruta_indice and os.path.exists(ruta_indice):
+            with open(ruta_indice, encoding='utf-8') as f:
+                self.indice = json.load(f)
+        self.estadisticas = {'aciertos': 0, 'inspeccionadas': 0}
+
+    def guardar(self):
+        """Escribe el índice de forma atómica: nunca queda a medias."""
+        if not self.ruta_indice:
+            return
+        temporal = f"{self.ruta_indice}.parcial"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.indice, f, ensure_ascii=False)
+        os.replace(temporal, self.ruta_indice)
+
+    def _valida(self, ruta, entrada):
+        try:
+            firma = _firma(ruta)
+        except OSError:
+            return False
+        return (entrada is not None and entrada.get('version') == VERSION
+                and (entrada['mtime_ns'], entrada['tamano']) == firma
+                and (entrada['topologia'] or not self.topologia))
+
+    def inspeccionar(self, rutas):
+        """
+        Propiedades de cada archivo, desde el índice o inspeccionándolo.
+
+        Returns:
+            dict: {ruta absoluta: entrada de `propiedades_malla`}, en el
+            orden de `rutas`. Los archivos que no existen no aparecen.
+        """
+        rutas = [os.path.abspath(r) for r in rutas]
+        existentes = [r for r in dict.fromkeys(rutas) if os.path.isfile(r)]
+        pendientes = [r for r in existentes if not self._valida(r, self.indice.get(r))]
+        self.estadisticas['aciertos'] += len(existentes) - len(pendientes)
+        if pendientes:
+            inspeccionar = partial(propiedades_malla, topologia=self.topologia)
+            procesos = min(self.procesos or os.cpu_count() or 1, len(pendientes))
+            try:
+                if procesos == 1:
+                    for ruta in pendientes:
+                        self.indice[ruta] = inspeccionar(ruta)
+                        self.estadisticas['inspeccionadas'] += 1
+                else:
+                    tam_lote = max(1, min(64, len(pendientes) // (4 * procesos)))
+                    with ProcessPoolExecutor(max_workers=procesos) as pool:
+                        for ruta, entrada in zip(pendientes, pool.map(inspeccionar, pendientes,
+                                                                       chunksize=tam_lote)):
+                            self.indice[ruta] = entrada
+                            self.estadisticas['inspeccionadas'] += 1
+            finally:
+                # Lo ya inspeccionado se conserva aunque algo falle a medias.
+                self.guardar()
+        return {r: self.indice[r] for r in existentes}
+
+    def registrar(self, mallas):
+        """
+        Guarda en el índice mallas que ya se cargaron en este proceso, para
+        que `inspeccionar` y `informe` no las vuelvan a cargar.
+
+        Args:
+            mallas (dict): {ruta: malla cargada con `force='mesh'` o None};
+                las None se ignoran.
+        """
+        for ruta, malla in mallas.items():
+            if malla is not None:
+                self.indice[os.path.abspath(ruta)] = propiedades_de_malla(ruta, malla)
+        self.guardar()
+
+    def refrescar(self, rutas):
+        """Olvida las entradas de unas rutas para que se vuelvan a inspeccionar."""
+        for ruta in rutas:
+            self.indice.pop(os.path.abspath(ruta), None)
+
+    def informe(self, rutas, relativas_a=None):
+        """
+        Informe comparativo de pandas, como `generar_informe_comparativo`,
+        con columnas extra de tipo de color, límites y hash.
+
+        Args:
+            rutas (list[str]): Archivos a comparar.
+            relativas_a (str | None): Carpeta respecto a la que se muestran
+                las rutas (None = tal como se pasaron).
+
+        Returns:
+            pd.DataFrame: Una fila por archivo que se pudo cargar.
+        """
+        entradas = self.inspeccionar(rutas)
+        datos = []
+        for archivo in rutas:
+            entrada = entradas.get(os.path.abspath(archivo))
+            if entrada is None or 'error' in entrada:
+                motivo = 'no existe' if entrada is None else entrada['error']
+                print(f"No se pudo procesar {archivo}: {motivo}")
+                continue
+            datos.append({
+                "Archivo": os.path.relpath(archivo, relativas_a) if relativas_a else archivo,
+                "Vértices": entrada['vertices'],
+                "Caras": entrada['caras'],
+                "Es Hermética": entrada['hermetica'],
+                "Tiene Color": entrada['color'] is not None if entrada['topologia'] else None,
+                "Tipo de Color": entrada['color'],
+                "Mínimo": entrada['minimo'],
+                "Máximo": entrada['maximo'],
+                "SHA-256": entrada['hash'],
+            })
+        return pd.DataFrame(datos)
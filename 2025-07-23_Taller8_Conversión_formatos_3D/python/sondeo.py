@@ -0,0 +1,203 @@
+"""
+Lectura ligera de STL y OBJ: cabeceras y conteos sin cargar la malla.
+
+Para imprimir cuántos vértices y caras tiene un archivo, `analizar_malla`
+carga la malla entera con trimesh, y `is_watertight` construye además toda
+la adyacencia. Con modelos escaneados de cientos de MB eso cuesta segundos y
+mucha memoria. Este módulo solo mira lo necesario:
+
+- STL binario: la cabecera de 80 bytes y el número de triángulos se leen
+  directamente, y los registros de 50 bytes se abren como memmap con un
+  dtype estructurado (normal, tres vértices y atributo), sin copiarlos.
+- STL ASCII y OBJ: se cuentan las líneas `endfacet`, `v` y `f` recorriendo
+  el archivo por bloques, sin interpretar los números.
+
+La carga completa con trimesh queda para cuando hace falta la topología
+(hermeticidad, adyacencia, colores).
+
+Ejemplo:
+    info = sondear('escaneo.stl')
+    info['caras'], info['cabecera']
+    triangulos = triangulos_stl('escaneo.stl')
+    triangulos['vertices'].shape  # (n, 3, 3), respaldado por el archivo
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Registro de un triángulo de STL binario (little-endian, 50 bytes).
+TIPO_STL = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('atributo', '<u2'),
+])
+CABECERA_STL = 84  # 80 bytes libres + número de triángulos (uint32)
+BLOQUE = 2**24
+
+
+# --- 1. Recorrido por bloques ---
+def contar_patrones(ruta, patrones, bloque=BLOQUE):
+    """
+    Cuenta apariciones de varias secuencias de bytes leyendo el archivo por
+    bloques; las que cruzan el límite entre bloques también cuentan.
+
+    Para contar líneas que empiezan por un prefijo, el patrón empieza por
+    b'\\n': el archivo se trata como si empezara por un salto de línea.
+
+    Los patrones no pueden solaparse consigo mismos (ningún prefijo propio
+    igual a un sufijo, como en b'aa'): con ellos `bytes.count` no da lo
+    mismo leyendo por bloques que de una vez.
+
+    Returns:
+        dict: {patrón: apariciones}.
+    """
+    for patron in patrones:
+        if any(patron[:k] == patron[-k:] for k in range(1, len(patron))):
+            raise ValueError(f"El patrón {patron!r} se solapa consigo mismo.")
+    cuentas = dict.fromkeys(patrones, 0)
+    solape = max(len(p) for p in patrones) - 1
+    resto = b'\n'
+    with open(ruta, 'rb') as f:
+        for datos in iter(lambda: f.read(bloque), b''):
+            # El final del bloque anterior es demasiado corto para contener
+            # el patrón más largo, pero no los más cortos: lo que empieza
+            # tan pronto que cabe entero en `resto` se contó con el bloque
+            # anterior.
+            trozo = resto + datos
+            for patron in patrones:
+                cuentas[patron] += trozo.count(patron, max(len(resto) - len(patron) + 1, 0))
+            resto = trozo[-solape:] if solape else b''
+    return cuentas
+
+
+# --- 2. STL ---
+def _es_stl_binario(ruta):
+    """Un STL es binario si su tamaño cuadra con el número de triángulos."""
+    tamano = os.path.getsize(ruta)
+    if tamano < CABECERA_STL:
+        return False
+    with open(ruta, 'rb') as f:
+        f.seek(80)
+        n = int(np.frombuffer(f.read(4), '<u4')[0])
+    return tamano == CABECERA_STL + n * TIPO_STL.itemsize
+
+
+def triangulos_stl(ruta):
+    """
+    Triángulos de un STL binario como array estructurado `TIPO_STL` en
+    memmap de solo lectura (no se copia nada a memoria).
+    """
+    if not _es_stl_binario(ruta):
+        raise ValueError(f"'{ruta}' no es un STL binario.")
+    n = (os.path.getsize(ruta) - CABECERA_STL) // TIPO_STL.itemsize
+    if n == 0:
+        return np.empty(0, dtype=TIPO_STL)
+    return np.memmap(ruta, dtype=TIPO_STL, mode='r', offset=CABECERA_STL, shape=(n,))
+
+
+def limites_stl(triangulos, bloque=2**20):
+    """Esquinas (mínimo, máximo) de la caja de los triángulos, por bloques."""
+    if len(triangulos) == 0:
+        return None
+    minimo = np.full(3, np.inf, dtype=np.float32)
+    maximo = np.full(3, -np.inf, dtype=np.float32)
+    for inicio in range(0, len(triangulos), bloque):
+        vertices = triangulos['vertices'][inicio:inicio + bloque]
+        np.minimum(minimo, vertices.min(axis=(0, 1)), out=minimo)
+        np.maximum(maximo, vertices.max(axis=(0, 1)), out=maximo)
+    return minimo, maximo
+
+
+def sondear_stl(ruta, limites=False):
+    """
+    Cabecera y número de triángulos de un STL, binario o ASCII.
+
+    Args:
+        ruta (str): Archivo .stl.
+        limites (bool): Calcular también la caja (STL binario; recorre los
+            registros en memmap).
+
+    Returns:
+        dict: 'formato', 'binario', 'cabecera', 'caras' y, si se pidieron
+        y el archivo es binario, 'minimo' y 'maximo'.
+    """
+    if _es_stl_binario(ruta):
+        with open(ruta, 'rb') as f:
+            cabecera = f.read(80)
+        triangulos = triangulos_stl(ruta)
+        info = {'formato': 'stl', 'binario': True,
+                'cabecera': cabecera.rstrip(b'\0 ').decode('ascii', 'replace'),
+                'caras': len(triangulos)}
+        if limites:
+            caja = limites_stl(triangulos)
+            info['minimo'], info['maximo'] = (None, None) if caja is None else (caja[0].tolist(), caja[1].tolist())
+        return info
+    with open(ruta, 'rb') as f:
+        primera = f.readline(1024).strip()
+    if not primera.startswith(b'solid'):
+        raise ValueError(f"'{ruta}' no es un STL válido.")
+    return {'formato': 'stl', 'binario': False,
+            'cabecera': primera[5:].strip().decode('ascii', 'replace'),
+            'caras': contar_patrones(ruta, [b'endfacet'])[b'endfacet']}
+
+
+# --- 3. OBJ ---
+def sondear_obj(ruta, bloque=BLOQUE):
+    """
+    Número de líneas de vértice (`v`) y de cara (`f`) de un OBJ.
+
+    Una cara de un OBJ puede ser un polígono de más de tres vértices: trimesh
+    la triangula al cargar, así que su número de caras puede ser mayor.
+
+    Returns:
+        dict: 'formato', 'vertices' y 'caras'.
+    """
+    cuentas = contar_patrones(ruta, [b'\nv ', b'\nv\t', b'\nf ', b'\nf\t'], bloque)
+    return {'formato': 'obj',
+            'vertices': cuentas[b'\nv '] + cuentas[b'\nv\t'],
+            'caras': cuentas[b'\nf '] + cuentas[b'\nf\t']}
+
+
+SONDEOS = {'.stl': sondear_stl, '.obj': sondear_obj}
+
+
+def sondear(ruta, limites=False):
+    """
+    Sondea un archivo según su extensión.
+
+    Args:
+        ruta (str): Archivo .stl u .obj.
+        limites (bool): Calcular la caja de los STL binarios (ver
+            `sondear_stl`); se ignora en los demás.
+
+    Returns:
+        dict: El de `sondear_stl` o `sondear_obj`, más 'tamano' en bytes.
+
+    Raises:
+        ValueError: Si el formato no se puede sondear sin cargarlo.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in SONDEOS:
+        raise ValueError(f"Formato '{extension}' no soportado. Usa uno de {sorted(SONDEOS)}.")
+    info = sondear_stl(ruta, limites) if extension == '.stl' else SONDEOS[extension](ruta)
+    info['tamano'] = os.path.getsize(ruta)
+    return info
+
+
+def main(argv=None):
+    for ruta in (argv if argv is not None else sys.argv[1:]) or ['cubo.stl', 'cubo.obj']:
+        try:
+            info = sondear(ruta)
+        except (OSError, ValueError) as e:
+            print(f"{ruta}: {e}")
+            continue
+        vertices = info.get('vertices')
+        print(f"{ruta}: {info['caras']} caras"
+              + (f", {vertices} vértices" if vertices is not None else "")
+              + (f" (STL {'binario' if info['binario'] else 'ASCII'})" if info['formato'] == 'stl' else ""))
+
+
+if __name__ == '__main__':
+    main()
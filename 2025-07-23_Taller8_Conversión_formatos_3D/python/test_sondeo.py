@@ -0,0 +1,29 @@
+"""Pruebas de `sondeo`: conteos por bloques frente a una sola lectura."""
+
+import pytest
+
+import sondeo
+
+
+@pytest.mark.parametrize('bloque', [1, 2, 3, 7, 1 << 20])
+def test_contar_patrones_de_distinta_longitud(tmp_path, bloque):
+    ruta = tmp_path / 'datos.bin'
+    ruta.write_bytes(b'abcd' * 10)
+    cuentas = sondeo.contar_patrones(str(ruta), [b'ab', b'abcd', b'da'], bloque)
+    assert cuentas == {b'ab': 10, b'abcd': 10, b'da': 9}
+
+
+@pytest.mark.parametrize('patron', [b'aa', b'aba', b'\n\n'])
+def test_contar_patrones_rechaza_autosolapados(tmp_path, patron):
+    ruta = tmp_path / 'datos.bin'
+    ruta.write_bytes(b'aaaa')
+    with pytest.raises(ValueError):
+        sondeo.contar_patrones(str(ruta), [b'a', patron])
+
+
+@pytest.mark.parametrize('bloque', [1, 5, 1 << 20])
+def test_sondear_obj(tmp_path, bloque):
+    ruta = tmp_path / 'modelo.obj'
+    ruta.write_bytes(b'v 0 0 0\nv 1 0 0\nv\t0 1 0\nvn 0 0 1\nf 1 2 3\n# f\nf\t1 3 2\n')
+    info = sondeo.sondear_obj(str(ruta), bloque)
+    assert (info['vertices'], info['caras']) == (3, 2)
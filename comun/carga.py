@@ -0,0 +1,197 @@
+"""
+Carga de imágenes con decodificación en paralelo, precarga y caché LRU.
+
+`cv2.imread` libera el GIL mientras decodifica, así que varios hilos pueden
+decodificar a la vez. `CargadorImagenes` aprovecha eso para precargar las
+siguientes imágenes de una lista mientras se procesa la actual, y guarda los
+arrays decodificados y sus espacios de color derivados (RGB, HSV, grises,
+Lab) en una caché limitada por tamaño en bytes. La clave incluye la fecha de
+modificación y el tamaño del archivo, de modo que si la imagen cambia en
+disco se vuelve a decodificar.
+
+Ejemplo:
+    cargador = CargadorImagenes(hilos=4, max_bytes=1 * 2**30, precarga=8)
+    for ruta, gris in cargador.iterar(rutas, 'gris'):
+        ...
+    hsv = cargador.cargar('imagen.jpg', 'hsv')  # reutiliza el BGR en caché
+"""
+
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import cv2
+
+# Conversiones disponibles a partir de la imagen BGR que devuelve cv2.imread.
+CONVERSIONES = {
+    'rgb': cv2.COLOR_BGR2RGB,
+    'hsv': cv2.COLOR_BGR2HSV,
+    'gris': cv2.COLOR_BGR2GRAY,
+    'lab': cv2.COLOR_BGR2LAB,
+}
+ESPACIOS = ('bgr',) + tuple(CONVERSIONES)
+
+
+class CargadorImagenes:
+    """
+    Carga imágenes con un pool de hilos y una caché LRU acotada en bytes.
+
+    Los arrays devueltos son de solo lectura porque se comparten con la
+    caché; quien necesite modificarlos debe hacer `.copy()`.
+
+    Args:
+        hilos (int): Hilos de decodificación.
+        max_bytes (int): Tamaño máximo de la caché en bytes (0 la desactiva).
+        precarga (int): Imágenes que `iterar` decodifica por adelantado.
+    """
+
+    def __init__(self, hilos=4, max_bytes=512 * 2**20, precarga=8):
+        self.max_bytes = max_bytes
+        self.precarga = precarga
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='carga')
+        self._cache = OrderedDict()
+        self._en_curso = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.estadisticas = {'aciertos': 0, 'fallos': 0, 'decodificaciones': 0, 'desalojos': 0}
+
+    # --- Caché ---
+    @staticmethod
+    def _clave(ruta):
+        """Clave de caché: ruta absoluta, fecha de modificación y tamaño."""
+        ruta = os.path.abspath(ruta)
+        info = os.stat(ruta)
+        return ruta, info.st_mtime_ns, info.st_size
+
+    def _guardar_en_cache(self, clave, imagen):
+        if imagen.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if clave in self._cache:
+                return
+            self._cache[clave] = imagen
+            self._bytes += imagen.nbytes
+            while self._bytes > self.max_bytes:
+                _, desalojada = self._cache.popitem(last=False)
+                self._bytes -= desalojada.nbytes
+                self.estadisticas['desalojos'] += 1
+
+    @property
+    def bytes_en_cache(self):
+        return self._bytes
+
+    def limpiar(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    # --- Carga ---
+    def _producir(self, clave, ruta, espacio):
+        """Decodifica (para 'bgr') o convierte desde el BGR en caché."""
+        if espacio == 'bgr':
+            imagen = cv2.imread(ruta, cv2.IMREAD_COLOR)
+            if imagen is None:
+                raise ValueError(f"No se pudo decodificar la imagen '{ruta}'.")
+            with self._lock:
+                self.estadisticas['decodificaciones'] += 1
+        else:
+            imagen = cv2.cvtColor(self._cargar_clave(clave[:3], ruta, 'bgr'), CONVERSIONES[espacio])
+        imagen.flags.writeable = False
+        return imagen
+
+    def _cargar_clave(self, base, ruta, espacio):
+        clave = base + (espacio,)
+        with self._lock:
+            imagen = self._cache.get(clave)
+            if imagen is not None:
+                self._cache.move_to_end(clave)
+                self.estadisticas['aciertos'] += 1
+                return imagen
+            self.estadisticas['fallos'] += 1
+            # Si otro hilo ya está produciendo esta imagen, se espera a ese.
+            pendiente = self._en_curso.get(clave)
+            if pendiente is None:
+                pendiente = self._en_curso[clave] = Future()
+                propietario = True
+            else:
+                propietario = False
+
+        if not propietario:
+            return pendiente.result()
+        try:
+            imagen = self._producir(clave, ruta, espacio)
+            self._guardar_en_cache(clave, imagen)
+            pendiente.set_result(imagen)
+            return imagen
+        except BaseException as e:
+            pendiente.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._en_curso.pop(clave, None)
+
+    def cargar(self, ruta, espacio='bgr'):
+        """
+        Devuelve la imagen en el espacio de color pedido, usando la caché.
+
+        Args:
+            ruta (str): Ruta de la imagen.
+            espacio (str): 'bgr', 'rgb', 'hsv', 'gris' o 'lab'.
+
+        Returns:
+            np.array: La imagen (de solo lectura).
+        """
+        if espacio not in ESPACIOS:
+            raise ValueError(f"Espacio '{espacio}' no válido. Usa uno de {ESPACIOS}.")
+        return self._cargar_clave(self._clave(ruta), os.path.abspath(ruta), espacio)
+
+    def precargar(self, ruta, espacio='bgr'):
+        """Empieza a cargar la imagen en segundo plano y devuelve un Future."""
+        return self._pool.submit(self.cargar, ruta, espacio)
+
+    def iterar(self, rutas, espacio='bgr', precarga=None, capturar_errores=False):
+        """
+        Recorre las imágenes en orden manteniendo `precarga` de ellas
+        decodificándose por adelantado en el pool de hilos.
+
+        Args:
+            rutas (iterable): Rutas de las imágenes.
+            espacio (str): Espacio de color, como en `cargar`.
+            precarga (int | None): Imágenes por adelantado (None usa la del cargador).
+            capturar_errores (bool): Si es True, una imagen que no se puede
+                cargar se entrega como (ruta, excepción) en lugar de lanzarla.
+
+        Yields:
+            tuple: (ruta, imagen) para cada ruta.
+        """
+        precarga = self.precarga if precarga is None else precarga
+        rutas = iter(rutas)
+        ventana = deque()
+        for ruta in rutas:
+            ventana.append((ruta, self.precargar(ruta, espacio)))
+            if len(ventana) > precarga:
+                break
+        while ventana:
+            ruta, futuro = ventana.popleft()
+            siguiente = next(rutas, None)
+            if siguiente is not None:
+                ventana.append((siguiente, self.precargar(siguiente, espacio)))
+            try:
+                imagen = futuro.result()
+            except Exception as e:
+                if not capturar_errores:
+                    raise
+                imagen = e
+            yield ruta, imagen
+
+    def cerrar(self):
+        """Detiene el pool de hilos."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
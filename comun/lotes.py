@@ -0,0 +1,343 @@
+"""
+Procesamiento por lotes de imágenes para los talleres 3, 5 y 10.
+
+Los scripts de los talleres cargan una sola imagen fija y terminan con
+`plt.show()`. Este módulo aplica la misma clase de procesamiento (separar
+canales, histogramas, brillo/contraste, filtros convolucionales y detección
+de bordes) a miles de imágenes sin interfaz gráfica:
+
+- Las imágenes se indican con un patrón glob o un manifiesto (una ruta por
+  línea).
+- El trabajo se reparte en un pool de procesos enviando las tareas en lotes.
+- Los resultados se guardan en disco conservando la estructura de carpetas.
+- Si se vuelve a ejecutar, se saltan las imágenes cuyas salidas ya existen.
+- Se pueden pedir varios pipelines a la vez: cada imagen se decodifica una
+  sola vez y sus espacios de color derivados se comparten entre pipelines
+  gracias a `carga.CargadorImagenes`, que además precarga las siguientes
+  imágenes del lote en hilos.
+
+Uso:
+    python comun/lotes.py --entrada "datos/**/*.jpg" --pipeline filtros --salida resultados/
+    python comun/lotes.py --manifiesto lista.txt --pipeline contraste --alpha 1.2 --beta 30
+    python comun/lotes.py --entrada "datos/*.png" --pipeline canales histograma filtros
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from carga import CargadorImagenes
+
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_TALLER3 = os.path.join(RAIZ_REPO, '2025-07-23_Taller3_Ojos_digitales_visión_artificial')
+DIR_TALLER5 = os.path.join(RAIZ_REPO, '2025-07-23_Taller5_Imagen_matriz_pixeles')
+DIR_TALLER10 = os.path.join(RAIZ_REPO, '2025-07-23_Taller10_Convoluciones_personalizadas')
+
+EXTENSIONES_IMAGEN = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def _importar_de_taller(directorio, modulo):
+    """Importa un módulo de la carpeta de un taller (no son paquetes)."""
+    if directorio not in sys.path:
+        sys.path.insert(0, directorio)
+    return __import__(modulo)
+
+
+# --- 1. Pipelines ---
+# Cada pipeline declara los sufijos de los archivos que produce (para poder
+# reanudar) y una función que recibe el cargador y la ruta de la imagen y
+# devuelve un diccionario {sufijo: datos}. Las imágenes se piden al cargador
+# en el espacio de color que se necesite, así que varios pipelines sobre la
+# misma imagen comparten la decodificación y las conversiones. Las imágenes
+# se guardan como PNG y los arrays como .npy.
+
+def _pipeline_canales(cargador, ruta, opciones):
+    """Canales R, G, B y H, S, V por separado (Taller 5)."""
+    b, g, r = cv2.split(cargador.cargar(ruta))
+    h, s, v = cv2.split(cargador.cargar(ruta, 'hsv'))
+    return {'R.png': r, 'G.png': g, 'B.png': b, 'H.png': h, 'S.png': s, 'V.png': v}
+
+
+def _pipeline_histograma(cargador, ruta, opciones):
+    """Histograma de grises y de cada canal BGR, como array (4, 256) (Taller 5)."""
+    imagen_bgr = cargador.cargar(ruta)
+    gris = cargador.cargar(ruta, 'gris')
+    histogramas = np.empty((4, 256), dtype=np.int64)
+    histogramas[0] = np.bincount(gris.ravel(), minlength=256)
+    for i in range(3):
+        histogramas[i + 1] = np.bincount(imagen_bgr[..., i].ravel(), minlength=256)
+    return {'histograma.npy': histogramas}
+
+
+def _pipeline_contraste(cargador, ruta, opciones):
+    """Ajuste g(x) = alpha * f(x) + beta, saturado a [0, 255] (Taller 5)."""
+    # Una LUT saturada: `cv2.convertScaleAbs` tomaría el valor absoluto y
+    # con beta negativo reflejaría los oscuros (10 - 50 daría 40, no 0).
+    tonos = _importar_de_taller(DIR_TALLER5, 'tonos')
+    ajustada = tonos.CadenaTonos().alpha_beta(opciones['alpha'], opciones['beta']).aplicar(cargador.cargar(ruta))
+    return {'contraste.png': ajustada}
+
+
+def _pipeline_filtros(cargador, ruta, opciones):
+    """Enfoque, suavizado y bordes del Taller 10 con el banco de filtros."""
+    convolucion = _importar_de_taller(DIR_TALLER10, 'convolucion')
+    kernels = [
+        np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]]),
+        np.full((3, 3), 1 / 9),
+        np.array([[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]]),
+    ]
+    gris = cargador.cargar(ruta, 'gris')
+    enfoque, suavizado, bordes = convolucion.banco_de_filtros(
+        gris, kernels, politica='saturar', borde='reflejo_101')
+    return {'enfoque.png': enfoque, 'suavizado.png': suavizado, 'bordes.png': bordes}
+
+
+def _pipeline_bordes(cargador, ruta, opciones):
+    """Cadena de suavizado, enfoque, Sobel y Laplaciano del Taller 3."""
+    flujo = _importar_de_taller(DIR_TALLER3, 'flujo')
+    imagen_bgr = cargador.cargar(ruta)
+    cadena = flujo.CadenaBordes(*imagen_bgr.shape[:2])
+    cadena.procesar(imagen_bgr)
+    return {f'{etapa}.png': getattr(cadena, etapa) for etapa in cadena.ETAPAS if etapa != 'gris'}
+
+
+PIPELINES = {
+    'canales': (_pipeline_canales, ('R.png', 'G.png', 'B.png', 'H.png', 'S.png', 'V.png')),
+    'histograma': (_pipeline_histograma, ('histograma.npy',)),
+    'contraste': (_pipeline_contraste, ('contraste.png',)),
+    'filtros': (_pipeline_filtros, ('enfoque.png', 'suavizado.png', 'bordes.png')),
+    'bordes': (_pipeline_bordes, ('suavizado.png', 'enfoque.png', 'sobel_x.png', 'sobel_y.png',
+                                  'sobel_combinado.png', 'laplaciano.png')),
+}
+
+
+# --- 2. Entradas y salidas ---
+def listar_entradas(patron=None, manifiesto=None):
+    """
+    Devuelve la lista ordenada de imágenes a procesar.
+
+    Args:
+        patron (str | None): Patrón glob (admite `**` recursivo).
+        manifiesto (str | None): Archivo de texto con una ruta por línea.
+            Las rutas relativas se resuelven respecto al manifiesto; se
+            ignoran las líneas vacías y las que empiezan por '#'.
+
+    Returns:
+        list[str]: Rutas absolutas de las imágenes.
+    """
+    rutas = []
+    if patron:
+        rutas.extend(p for p in glob.glob(patron, recursive=True)
+                     if p.lower().endswith(EXTENSIONES_IMAGEN) and os.path.isfile(p))
+    if manifiesto:
+        base = os.path.dirname(os.path.abspath(manifiesto))
+        with open(manifiesto, encoding='utf-8') as f:
+            for linea in f:
+                linea = linea.strip()
+                if linea and not linea.startswith('#'):
+                    rutas.append(linea if os.path.isabs(linea) else os.path.join(base, linea))
+    return sorted(set(os.path.abspath(r) for r in rutas))
+
+
+def rutas_de_salida(ruta_entrada, raiz_entrada, dir_salida, pipeline):
+    """Rutas de salida de una imagen, conservando sus subcarpetas."""
+    relativa = os.path.splitext(os.path.relpath(ruta_entrada, raiz_entrada))[0]
+    base = os.path.join(dir_salida, pipeline, relativa)
+    return {sufijo: f"{base}_{sufijo}" for sufijo in PIPELINES[pipeline][1]}
+
+
+def _guardar(ruta, datos):
+    """Guarda de forma atómica: un archivo a medias nunca cuenta como hecho."""
+    raiz, extension = os.path.splitext(ruta)
+    temporal = f"{raiz}.parcial{extension}"
+    if extension == '.npy':
+        np.save(temporal, datos)
+    elif not cv2.imwrite(temporal, datos):
+        raise IOError(f"No se pudo escribir '{ruta}'.")
+    os.replace(temporal, ruta)
+
+
+# --- 3. Trabajo de cada proceso ---
+# Cargador de cada proceso; lo crea `_iniciar_trabajador`.
+_CARGADOR = None
+
+
+def _iniciar_trabajador(hilos_carga=2, max_bytes=256 * 2**20):
+    global _CARGADOR
+    # Cada proceso ya es un hilo de trabajo; evitamos que OpenCV lance más.
+    # Los hilos del cargador solo decodifican por adelantado.
+    cv2.setNumThreads(1)
+    _CARGADOR = CargadorImagenes(hilos=hilos_carga, max_bytes=max_bytes)
+
+
+def _pendientes(salidas):
+    """Pipelines de una imagen a los que les falta alguna salida."""
+    return [nombre for nombre, rutas in salidas.items()
+            if not all(os.path.exists(r) for r in rutas.values())]
+
+
+def procesar_imagen(tarea, imagen=None):
+    """
+    Aplica a una imagen los pipelines que le falten y guarda sus salidas.
+
+    Args:
+        tarea (tuple): (ruta, {pipeline: {sufijo: ruta_salida}}, opciones).
+        imagen (np.array | Exception | None): Resultado de la precarga; si es
+            una excepción, la imagen no se pudo leer.
+
+    Returns:
+        tuple: (ruta, estado) donde estado es 'ok', 'omitida' o un mensaje de error.
+    """
+    ruta, salidas, opciones = tarea
+    pendientes = _pendientes(salidas)
+    if not pendientes:
+        return ruta, 'omitida'
+    if isinstance(imagen, Exception):
+        return ruta, "no se pudo leer la imagen"
+    try:
+        for pipeline in pendientes:
+            resultados = PIPELINES[pipeline][0](_CARGADOR, ruta, opciones)
+            for sufijo, datos in resultados.items():
+                os.makedirs(os.path.dirname(salidas[pipeline][sufijo]), exist_ok=True)
+                _guardar(salidas[pipeline][sufijo], datos)
+        return ruta, 'ok'
+    except Exception as e:
+        return ruta, f"{type(e).__name__}: {e}"
+
+
+def procesar_bloque(tareas):
+    """
+    Procesa un bloque de tareas precargando en hilos las siguientes imágenes
+    mientras se calcula la actual.
+
+    Returns:
+        list[tuple]: (ruta, estado) de cada tarea, en orden.
+    """
+    resultados = [None] * len(tareas)
+    por_cargar = []
+    for i, tarea in enumerate(tareas):
+        if _pendientes(tarea[1]):
+            por_cargar.append(i)
+        else:
+            resultados[i] = (tarea[0], 'omitida')
+    precargadas = _CARGADOR.iterar((tareas[i][0] for i in por_cargar), capturar_errores=True)
+    for i, (_, imagen) in zip(por_cargar, precargadas):
+        resultados[i] = procesar_imagen(tareas[i], imagen)
+    return resultados
+
+
+def _bloques(tareas, tam_lote):
+    for i in range(0, len(tareas), tam_lote):
+        yield tareas[i:i + tam_lote]
+
+
+def ejecutar_lote(rutas, pipelines, dir_salida, raiz_entrada=None, procesos=None,
+                  tam_lote=None, opciones=None, mostrar_progreso=True, hilos_carga=2):
+    """
+    Aplica uno o varios pipelines a todas las imágenes en un pool de procesos.
+
+    Args:
+        rutas (list[str]): Imágenes de entrada.
+        pipelines (str | list[str]): Nombres de `PIPELINES`. Con varios, cada
+            imagen se decodifica una sola vez para todos.
+        dir_salida (str): Carpeta donde se guardan los resultados.
+        raiz_entrada (str | None): Carpeta respecto a la que se conservan las
+            subcarpetas. Por defecto, la ruta común de todas las entradas.
+        procesos (int | None): Procesos del pool (None = todos los núcleos;
+            1 = sin pool).
+        tam_lote (int | None): Tareas que recibe cada proceso de una vez.
+        opciones (dict | None): Parámetros del pipeline (p. ej. alpha y beta).
+        mostrar_progreso (bool): Imprimir el avance cada cierto número de imágenes.
+        hilos_carga (int): Hilos de decodificación por proceso.
+
+    Returns:
+        dict: Conteo de imágenes 'ok', 'omitidas' y con 'errores', más la
+        lista de errores como (ruta, mensaje).
+    """
+    if isinstance(pipelines, str):
+        pipelines = [pipelines]
+    for pipeline in pipelines:
+        if pipeline not in PIPELINES:
+            raise ValueError(f"Pipeline '{pipeline}' no válido. Usa uno de {sorted(PIPELINES)}.")
+    opciones = dict(opciones or {})
+    opciones.setdefault('alpha', 1.5)
+    opciones.setdefault('beta', 50)
+    if not rutas:
+        return {'ok': 0, 'omitidas': 0, 'errores': 0, 'detalle_errores': []}
+    if raiz_entrada is None:
+        raiz_entrada = os.path.commonpath([os.path.dirname(r) for r in rutas])
+
+    tareas = [(r, {p: rutas_de_salida(r, raiz_entrada, dir_salida, p) for p in pipelines}, opciones)
+              for r in rutas]
+    procesos = procesos or os.cpu_count() or 1
+    tam_lote = tam_lote or max(1, min(64, len(tareas) // (4 * procesos)))
+
+    resumen = {'ok': 0, 'omitidas': 0, 'errores': 0, 'detalle_errores': []}
+    inicio = time.perf_counter()
+
+    def registrar(i, ruta, estado):
+        if estado == 'ok':
+            resumen['ok'] += 1
+        elif estado == 'omitida':
+            resumen['omitidas'] += 1
+        else:
+            resumen['errores'] += 1
+            resumen['detalle_errores'].append((ruta, estado))
+        if mostrar_progreso and (i % 100 == 0 or i == len(tareas)):
+            transcurrido = time.perf_counter() - inicio
+            print(f"[{i}/{len(tareas)}] {i / transcurrido:.1f} imágenes/s", flush=True)
+
+    # Cada envío es un bloque de tareas, para que el proceso pueda precargar
+    # las imágenes del bloque mientras procesa la actual.
+    if procesos == 1:
+        _iniciar_trabajador(hilos_carga)
+        resultados = (r for bloque in _bloques(tareas, tam_lote) for r in procesar_bloque(bloque))
+        for i, (ruta, estado) in enumerate(resultados, 1):
+            registrar(i, ruta, estado)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(hilos_carga,)) as pool:
+            resultados = (r for bloque in pool.map(procesar_bloque, _bloques(tareas, tam_lote)) for r in bloque)
+            for i, (ruta, estado) in enumerate(resultados, 1):
+                registrar(i, ruta, estado)
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesa lotes de imágenes sin interfaz gráfica.")
+    parser.add_argument('--entrada', help="Patrón glob de las imágenes (entre comillas).")
+    parser.add_argument('--manifiesto', help="Archivo con una ruta de imagen por línea.")
+    parser.add_argument('--pipeline', required=True, nargs='+', choices=sorted(PIPELINES),
+                        help="Uno o varios pipelines; cada imagen se decodifica una sola vez.")
+    parser.add_argument('--salida', default='resultados_lote', help="Carpeta de salida.")
+    parser.add_argument('--raiz', default=None, help="Carpeta base para conservar subcarpetas.")
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--tam-lote', type=int, default=None, help="Tareas por envío a cada proceso.")
+    parser.add_argument('--hilos-carga', type=int, default=2, help="Hilos de decodificación por proceso.")
+    parser.add_argument('--alpha', type=float, default=1.5, help="Contraste (pipeline 'contraste').")
+    parser.add_argument('--beta', type=float, default=50, help="Brillo (pipeline 'contraste').")
+    args = parser.parse_args(argv)
+
+    if not args.entrada and not args.manifiesto:
+        parser.error("Indica --entrada o --manifiesto.")
+    rutas = listar_entradas(args.entrada, args.manifiesto)
+    print(f"{len(rutas)} imágenes encontradas. Pipelines: {', '.join(args.pipeline)}.")
+    resumen = ejecutar_lote(rutas, args.pipeline, args.salida, args.raiz, args.procesos,
+                            args.tam_lote, {'alpha': args.alpha, 'beta': args.beta},
+                            hilos_carga=args.hilos_carga)
+
+    print(f"Procesadas: {resumen['ok']}, omitidas (ya hechas): {resumen['omitidas']}, "
+          f"errores: {resumen['errores']}")
+    for ruta, mensaje in resumen['detalle_errores'][:20]:
+        print(f"  {ruta}: {mensaje}")
+    return 1 if resumen['errores'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
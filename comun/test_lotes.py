@@ -0,0 +1,27 @@
+"""Pruebas de `lotes`: pipeline de contraste."""
+
+import cv2
+import numpy as np
+import pytest
+
+import lotes
+from carga import CargadorImagenes
+
+
+@pytest.mark.parametrize('alpha, beta', [(1.0, -50), (1.5, 50), (0.5, -20.5)])
+def test_contraste_saturado(tmp_path, alpha, beta):
+    imagen = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    imagen = np.dstack([imagen, imagen[::-1], imagen.T])
+    ruta = str(tmp_path / 'imagen.png')
+    cv2.imwrite(ruta, imagen)
+    cargador = CargadorImagenes(hilos=1)
+    salida = lotes._pipeline_contraste(cargador, ruta, {'alpha': alpha, 'beta': beta})['contraste.png']
+    esperada = np.clip(alpha * imagen.astype(np.float32) + beta, 0, 255).astype(np.uint8)
+    assert np.array_equal(salida, esperada)
+
+
+def test_contraste_beta_negativo_no_refleja(tmp_path):
+    ruta = str(tmp_path / 'oscura.png')
+    cv2.imwrite(ruta, np.full((4, 4, 3), 10, dtype=np.uint8))
+    salida = lotes._pipeline_contraste(CargadorImagenes(hilos=1), ruta, {'alpha': 1.0, 'beta': -50})
+    assert not salida['contraste.png'].any()